@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+
+
+class Agent:
+    """Agent class.
+    Minimal base class of the agents of a Model, with the interface of mesa.Agent used by the protocol.
+
+    attr:
+        unique_id: the unique id of the agent in its model
+        model: the model the agent belongs to (Model)
+        pos: the position of the agent, unused by the protocol
+    """
+
+    def __init__(self, unique_id, model):
+        """Create a new agent."""
+        self.unique_id = unique_id
+        self.model = model
+        self.pos = None
+
+    def step(self):
+        """A single step of the agent."""
+
+    def advance(self):
+        """Second stage of the step of the agent, for staged activation."""
+
+    @property
+    def random(self):
+        """Return the random number generator of the model."""
+        return self.model.random
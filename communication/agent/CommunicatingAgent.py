@@ -1,7 +1,6 @@
 #!/usr/bin/env python3
 
-from mesa import Agent
-
+from communication.agent.Agent import Agent
 from communication.mailbox.Mailbox import Mailbox
 from communication.message.MessageService import MessageService
 
@@ -27,11 +26,22 @@ class CommunicatingAgent(Agent):
         self.__mailbox = Mailbox()
         self.__messages_service = MessageService.get_instance()
 
+    def reset(self, name=None):
+        """ Empty the mailbox of the agent, and rename it if a name is given, to reuse it for a new negotiation.
+        """
+        if name is not None:
+            self.__name = name
+        self.__mailbox.clear()
+
     def step(self):
         """ The step methods of the agent called by the scheduler at each time tick.
         """
         super().step()
 
+    def is_finished(self):
+        """ Return True if the agent has no more work to do (used by the ActivityScheduler)."""
+        return False
+
     def get_name(self):
         """ Return the name of the communicating agent."""
         return self.__name
@@ -51,6 +61,16 @@ class CommunicatingAgent(Agent):
         """
         return self.__mailbox.get_new_messages()
 
+    def get_new_messages_by_conversation(self):
+        """ Return all the unread messages, routed by conversation id (dict of lists).
+        """
+        return self.__mailbox.get_new_messages_by_conversation()
+
+    def peek_new_messages(self, conversation_id=None):
+        """ Return all the unread messages (of a conversation if an id is given) without marking them as read.
+        """
+        return self.__mailbox.peek_new_messages(conversation_id)
+
     def get_messages(self):
         """ Return all the received messages.
         """
@@ -61,6 +81,11 @@ class CommunicatingAgent(Agent):
         """
         return self.__mailbox.get_messages_from_performative(performative)
 
+    def get_messages_from_conversation(self, conversation_id):
+        """ Return the list of messages received in a conversation.
+        """
+        return self.__mailbox.get_messages_from_conversation(conversation_id)
+
     def get_messages_from_exp(self, exp):
         """ Return a list of messages which have the same sender.
         """
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+
+from collections import defaultdict
+
+
+class Conversation:
+    """Conversation class.
+    This class holds the state of an agent in one negotiation, so that an agent can negotiate with many
+    partners at once: each conversation has its own copy of the preferences of the agent, its own progress,
+    and the arguments used by both of its participants.
+
+    attr:
+        conversation_id: the id of the conversation, carried by its messages (None for the default one)
+        partner: the name of the other participant (None for the default conversation, whose targets are drawn)
+        preferences: the preferences of the agent in the conversation (Preferences)
+        done_negotiating: whether the agent is done negotiating in the conversation
+        no_args_items: the items for which the agent has no argument, never proposed again
+        used_arguments: the arguments used in the conversation by item, shared by its participants (dict)
+        opened: whether the agent has been stepped in the conversation
+        closed: whether the conversation is over for both participants
+    """
+
+    def __init__(self, conversation_id, partner, preferences, used_arguments=None):
+        """Creates a new Conversation."""
+        self.conversation_id = conversation_id
+        self.partner = partner
+        self.preferences = preferences
+        self.done_negotiating = False
+        self.no_args_items = []
+        self.used_arguments = used_arguments if used_arguments is not None else defaultdict(list)
+        self.opened = False
+        self.closed = False
+
+    def __repr__(self):
+        """Returns the conversation as a string."""
+        return f"Conversation({self.conversation_id}, {self.partner})"
+
+    def get_state(self):
+        """Returns a hashable snapshot of the state of the agent in the conversation."""
+        return self.done_negotiating, tuple(self.preferences.get_item_list()), frozenset(self.no_args_items)
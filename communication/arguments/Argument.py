@@ -2,6 +2,7 @@
 
 from communication.arguments.Comparison import Comparison
 from communication.arguments.CoupleValue import CoupleValue
+from communication.preferences.Vocabulary import decode_criterion, decode_value, encode_term
 
 
 class Argument:
@@ -38,6 +39,42 @@ class Argument:
         else:
             return False
 
+    def __hash__(self):
+        """Returns the hash of the Argument."""
+        return hash(
+            (self.__decision, self.__item, tuple(self.__comparison_list), tuple(self.__couple_values_list))
+        )
+
+    def __getstate__(self):
+        """Returns the argument as the decision, the item and tuples of criterion and value codes
+        (terms of vocabularies other than the preset)."""
+        comparisons = tuple(
+            code
+            for comparison in self.__comparison_list
+            for code in (
+                encode_term(comparison.get_best_criterion_name()),
+                encode_term(comparison.get_worst_criterion_name()),
+            )
+        )
+        couple_values = tuple(
+            code
+            for couple_value in self.__couple_values_list
+            for code in (encode_term(couple_value.get_criterion_name()), encode_term(couple_value.get_value()))
+        )
+        return self.__decision, self.__item, comparisons, couple_values
+
+    def __setstate__(self, state):
+        """Restores an Argument packed by __getstate__."""
+        self.__decision, self.__item, comparisons, couple_values = state
+        self.__comparison_list = [
+            Comparison(decode_criterion(comparisons[k]), decode_criterion(comparisons[k + 1]))
+            for k in range(0, len(comparisons), 2)
+        ]
+        self.__couple_values_list = [
+            CoupleValue(decode_criterion(couple_values[k]), decode_value(couple_values[k + 1]))
+            for k in range(0, len(couple_values), 2)
+        ]
+
     def add_premise_comparison(self, criterion_name_1, criterion_name_2):
         """Adds a premise comparison in the comparison list."""
         self.__comparison_list.append(Comparison(criterion_name_1, criterion_name_2))
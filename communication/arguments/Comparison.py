@@ -1,5 +1,7 @@
 #!/usr/bin/env python3
 
+from communication.preferences.Vocabulary import decode_criterion, encode_term
+
 
 class Comparison:
     """Comparison class.
@@ -29,6 +31,18 @@ class Comparison:
         else:
             return False
 
+    def __hash__(self):
+        """Returns the hash of the Comparison."""
+        return hash((self.__best_criterion_name, self.__worst_criterion_name))
+
+    def __getstate__(self):
+        """Returns the codes of the best and worst criteria (terms of vocabularies other than the preset)."""
+        return encode_term(self.__best_criterion_name), encode_term(self.__worst_criterion_name)
+
+    def __setstate__(self, state):
+        """Restores a Comparison from the codes of the best and worst criteria."""
+        self.__best_criterion_name, self.__worst_criterion_name = map(decode_criterion, state)
+
     def get_worst_criterion_name(self):
         return self.__worst_criterion_name
 
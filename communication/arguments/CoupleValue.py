@@ -1,5 +1,7 @@
 #!/usr/bin/env python3
 
+from communication.preferences.Vocabulary import decode_criterion, decode_value, encode_term
+
 
 class CoupleValue:
     """CoupleValue class.
@@ -29,6 +31,18 @@ class CoupleValue:
         else:
             return False
 
+    def __hash__(self):
+        """Returns the hash of the CoupleValue."""
+        return hash((self.__criterion_name, self.__value))
+
+    def __getstate__(self):
+        """Returns the criterion and value codes (terms of vocabularies other than the preset)."""
+        return encode_term(self.__criterion_name), encode_term(self.__value)
+
+    def __setstate__(self, state):
+        """Restores a CoupleValue from the criterion and value codes."""
+        self.__criterion_name, self.__value = decode_criterion(state[0]), decode_value(state[1])
+
     def get_criterion_name(self):
         return self.__criterion_name
 
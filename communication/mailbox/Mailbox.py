@@ -8,6 +8,7 @@ class Mailbox:
     attr:
         unread_messages: The list of unread messages
         read_messages: The list of read messages
+        conversations: The messages received in each conversation, by conversation id (dict)
      """
 
     def __init__(self):
@@ -15,11 +16,23 @@ class Mailbox:
         """
         self.__unread_messages = []
         self.__read_messages = []
+        self.__conversations = {}
+
+    def clear(self):
+        """ Remove all the messages, read or unread.
+        """
+        self.__unread_messages.clear()
+        self.__read_messages.clear()
+        self.__conversations.clear()
 
     def receive_messages(self, message):
         """ Receive a message and add it in the unread messages list.
         """
         self.__unread_messages.append(message)
+        conversation = self.__conversations.get(message.get_conversation_id())
+        if conversation is None:
+            conversation = self.__conversations[message.get_conversation_id()] = []
+        conversation.append(message)
 
     def get_new_messages(self):
         """ Return all the messages from unread messages list.
@@ -32,6 +45,24 @@ class Mailbox:
         self.__unread_messages.clear()
         return unread_messages
 
+    def get_new_messages_by_conversation(self):
+        """ Return all the messages from unread messages list, routed by conversation id (dict of lists).
+        """
+        messages_by_conversation = {}
+        for message in self.get_new_messages():
+            messages = messages_by_conversation.get(message.get_conversation_id())
+            if messages is None:
+                messages = messages_by_conversation[message.get_conversation_id()] = []
+            messages.append(message)
+        return messages_by_conversation
+
+    def peek_new_messages(self, conversation_id=None):
+        """ Return the unread messages (of a conversation if an id is given) without marking them as read.
+        """
+        if conversation_id is None:
+            return self.__unread_messages.copy()
+        return [message for message in self.__unread_messages if message.get_conversation_id() == conversation_id]
+
     def get_messages(self):
         """ Return all the messages from both unread and read messages list.
         """
@@ -48,6 +79,11 @@ class Mailbox:
                 messages_from_performative.append(message)
         return messages_from_performative
 
+    def get_messages_from_conversation(self, conversation_id):
+        """ Return the list of messages received in a conversation, read or unread.
+        """
+        return list(self.__conversations.get(conversation_id, ()))
+
     def get_messages_from_exp(self, exp):
         """ Return a list of messages which have the same sender.
         """
@@ -11,15 +11,17 @@ class Message:
         to_agent: the receiver of the message (id)
         message_performative: the performative of the message
         content: the content of the message
+        conversation_id: the id of the conversation the message belongs to (None for the default one)
      """
 
-    def __init__(self, from_agent, to_agent, message_performative, content):
+    def __init__(self, from_agent, to_agent, message_performative, content, conversation_id=None):
         """ Create a new message.
         """
         self.__from_agent = from_agent
         self.__to_agent = to_agent
         self.__message_performative = message_performative
         self.__content = content
+        self.__conversation_id = conversation_id
 
     def __str__(self):
         """ Return Message as a String.
@@ -46,3 +48,8 @@ class Message:
         """ Return the content of the message.
         """
         return self.__content
+
+    def get_conversation_id(self):
+        """ Return the id of the conversation of the message.
+        """
+        return self.__conversation_id
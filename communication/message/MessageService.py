@@ -32,9 +32,17 @@ class MessageService:
         else:
             MessageService.__instance = self
             self.__scheduler = scheduler
+            self.__notify_delivery = getattr(scheduler, "notify_message", None)
             self.__instant_delivery = instant_delivery
             self.__messages_to_proceed = []
             self.__message_history = []
+            self.__agents_by_name = {}
+            self.__n_indexed_agents = 0
+
+    def reset(self):
+        """Drop the messages to proceed and the message history, to reuse the service for a new negotiation."""
+        self.__messages_to_proceed.clear()
+        self.__message_history = []
 
     def set_instant_delivery(self, instant_delivery):
         """Set the instant delivery parameter."""
@@ -51,7 +59,10 @@ class MessageService:
     def dispatch_message(self, message):
         """Dispatch the message to the right agent."""
         if message.get_dest():
-            self.find_agent_from_name(message.get_dest()).receive_message(message)
+            agent = self.find_agent_from_name(message.get_dest())
+            agent.receive_message(message)
+            if self.__notify_delivery is not None:
+                self.__notify_delivery(agent)
 
     def dispatch_messages(self):
         """Proceed each message received by the message service."""
@@ -62,10 +73,20 @@ class MessageService:
         self.__messages_to_proceed.clear()
 
     def find_agent_from_name(self, agent_name):
-        """Return the agent according to the agent name given."""
-        for agent in self.__scheduler.agents:
-            if agent.get_name() == agent_name:
-                return agent
+        """Return the agent according to the agent name given, indexing the agents by name the first time an
+        agent is looked up after an agent was added, removed or renamed."""
+        agent = self.__agents_by_name.get(agent_name)
+        if (
+            agent is None
+            or agent.get_name() != agent_name
+            or self.__n_indexed_agents != self.__scheduler.get_agent_count()
+        ):
+            # the first agent of a name is the one found, as when looking it up in order
+            agents = self.__scheduler.agents
+            self.__agents_by_name = {agent.get_name(): agent for agent in reversed(agents)}
+            self.__n_indexed_agents = len(agents)
+            agent = self.__agents_by_name.get(agent_name)
+        return agent
 
     def get_message_history(self):
         """Returns the message history"""
@@ -97,5 +118,7 @@ class MessageService:
             "value": x,
             "secondary_criterion": secondary_criterion,
         }
+        if message.get_conversation_id() is not None:
+            history["conversation_id"] = message.get_conversation_id()
 
         self.__message_history.append(history)
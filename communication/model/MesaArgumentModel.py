@@ -0,0 +1,19 @@
+#!/usr/bin/env python3
+
+import mesa
+from mesa.time import BaseScheduler
+
+from pw_argumentation import ArgumentModel
+
+
+class MesaArgumentModel(ArgumentModel, mesa.Model):
+    """MesaArgumentModel class.
+    Adapter running an ArgumentModel on Mesa, for its visualisation and data collection tools:
+    the model is a mesa.Model, and its agents are stepped by a mesa.time.BaseScheduler by default.
+    The negotiation is the same as the one of ArgumentModel, which does not need Mesa.
+    """
+
+    def __init__(self, agents_prefs=None, agent_names=None, scheduler_cls=BaseScheduler, **kwargs):
+        """Creates a new MesaArgumentModel, with the arguments of ArgumentModel."""
+        super().__init__(agents_prefs, agent_names, scheduler_cls, **kwargs)
+        self.current_id = 0
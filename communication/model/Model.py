@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+
+import random
+
+
+def get_random_seed(seed):
+    """Returns the seed of a random.Random for an int seed or a numpy SeedSequence (None for a random seed)."""
+    if hasattr(seed, "generate_state"):
+        return int(seed.generate_state(1)[0])
+    return seed
+
+
+class Model:
+    """Model class.
+    Minimal base class of the models, with the interface of mesa.Model used by the protocol:
+    a random number generator seeded with the seed keyword argument, a schedule and a running flag.
+    The seed can be an int or a numpy SeedSequence, from which child seeds can be spawned for sub-runs.
+
+    attr:
+        random: the random number generator of the model (random.Random)
+        schedule: the scheduler stepping the agents
+        running: whether run_model must go on stepping the model (bool)
+    """
+
+    def __new__(cls, *args, **kwargs):
+        """Create a new model object and its random number generator."""
+        model = object.__new__(cls)
+        model._seed = kwargs.get("seed", None)
+        model._seed_sequence = None
+        model.random = random.Random(get_random_seed(model._seed))
+        return model
+
+    def __init__(self, *args, **kwargs):
+        """Create a new model."""
+        self.running = True
+        self.schedule = None
+        self.current_id = 0
+
+    def run_model(self):
+        """Step the model until it stops running."""
+        while self.running:
+            self.step()
+
+    def step(self):
+        """A single step of the model."""
+
+    def next_id(self):
+        """Return the next unique id for agents."""
+        self.current_id += 1
+        return self.current_id
+
+    def reset_randomizer(self, seed=None):
+        """Reset the random number generator with a new seed, or the current one if seed is None."""
+        if seed is None:
+            seed = self._seed
+        self.random.seed(get_random_seed(seed))
+        self._seed = seed
+        self._seed_sequence = None
+
+    def spawn_seeds(self, n_children):
+        """Return n_children numpy SeedSequences spawned from the seed of the model.
+        Each child seeds an independent generator, which only depends on the seed and the rank of the child.
+        """
+        if self._seed_sequence is None:
+            from numpy.random import SeedSequence  # only needed to spawn seeds
+
+            if hasattr(self._seed, "spawn"):  # copy the SeedSequence, which counts the children it spawned
+                self._seed_sequence = SeedSequence(self._seed.entropy, spawn_key=self._seed.spawn_key)
+            else:
+                self._seed_sequence = SeedSequence(self._seed)
+        return self._seed_sequence.spawn(n_children)
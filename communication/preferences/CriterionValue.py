@@ -1,5 +1,7 @@
 #!/usr/bin/env python3
 
+from communication.preferences.Vocabulary import decode_criterion, decode_value, encode_term
+
 
 class CriterionValue:
     """CriterionValue class.
@@ -12,6 +14,17 @@ class CriterionValue:
         self.__criterion_name = criterion_name
         self.__value = value
 
+    def __getstate__(self):
+        """Returns the item with the criterion and value codes (terms of vocabularies other than the preset)."""
+        return self.__item, encode_term(self.__criterion_name), encode_term(self.__value)
+
+    def __setstate__(self, state):
+        """Restores a CriterionValue from the item with the criterion and value codes."""
+        item, criterion_code, value_code = state
+        self.__item = item
+        self.__criterion_name = decode_criterion(criterion_code)
+        self.__value = decode_value(value_code)
+
     def get_item(self):
         """Returns the item.
         """
@@ -8,12 +8,20 @@ class Item:
     attr:
         name: the name of the item
         description: the description of the item
+        catalog: the ItemCatalog interning the item, None if it is not interned
+        id: the dense integer id of the item in its catalog, None if it is not interned
+
+    Items are equal to the items and the strings of the same name. Interned items are created by their
+    ItemCatalog, and two items of the same catalog are only equal if they are the same object.
     """
 
-    def __init__(self, name, description=None):
-        """Creates a new Item."""
+    def __init__(self, name, description=None, catalog=None, item_id=None):
+        """Creates a new Item (interned ones are created by ItemCatalog.get_or_create)."""
         self.__name = name
         self.__description = description
+        self.__catalog = catalog
+        self.__id = item_id
+        self.__hash = hash(name)
 
     def __str__(self):
         """Returns Item as a String."""
@@ -25,7 +33,11 @@ class Item:
 
     def __eq__(self, o):
         """Return True if Items are equal."""
+        if o is self:
+            return True
         if isinstance(o, Item):
+            if self.__catalog is not None and o.__catalog is self.__catalog:
+                return False  # interned by the same catalog, but not the same object
             return self.__name == o.__name
         elif isinstance(o, str):
             return self.__name == o
@@ -34,7 +46,16 @@ class Item:
 
     def __hash__(self):
         """Returns the hash of the Item."""
-        return hash(self.__name)
+        return self.__hash
+
+    def __reduce__(self):
+        """Pickles the Item as its name and its description, and the name of its catalog if it is interned, to
+        restore the item registered in it."""
+        if self.__catalog is not None:
+            from communication.preferences.ItemCatalog import _get_catalog_item
+
+            return _get_catalog_item, (self.__catalog.name, self.__name, self.__description)
+        return Item, (self.__name, self.__description)
 
     def get_name(self):
         """Returns the name of the item."""
@@ -44,18 +65,18 @@ class Item:
         """Returns the description of the item."""
         return self.__description
 
+    def get_catalog(self):
+        """Returns the catalog interning the item, None if it is not interned."""
+        return self.__catalog
+
+    def get_id(self):
+        """Returns the id of the item in its catalog, None if it is not interned."""
+        return self.__id
+
     def get_value(self, preferences, criterion_name):
         """Returns the Value of the Item according to agent preferences."""
         return preferences.get_value(self, criterion_name)
 
     def get_score(self, preferences):
-        """Returns the score of the Item according to agent preferences."""
-        criterion_weight = 100
-        sum_result = 0
-        for criterion_name in preferences.get_criterion_name_list():
-            sum_result = (
-                sum_result
-                + criterion_weight * self.get_value(preferences, criterion_name).value
-            )
-            criterion_weight = criterion_weight / 2
-        return sum_result
+        """Returns the score of the Item according to agent preferences and their scoring strategy."""
+        return preferences.get_score(self)
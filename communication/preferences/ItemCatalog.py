@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+
+from communication.preferences.Item import Item
+
+
+class ItemCatalog:
+    """ItemCatalog class.
+    This class interns items: it holds a single Item object by name, with a dense integer id, so that the
+    preferences of all the agents share the same objects. Items of the same catalog are compared by identity
+    and id, without comparing their names.
+
+    Catalogs are registered by name. A pickled item of a catalog is restored as the item registered with the
+    same name in the catalog of the same name, so that ids are only meaningful in one process.
+
+    attr:
+        name: the name of the catalog (str)
+    """
+
+    __catalogs = {}
+
+    def __init__(self, name):
+        """Creates and registers a new empty ItemCatalog."""
+        if name in ItemCatalog.__catalogs:
+            raise ValueError(f"An item catalog named {name} is already registered")
+        self.name = name
+        self.__items = []
+        self.__ids = {}
+        ItemCatalog.__catalogs[name] = self
+
+    def __repr__(self):
+        """Returns the catalog as a string."""
+        return f"ItemCatalog({self.name}, {len(self.__items)} items)"
+
+    def __reduce__(self):
+        """Pickles the catalog as its name, its items being pickled one by one."""
+        return ItemCatalog.get_or_create_catalog, (self.name,)
+
+    def __len__(self):
+        """Returns the number of items."""
+        return len(self.__items)
+
+    def __contains__(self, item):
+        """Returns whether an item (or an item name) is in the catalog."""
+        return item in self.__ids
+
+    @staticmethod
+    def get(name):
+        """Returns the catalog registered with a given name."""
+        return ItemCatalog.__catalogs[name]
+
+    @staticmethod
+    def get_or_create_catalog(name):
+        """Returns the catalog registered with a given name, creating it if there is none."""
+        catalog = ItemCatalog.__catalogs.get(name)
+        return catalog if catalog is not None else ItemCatalog(name)
+
+    def get_or_create(self, name, description=None):
+        """Returns the item of a given name, registering it with the next id if it is new (the description of an
+        item is the one given when it was registered)."""
+        item_id = self.__ids.get(name)
+        if item_id is not None:
+            return self.__items[item_id]
+        item = Item(name, description, self, len(self.__items))
+        self.__items.append(item)
+        self.__ids[name] = item.get_id()
+        return item
+
+    def get_item(self, item_id):
+        """Returns the item of a given id."""
+        return self.__items[item_id]
+
+    def get_item_by_name(self, name):
+        """Returns the item of a given name."""
+        return self.__items[self.__ids[name]]
+
+    def get_id(self, item):
+        """Returns the id of an item (or of an item name) of the catalog."""
+        return self.__ids[item]
+
+    def get_ids(self, items):
+        """Returns the ids of items (or item names) of the catalog."""
+        return [self.__ids[item] for item in items]
+
+    def get_items(self):
+        """Returns the items ordered by id."""
+        return list(self.__items)
+
+
+def _get_catalog_item(catalog_name, name, description):
+    return ItemCatalog.get_or_create_catalog(catalog_name).get_or_create(name, description)
+
+
+DEFAULT_CATALOG = ItemCatalog("default")
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+
+
+class ParetoFront:
+    """ParetoFront class.
+    This class maintains the Pareto front of a list of items: the items which are not dominated by another one,
+    an item dominating another one if it is at least as good on every criterion and better on one of them.
+    The front is updated incrementally when items are removed: only the items dominated by a removed item of
+    the front can join it, and when items are added: only the new items can join it, and only the items of the
+    front they dominate leave it.
+
+    attr:
+        items: the items, in their original order
+        values: (item, criterion) matrix of the value codes of the items (np.ndarray)
+    """
+
+    def __init__(self, items, values):
+        """Creates a new ParetoFront of items with the given (item, criterion) matrix of value codes."""
+        import numpy as np
+
+        self.items = list(items)
+        self.values = values
+        self.__index = {item: k for k, item in enumerate(self.items)}
+        self.__alive = np.ones(len(self.items), dtype=bool)
+        self.__on_front = np.zeros(len(self.items), dtype=bool)
+        self.__totals = values.sum(axis=1)
+        self.__add_to_front(np.arange(len(self.items)))
+
+    def __add_to_front(self, candidates):
+        """Adds to the front the candidates which are not dominated by an item of the front, given that an item
+        dominated by a candidate is dominated by an item of the front or by another candidate."""
+        import numpy as np
+
+        # dominating items have larger totals, so they are checked first
+        for k in candidates[np.argsort(-self.__totals[candidates], kind="stable")].tolist():
+            front_values = self.values[self.__on_front]
+            if not self.__is_dominated(self.values[k], front_values).any():
+                self.__on_front[k] = True
+
+    @staticmethod
+    def __is_dominated(values, others):
+        """Returns whether values are dominated by each row of others."""
+        return (others >= values).all(axis=1) & (others > values).any(axis=1)
+
+    def __contains__(self, item):
+        """Returns whether an item is on the front."""
+        k = self.__index.get(item)
+        return k is not None and bool(self.__on_front[k])
+
+    def get_items(self):
+        """Returns the items of the front, in their original order."""
+        return [self.items[k] for k in self.__on_front.nonzero()[0].tolist()]
+
+    def remove(self, item):
+        """Removes an item, updating the front with the items it was the last one to dominate."""
+        import numpy as np
+
+        k = self.__index.get(item)
+        if k is None or not self.__alive[k]:
+            return
+        self.__alive[k] = False
+        if not self.__on_front[k]:
+            return  # the items it dominates are dominated by the item of the front dominating it
+        self.__on_front[k] = False
+        dominated = self.__alive & ~self.__on_front & self.__is_dominated_by(self.values[k])
+        self.__add_to_front(np.flatnonzero(dominated))
+
+    def add(self, items, values):
+        """Adds new items with their (item, criterion) matrix of value codes, updating the front with them."""
+        import numpy as np
+
+        start = len(self.items)
+        self.items.extend(items)
+        self.__index.update((item, start + k) for k, item in enumerate(items))
+        self.values = np.concatenate([self.values, values])
+        self.__alive = np.concatenate([self.__alive, np.ones(len(items), dtype=bool)])
+        self.__on_front = np.concatenate([self.__on_front, np.zeros(len(items), dtype=bool)])
+        self.__totals = np.concatenate([self.__totals, values.sum(axis=1)])
+        old_front = np.flatnonzero(self.__on_front)
+        self.__add_to_front(np.arange(start, len(self.items)))
+        for k in np.flatnonzero(self.__on_front[start:]).tolist():
+            old_values = self.values[old_front]
+            new_values = self.values[start + k]
+            dominated = (old_values <= new_values).all(axis=1) & (old_values < new_values).any(axis=1)
+            self.__on_front[old_front[dominated]] = False
+
+    def __is_dominated_by(self, values):
+        """Returns whether each item is dominated by values."""
+        return (self.values <= values).all(axis=1) & (self.values < values).any(axis=1)
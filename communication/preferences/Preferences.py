@@ -1,9 +1,15 @@
 #!/usr/bin/env python3
 
+from array import array
+
 from communication.preferences.CriterionName import CriterionName
 from communication.preferences.CriterionValue import CriterionValue
 from communication.preferences.Item import Item
+from communication.preferences.ParetoFront import ParetoFront
+from communication.preferences.QuantileSketch import QuantileSketch
+from communication.preferences.ScoringStrategy import DEFAULT_SCORING
 from communication.preferences.Value import Value
+from communication.preferences.Vocabulary import DEFAULT_VOCABULARY, UNKNOWN_CODE, get_vocabulary
 
 
 class Preferences:
@@ -14,13 +20,27 @@ class Preferences:
         criterion_name_list: the list of criterion name (ordered by importance)
         criterion_value_list: the list of criterion value
         item_list: the list of items
+        vocabulary: the Vocabulary of the criteria and values, the one of the criteria if not given
+        scoring: the ScoringStrategy ranking the items, DEFAULT_SCORING (HalvingScoring) if not given
+        quantile_bins: number of bins of the QuantileSketch answering the top x% queries on the item list
+            approximately, None to sort the scores exactly
+
+    Values are stored sparsely: only the known (item, criterion) values are kept, indexed by criterion, and
+    get_known_value returns None for the unknown ones.
     """
 
-    def __init__(self, list_criteria=None, criteria_values=None):
+    def __init__(self, list_criteria=None, criteria_values=None, vocabulary=None, scoring=None, quantile_bins=None):
         """Creates a new Preferences object."""
         self.__criterion_name_list = []
         self.__criterion_value_list = []
         self.__item_list = []
+        self.__item_set = set()  # membership index of the item list
+        self.__values = {}  # {criterion name: {item: value}} of the first criterion value of each pair
+        self.__vocabulary = vocabulary
+        self.__scoring = scoring
+        self.__pareto_front = None  # built on demand, then updated by add_items and remove_item
+        self.__quantile_bins = quantile_bins
+        self.__sketch = None  # built on demand, then updated by add_items and remove_item
         if list_criteria:
             self.set_criterion_name_list(list_criteria)  # tells criterion importance
         if criteria_values:
@@ -31,6 +51,78 @@ class Preferences:
         """Returns a string representation of the preferences."""
         return f"\n* Items: {self.__item_list}\n* Criteria: {[c.name for c in self.__criterion_name_list]}"
 
+    def __getstate__(self):
+        """Returns the preferences packed as criterion codes, items and (item, criterion, value) code triples,
+        followed by the vocabulary if it is not the preset one, then by the scoring strategy and the number of
+        quantile bins if they were set.
+        Items referenced by criterion values but no longer in the item list are appended after the first
+        len(item_list) items."""
+        items = list(self.__item_list)
+        item_index = {item: k for k, item in enumerate(items)}
+        cells = array("i")
+        for criterion_value in self.__criterion_value_list:
+            item = criterion_value.get_item()
+            k = item_index.get(item)
+            if k is None:
+                k = item_index[item] = len(items)
+                items.append(item)
+            cells.extend((k, criterion_value.get_criterion_name().value, criterion_value.get_value().value))
+        criteria = [criterion_name.value for criterion_name in self.__criterion_name_list]
+        vocabulary = self.get_vocabulary()
+        if vocabulary is DEFAULT_VOCABULARY and self.__scoring is None and self.__quantile_bins is None:
+            return bytes(criteria), tuple(items), len(self.__item_list), cells
+        state = array("i", criteria), tuple(items), len(self.__item_list), cells, vocabulary
+        if self.__quantile_bins is not None:
+            return state + (self.__scoring, self.__quantile_bins)
+        return state if self.__scoring is None else state + (self.__scoring,)
+
+    def __setstate__(self, state):
+        """Restores the preferences packed by __getstate__."""
+        criteria, items, n_items, cells = state[:4]
+        self.__vocabulary = state[4] if len(state) > 4 else None
+        self.__scoring = state[5] if len(state) > 5 else None
+        self.__quantile_bins = state[6] if len(state) > 6 else None
+        self.__pareto_front = None
+        self.__sketch = None
+        vocabulary = self.__vocabulary or DEFAULT_VOCABULARY
+        self.__criterion_name_list = [vocabulary.get_criterion(code) for code in criteria]
+        self.__item_list = list(items[:n_items])
+        self.__item_set = set(self.__item_list)
+        self.__criterion_value_list = [
+            CriterionValue(items[cells[k]], vocabulary.get_criterion(cells[k + 1]), vocabulary.get_value(cells[k + 2]))
+            for k in range(0, len(cells), 3)
+        ]
+        self.__values = {}
+        for criterion_value in self.__criterion_value_list:
+            self.__index_value(criterion_value)
+
+    def get_vocabulary(self):
+        """Returns the vocabulary of the criteria and values."""
+        if self.__vocabulary is not None:
+            return self.__vocabulary
+        if self.__criterion_name_list:
+            return get_vocabulary(self.__criterion_name_list[0])
+        return DEFAULT_VOCABULARY
+
+    def get_scoring(self):
+        """Returns the scoring strategy ranking the items."""
+        return self.__scoring if self.__scoring is not None else DEFAULT_SCORING
+
+    def set_scoring(self, scoring):
+        """Sets the scoring strategy ranking the items (None for DEFAULT_SCORING)."""
+        self.__scoring = scoring
+        self.__sketch = None
+
+    def get_quantile_bins(self):
+        """Returns the number of bins of the quantile sketch, None if top x% queries are exact."""
+        return self.__quantile_bins
+
+    def set_quantile_bins(self, quantile_bins):
+        """Sets the number of bins of the quantile sketch answering top x% queries on the item list, or None
+        to answer them exactly. The rank error of a query is under len(item_list) / quantile_bins items."""
+        self.__quantile_bins = quantile_bins
+        self.__sketch = None
+
     def get_criterion_name_list(self):
         """Returns the list of criterion name."""
         return self.__criterion_name_list
@@ -46,22 +138,126 @@ class Preferences:
     def set_criterion_name_list(self, criterion_name_list):
         """Sets the list of criterion name (ordered by importance)."""
         self.__criterion_name_list = criterion_name_list
+        self.__pareto_front = None
+        self.__sketch = None
 
     def add_criterion_value(self, criterion_value):
         """Adds a criterion value in the list."""
-        item = criterion_value.get_item()
-        if item not in self.__item_list:
-            self.__item_list.append(item)
-        self.__criterion_value_list.append(criterion_value)
+        self.add_items([criterion_value])
+
+    def add_items(self, criterion_values):
+        """Adds criterion values in bulk, appending their new items to the item list in order of appearance.
+        The value index, the quantile sketch and the Pareto front are updated incrementally (the front is only
+        rebuilt on demand if values of items already in the list are added)."""
+        criterion_values = list(criterion_values)
+        new_items = []
+        updated_items = []
+        seen = set()
+        for criterion_value in criterion_values:
+            item = criterion_value.get_item()
+            if item in seen:
+                continue
+            seen.add(item)
+            if item in self.__item_set:
+                updated_items.append(item)
+            else:
+                self.__item_set.add(item)
+                self.__item_list.append(item)
+                new_items.append(item)
+        sketch = self.__sketch
+        if sketch is not None:
+            for item in updated_items:
+                sketch.remove(self.get_score(item))
+        for criterion_value in criterion_values:
+            self.__criterion_value_list.append(criterion_value)
+            self.__index_value(criterion_value)
+        if sketch is not None and (new_items or updated_items):
+            for score in self.get_scores(new_items + updated_items):
+                sketch.insert(score)
+        if self.__pareto_front is not None:
+            if updated_items:
+                self.__pareto_front = None
+            elif new_items:
+                self.__pareto_front.add(new_items, self.get_value_matrix(new_items))
+
+    def __index_value(self, criterion_value):
+        """Indexes a criterion value, unless its (item, criterion) pair already has a value."""
+        values = self.__values.get(criterion_value.get_criterion_name())
+        if values is None:
+            values = self.__values[criterion_value.get_criterion_name()] = {}
+        values.setdefault(criterion_value.get_item(), criterion_value.get_value())
+
+    def get_pareto_front(self):
+        """Returns the items of the item list which are not dominated on the criteria by another one, in the
+        order of the item list."""
+        if self.__pareto_front is None:
+            self.__pareto_front = ParetoFront(self.__item_list, self.get_value_matrix(self.__item_list))
+        return self.__pareto_front.get_items()
+
+    def get_quantile_sketch(self):
+        """Returns the QuantileSketch of the scores of the item list, built on demand and rebuilt when its updates
+        would exceed its error bound, None if there are no quantile bins or the scores depend on the items."""
+        if self.__quantile_bins is None or self.get_scoring().depends_on_items:
+            return None
+        if self.__sketch is None or self.__sketch.needs_rebuild():
+            self.__sketch = QuantileSketch(self.get_scores(self.__item_list), self.__quantile_bins)
+        return self.__sketch
 
     def get_value(self, item, criterion_name):
-        """Gets the value for a given item and a given criterion name."""
-        for value in self.__criterion_value_list:
-            if value.get_item() == item and value.get_criterion_name() == criterion_name:
-                return value.get_value()
+        """Gets the value for a given item and a given criterion name, raises an Exception if it is unknown."""
+        value = self.get_known_value(item, criterion_name)
+        if value is None:
+            raise Exception(f"No value found for item {item} and criterion {criterion_name}")
+        return value
+
+    def get_known_value(self, item, criterion_name):
+        """Returns the value for a given item and a given criterion name, None if it is unknown."""
+        values = self.__values.get(criterion_name)
+        return values.get(item) if values is not None else None
+
+    def get_criterion_values(self, criterion_name):
+        """Returns the known values of the items on a given criterion, as an {item: value} dict not to be
+        modified."""
+        return self.__values.get(criterion_name, {})
+
+    def get_item_values(self, item):
+        """Returns the known values of an item as (criterion name, value) pairs ordered by importance."""
+        item_values = []
+        for criterion_name in self.__criterion_name_list:
+            value = self.get_known_value(item, criterion_name)
+            if value is not None:
+                item_values.append((criterion_name, value))
+        return item_values
+
+    def get_value_rows(self, item_list):
+        """Returns the value codes of items on the criteria ordered by importance (list of lists of ints), with
+        UNKNOWN_CODE for the unknown values, which scoring strategies rank below the worst value."""
+        rows = []
+        for item in item_list:
+            row = []
+            for criterion_name in self.__criterion_name_list:
+                value = self.get_known_value(item, criterion_name)
+                row.append(value.value if value is not None else UNKNOWN_CODE)
+            rows.append(row)
+        return rows
+
+    def get_value_matrix(self, item_list):
+        """Returns the (item, criterion) matrix of the value codes of items (np.ndarray), as get_value_rows."""
+        import numpy as np
+
+        rows = self.get_value_rows(item_list)
+        return np.array(rows, dtype=np.int64).reshape(len(item_list), len(self.__criterion_name_list))
+
+    def get_scores(self, item_list):
+        """Returns the scores of items with the scoring strategy, computed together."""
+        return self.get_scoring().get_row_scores(self.get_value_rows(item_list))
 
-        raise Exception(f"No value found for item {item} and criterion {criterion_name}")
-        return None
+    def get_score(self, item):
+        """Returns the score of an item with the scoring strategy, among the items known by the agent if
+        the strategy depends on the scored items."""
+        if not self.get_scoring().depends_on_items or item not in self.__item_list:
+            return self.get_scores([item])[0]
+        return self.get_scores(self.__item_list)[self.__item_list.index(item)]
 
     def is_preferred_criterion(self, criterion_name_1, criterion_name_2):
         """Returns if a criterion 1 is preferred to the criterion 2."""
@@ -79,7 +275,8 @@ class Preferences:
         """Returns if the item 1 is preferred to the item 2."""
         if criterion:
             return self.get_value(item_1, criterion) > self.get_value(item_2, criterion)
-        return item_1.get_score(self) > item_2.get_score(self)
+        score_1, score_2 = self.get_scores([item_1, item_2])
+        return score_1 > score_2
 
     def most_preferred(self, item_list=None, exclude_list=None):
         """Returns the most preferred item from a list. If no list is given, the list of items known by agent is used."""
@@ -89,11 +286,12 @@ class Preferences:
             item_list = [item for item in item_list if item not in exclude_list]
         if len(item_list) == 0:
             return None
-        best_item = item_list[0]
-        for item in item_list:
-            if self.is_preferred_item(item, best_item):  # TODO: check if we need to shuffle the list before
-                best_item = item
-        return best_item
+        scores = self.get_scores(item_list)
+        best = 0
+        for k in range(len(item_list)):
+            if scores[k] > scores[best]:  # TODO: check if we need to shuffle the list before
+                best = k
+        return item_list[best]
 
     def is_item_among_top_10_percent(self, item, list_items=None):
         """
@@ -111,18 +309,30 @@ class Preferences:
         """
         if list_items is None:
             list_items = self.__item_list
-        assert len(list_items) > 0 and item in list_items, f"{item} is not in {list_items}"
-        scores = [item.get_score(self) for item in list_items]
+        known_items = self.__item_set if list_items is self.__item_list else list_items
+        assert len(list_items) > 0 and item in known_items, f"{item} is not in {list_items}"
+        sketch = self.get_quantile_sketch() if list_items is self.__item_list else None
+        if sketch is not None:
+            return sketch.is_among_top_x_percent(self.get_score(item), x)
+        scores = list(self.get_scores(list_items))
+        score = scores[list_items.index(item)]
         scores.sort(reverse=True)
         top_x_percent = scores[: int(len(scores) * x / 100)]
-        return item.get_score(self) in top_x_percent
+        return score in top_x_percent
 
     def remove_item(self, item):
-        """Removes an item from the list of items and the related criteria."""
+        """Removes an item from the list of items with all its criterion values, its values becoming unknown."""
+        if self.__sketch is not None and item in self.__item_set:
+            self.__sketch.remove(self.get_score(item))
         self.__item_list.remove(item)
-        for criterion_value in self.__criterion_value_list:
-            if criterion_value.get_item() == item:
-                self.__criterion_value_list.remove(criterion_value)
+        self.__item_set.discard(item)
+        self.__criterion_value_list[:] = [
+            criterion_value for criterion_value in self.__criterion_value_list if criterion_value.get_item() != item
+        ]
+        for values in self.__values.values():
+            values.pop(item, None)
+        if self.__pareto_front is not None:
+            self.__pareto_front.remove(item)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+
+from bisect import bisect_right
+
+
+class QuantileSketch:
+    """QuantileSketch class.
+    This class approximates the ranks of scores with an equi-depth histogram: n_bins bins delimited by
+    quantiles of the scores it was built from, with the count of scores of each bin. Scores can be inserted
+    and removed, and top x% queries are answered from the counts, without sorting the scores.
+
+    The rank error of a query is at most half the count of the bin holding its boundary, the top bin included,
+    and ties are exact on the bins holding a single score (when many scores are equal) as long as no other
+    score is inserted in them. Built from n distinct scores, the bins hold at most ceil(n/n_bins) scores, each
+    insertion adding one to a bin. The sketch reports that it must be rebuilt (from the current scores) once it has
+    been updated more than max(n, len(sketch))/n_bins times since it was built, so that with distinct scores
+    the error stays within max(n, len(sketch))/n_bins + 1/2 scores.
+    Scores only need to be comparable (floats or tuples).
+
+    attr:
+        n_bins: maximum number of bins
+        n_updates: number of insertions and removals since the sketch was built
+    """
+
+    def __init__(self, scores, n_bins=100):
+        """Creates a new QuantileSketch of scores."""
+        self.n_bins = n_bins
+        self.n_updates = 0
+        scores = sorted(scores)
+        self.__n_built = len(scores)
+        # lower bounds of the bins, the first one lowered by the insertion of lower scores
+        self.__bounds = []
+        for k in range(n_bins):
+            bound = scores[k * len(scores) // n_bins] if scores else None
+            if bound is not None and (not self.__bounds or bound > self.__bounds[-1]):
+                self.__bounds.append(bound)
+        self.__counts = [0] * len(self.__bounds)
+        self.__single = [True] * len(self.__bounds)  # whether all the scores of the bin equal its bound
+        for score in scores:
+            self.__add(score)
+        self.__n_scores = len(scores)
+        self.__thresholds = {}
+
+    def __len__(self):
+        """Returns the number of scores."""
+        return self.__n_scores
+
+    def __get_bin(self, score):
+        return max(bisect_right(self.__bounds, score) - 1, 0)
+
+    def __add(self, score):
+        if score < self.__bounds[0]:
+            self.__single[0] = self.__counts[0] == 0
+            self.__bounds[0] = score
+        k = self.__get_bin(score)
+        self.__counts[k] += 1
+        if score != self.__bounds[k]:
+            self.__single[k] = False
+
+    def insert(self, score):
+        """Inserts a score."""
+        if not self.__bounds:
+            self.__bounds.append(score)
+            self.__counts.append(0)
+            self.__single.append(True)
+        self.__add(score)
+        self.__n_scores += 1
+        self.n_updates += 1
+        self.__thresholds.clear()
+
+    def remove(self, score):
+        """Removes a score, which must have been inserted."""
+        self.__counts[self.__get_bin(score)] -= 1
+        self.__n_scores -= 1
+        self.n_updates += 1
+        self.__thresholds.clear()
+
+    def needs_rebuild(self):
+        """Returns whether the sketch has been updated too much since it was built to keep its error bound."""
+        return self.n_updates > max(self.__n_built, self.__n_scores) / self.n_bins
+
+    def get_threshold(self, x):
+        """Returns the lowest bound of the scores among the top x% (None if there is none): the bins of the
+        x% best scores, with the boundary bin only if at least half of its scores are needed or all of them are
+        equal."""
+        threshold = self.__thresholds.get(x, self)
+        if threshold is not self:
+            return threshold
+        n_top = int(self.__n_scores * x / 100)
+        threshold = None
+        if n_top > 0:
+            n_above = 0
+            for k in range(len(self.__counts) - 1, -1, -1):
+                n_above += self.__counts[k]
+                if n_above >= n_top:
+                    needed = self.__counts[k] - (n_above - n_top)
+                    if 2 * needed >= self.__counts[k] or self.__single[k]:
+                        threshold = self.__bounds[k]
+                    elif k + 1 < len(self.__bounds):
+                        threshold = self.__bounds[k + 1]
+                    break
+        self.__thresholds[x] = threshold
+        return threshold
+
+    def is_among_top_x_percent(self, score, x):
+        """Returns whether a score is approximately among the top x% of the scores."""
+        threshold = self.get_threshold(x)
+        return threshold is not None and score >= threshold
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+
+
+class ScoringStrategy:
+    """ScoringStrategy class.
+    This class is the interface of the scoring models used by Preferences to rank items. A strategy scores
+    items from the matrix of their value codes, with one row by item and one column by criterion of the
+    agent ordered by importance (as get_criterion_name_list), as a vectorized operation over this matrix.
+    Higher scores are preferred, and scores are only compared with each other, with == and >.
+
+    attr:
+        depends_on_items: whether the score of an item depends on the other items scored with it
+    """
+
+    depends_on_items = False
+
+    def __repr__(self):
+        """Returns the strategy as a string, which identifies its parameters."""
+        return f"{type(self).__name__}()"
+
+    def __eq__(self, o):
+        """Returns True if the strategies score items in the same way."""
+        return type(o) is type(self) and repr(o) == repr(self)
+
+    def __hash__(self):
+        """Returns the hash of the strategy."""
+        return hash(repr(self))
+
+    def get_scores(self, values):
+        """Returns the scores of the items given the (item, criterion) matrix of their value codes (np.ndarray)."""
+        raise NotImplementedError
+
+    def get_row_scores(self, rows):
+        """Returns the scores of the items given the value codes of each one (list of lists of ints), the same
+        as get_scores. Strategies computing them in pure Python spare the protocol the import of NumPy."""
+        import numpy as np
+
+        n_criteria = len(rows[0]) if rows else 0
+        return self.get_scores(np.array(rows, dtype=np.int64).reshape(len(rows), n_criteria))
+
+    def get_ranks(self, values):
+        """Returns numbers ordered and equal as the scores of the items (np.ndarray), for array kernels."""
+        import numpy as np
+
+        return np.asarray(self.get_scores(values))
+
+
+class HalvingScoring(ScoringStrategy):
+    """HalvingScoring class.
+    The historical scoring of Item.get_score: the sum of the value codes weighted by 100, 50, 25, ... by order
+    of importance of the criteria. Sums are accumulated criterion by criterion, with the same floating point
+    operations as the scalar loop, but lose the lexicographic order past ~50 criteria.
+    """
+
+    def get_scores(self, values):
+        import numpy as np
+
+        scores = np.zeros(len(values))
+        criterion_weight = 100
+        for position in range(values.shape[1]):
+            scores = scores + criterion_weight * values[:, position]
+            criterion_weight = criterion_weight / 2
+        return scores
+
+    def get_row_scores(self, rows):
+        scores = []
+        for row in rows:
+            score = 0.0
+            criterion_weight = 100
+            for code in row:
+                score = score + criterion_weight * code  # the floating point operations of get_scores
+                criterion_weight = criterion_weight / 2
+            scores.append(score)
+        return scores
+
+
+class WeightedScoring(ScoringStrategy):
+    """WeightedScoring class.
+    The sum of the value codes weighted by custom weights, given by order of importance of the criteria.
+    Criteria after the last weight are weighted 0.
+
+    attr:
+        weights: the weights of the criteria by order of importance (tuple of floats)
+    """
+
+    def __init__(self, weights):
+        """Creates a new WeightedScoring."""
+        self.weights = tuple(float(weight) for weight in weights)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.weights})"
+
+    def get_scores(self, values):
+        import numpy as np
+
+        n_weights = min(len(self.weights), values.shape[1])
+        return values[:, :n_weights] @ np.array(self.weights[:n_weights])
+
+
+class LexicographicScoring(ScoringStrategy):
+    """LexicographicScoring class.
+    The exact lexicographic order of the value codes by order of importance of the criteria: the score of an
+    item is the tuple of its value codes, so that comparisons run on integer tuples whatever the number of
+    criteria.
+    """
+
+    def get_scores(self, values):
+        return list(map(tuple, values.tolist()))
+
+    def get_row_scores(self, rows):
+        return list(map(tuple, rows))
+
+    def get_ranks(self, values):
+        """Returns the dense ranks of the rows of values in lexicographic order."""
+        import numpy as np
+
+        if values.shape[1] == 0 or len(values) == 0:
+            return np.zeros(len(values), dtype=np.int64)
+        return np.unique(values, axis=0, return_inverse=True)[1].reshape(-1)
+
+
+class BordaScoring(ScoringStrategy):
+    """BordaScoring class.
+    The Borda count of the items: on each criterion, an item gets one point by scored item with a strictly
+    lower value, and its score is the sum of its points. Scores depend on the set of items scored together.
+    """
+
+    depends_on_items = True
+
+    def get_scores(self, values):
+        import numpy as np
+
+        n_items, n_criteria = values.shape
+        if n_items == 0 or n_criteria == 0:
+            return np.zeros(n_items, dtype=np.int64)
+        # search all the columns at once, shifted so that each one is sorted in its own range
+        values = values.astype(np.int64) - values.min()
+        offsets = np.arange(n_criteria, dtype=np.int64) * (values.max() + 1)
+        sorted_values = (np.sort(values, axis=0) + offsets).T.reshape(-1)
+        lower = np.searchsorted(sorted_values, (values + offsets).T.reshape(-1), side="left")
+        lower = lower.reshape(n_criteria, n_items) - (np.arange(n_criteria) * n_items)[:, None]
+        return lower.sum(axis=0)
+
+
+DEFAULT_SCORING = HalvingScoring()
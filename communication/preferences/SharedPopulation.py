@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from communication.preferences.CriterionValue import CriterionValue
+from communication.preferences.Item import Item
+from communication.preferences.ItemCatalog import _get_catalog_item
+from communication.preferences.Preferences import Preferences
+from communication.preferences.ScoringStrategy import DEFAULT_SCORING
+from communication.preferences.Vocabulary import DEFAULT_VOCABULARY
+
+MISSING = -1  # padding and missing values in the arrays
+
+
+def get_item_key(item):
+    """Returns the name of an item with the name of its catalog (None if it is not interned), so that items of
+    the same name from different catalogs are stored apart."""
+    return item.get_name(), item.get_catalog().name if item.get_catalog() is not None else None
+
+
+def get_code_dtype(n_codes):
+    """Returns the smallest signed integer dtype holding the codes up to n_codes and MISSING."""
+    return np.result_type(np.int8, np.min_scalar_type(-n_codes - 1))
+
+
+class SharedPopulation:
+    """SharedPopulation class.
+    This class stores the preferences of a population of agents in shared memory blocks, so that worker
+    processes attach to them once and read them without any copy.
+
+    Not intended to be instantiated directly: use SharedPopulation.create in the parent process, then
+    SharedPopulation.attach(population.get_spec()) in the workers.
+
+    attr:
+        values: (agent, item, criterion) tensor of the value codes, MISSING when an agent has no value
+            (np.int8, np.int16 for vocabularies of more than 127 values)
+        criteria: (agent, position) criterion codes of each agent ordered by importance, MISSING padded
+            (np.int8, np.int16 for vocabularies of more than 127 criteria)
+        n_criteria: number of criteria of each agent (np.int32)
+        cells: (agent, position) order of the criterion values of each agent, as item * n_criterion_codes +
+            criterion codes, MISSING padded (np.int32)
+        cell_values: (agent, position) value codes of the criterion values of each agent, MISSING padded, so that
+            a cell given twice keeps both of its values (dtype of values)
+        n_cells: number of criterion values of each agent (np.int32)
+        item_names: names of the items of the whole population (ShareableList)
+        item_descriptions: descriptions of the items of the whole population (ShareableList)
+        item_catalogs: names of the ItemCatalogs of the items, None for items which are not interned (ShareableList)
+        vocabulary: the Vocabulary shared by the preferences of the population
+        scorings: the scoring strategies of the agents which do not use DEFAULT_SCORING, by row (dict)
+        quantile_bins: the numbers of quantile bins of the agents which set one, by row (dict)
+        rows: the rows of the agents by key for a population created from a dict (None for a list, the key
+            of an agent being its row)
+    """
+
+    ARRAY_NAMES = ("values", "criteria", "n_criteria", "cells", "cell_values", "n_cells")
+
+    def __init__(
+        self,
+        blocks,
+        arrays,
+        item_names,
+        item_descriptions,
+        item_catalogs,
+        owner,
+        vocabulary=DEFAULT_VOCABULARY,
+        scorings=None,
+        quantile_bins=None,
+        rows=None,
+    ):
+        """Creates a new SharedPopulation from already allocated shared memory blocks."""
+        self.vocabulary = vocabulary
+        self.scorings = scorings or {}
+        self.quantile_bins = quantile_bins or {}
+        self.rows = rows
+        self.__blocks = blocks
+        self.__arrays = arrays
+        self.__item_names = item_names
+        self.__item_descriptions = item_descriptions
+        self.__item_catalogs = item_catalogs
+        self.__owner = owner
+        self.__items = {}
+        self.__preferences = {}
+
+    @classmethod
+    def create(cls, population):
+        """Copies a list of Preferences sharing one vocabulary into new shared memory blocks, or a dict of them
+        by agent key (such as the ids of an IncrementalTournament), the preferences being then read by key."""
+        rows = None
+        if isinstance(population, dict):
+            rows = {key: row for row, key in enumerate(population)}
+            population = list(population.values())
+        vocabulary = population[0].get_vocabulary() if len(population) > 0 else DEFAULT_VOCABULARY
+        if any(preferences.get_vocabulary() is not vocabulary for preferences in population):
+            raise ValueError("The preferences of the population do not share one vocabulary")
+        item_index = {}
+        names = []
+        descriptions = []
+        catalogs = []
+        for preferences in population:
+            for item in preferences.get_item_list():
+                key = get_item_key(item)
+                if key not in item_index:
+                    item_index[key] = len(names)
+                    names.append(item.get_name())
+                    descriptions.append(item.get_description())
+                    catalogs.append(key[1])
+
+        n_agents = len(population)
+        n_codes = vocabulary.get_criteria_count()
+        value_dtype = get_code_dtype(vocabulary.get_values_count())
+        max_criteria = max([len(preferences.get_criterion_name_list()) for preferences in population] + [1])
+        max_cells = max([len(preferences.get_criterion_value_list()) for preferences in population] + [1])
+        arrays = {
+            "values": np.full((n_agents, len(names), n_codes), MISSING, dtype=value_dtype),
+            "criteria": np.full((n_agents, max_criteria), MISSING, dtype=get_code_dtype(n_codes)),
+            "n_criteria": np.zeros(n_agents, dtype=np.int32),
+            "cells": np.full((n_agents, max_cells), MISSING, dtype=np.int32),
+            "cell_values": np.full((n_agents, max_cells), MISSING, dtype=value_dtype),
+            "n_cells": np.zeros(n_agents, dtype=np.int32),
+        }
+        for k, preferences in enumerate(population):
+            criteria = [criterion_name.value for criterion_name in preferences.get_criterion_name_list()]
+            arrays["criteria"][k, : len(criteria)] = criteria
+            arrays["n_criteria"][k] = len(criteria)
+            criterion_values = preferences.get_criterion_value_list()
+            for position, criterion_value in enumerate(criterion_values):
+                item = item_index[get_item_key(criterion_value.get_item())]
+                criterion = criterion_value.get_criterion_name().value
+                arrays["cells"][k, position] = item * n_codes + criterion
+                arrays["cell_values"][k, position] = criterion_value.get_value().value
+                if arrays["values"][k, item, criterion] == MISSING:  # get_value returns the first match
+                    arrays["values"][k, item, criterion] = criterion_value.get_value().value
+            arrays["n_cells"][k] = len(criterion_values)
+
+        blocks = {}
+        shared_arrays = {}
+        for name, array in arrays.items():
+            blocks[name] = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            shared_arrays[name] = np.ndarray(array.shape, dtype=array.dtype, buffer=blocks[name].buf)
+            shared_arrays[name][...] = array
+        item_names = shared_memory.ShareableList(names)
+        item_descriptions = shared_memory.ShareableList(descriptions)
+        item_catalogs = shared_memory.ShareableList(catalogs)
+        scorings = {
+            k: preferences.get_scoring()
+            for k, preferences in enumerate(population)
+            if preferences.get_scoring() != DEFAULT_SCORING
+        }
+        quantile_bins = {
+            k: preferences.get_quantile_bins()
+            for k, preferences in enumerate(population)
+            if preferences.get_quantile_bins() is not None
+        }
+        return cls(
+            blocks,
+            shared_arrays,
+            item_names,
+            item_descriptions,
+            item_catalogs,
+            owner=True,
+            vocabulary=vocabulary,
+            scorings=scorings,
+            quantile_bins=quantile_bins,
+            rows=rows,
+        )
+
+    @classmethod
+    def attach(cls, spec):
+        """Attaches to the shared memory blocks described by the spec of a population created elsewhere."""
+        blocks = {}
+        arrays = {}
+        for name, (block_name, shape, dtype) in spec["arrays"].items():
+            blocks[name] = shared_memory.SharedMemory(name=block_name)
+            arrays[name] = np.ndarray(shape, dtype=dtype, buffer=blocks[name].buf)
+        item_names = shared_memory.ShareableList(name=spec["item_names"])
+        item_descriptions = shared_memory.ShareableList(name=spec["item_descriptions"])
+        item_catalogs = shared_memory.ShareableList(name=spec["item_catalogs"])
+        return cls(
+            blocks,
+            arrays,
+            item_names,
+            item_descriptions,
+            item_catalogs,
+            owner=False,
+            vocabulary=spec["vocabulary"],
+            scorings=spec["scorings"],
+            quantile_bins=spec["quantile_bins"],
+            rows=spec["rows"],
+        )
+
+    def get_spec(self):
+        """Returns the small picklable description needed to attach to the population."""
+        return {
+            "arrays": {
+                name: (self.__blocks[name].name, self.__arrays[name].shape, self.__arrays[name].dtype.str)
+                for name in self.ARRAY_NAMES
+            },
+            "item_names": self.__item_names.shm.name,
+            "item_descriptions": self.__item_descriptions.shm.name,
+            "item_catalogs": self.__item_catalogs.shm.name,
+            "vocabulary": self.vocabulary,
+            "scorings": self.scorings,
+            "quantile_bins": self.quantile_bins,
+            "rows": self.rows,
+        }
+
+    def __len__(self):
+        """Returns the number of agents."""
+        return self.__arrays["n_criteria"].shape[0]
+
+    def __getitem__(self, k):
+        """Returns the preferences of agent k (alias of get_preferences)."""
+        return self.get_preferences(k)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        if self.__owner:
+            self.unlink()
+
+    def get_values(self):
+        """Returns the (agent, item, criterion) tensor of value codes."""
+        return self.__arrays["values"]
+
+    def get_row(self, k):
+        """Returns the row of agent k in the arrays."""
+        return self.rows[k] if self.rows is not None else k
+
+    def get_criteria(self, k):
+        """Returns the criterion codes of agent k ordered by importance."""
+        row = self.get_row(k)
+        return self.__arrays["criteria"][row, : self.__arrays["n_criteria"][row]]
+
+    def get_item(self, index):
+        """Returns the Item of a given index, creating it on first access (interned items are the ones of their
+        catalog in this process)."""
+        item = self.__items.get(index)
+        if item is None:
+            catalog_name = self.__item_catalogs[index]
+            if catalog_name is not None:
+                item = _get_catalog_item(catalog_name, self.__item_names[index], self.__item_descriptions[index])
+            else:
+                item = Item(self.__item_names[index], self.__item_descriptions[index])
+            self.__items[index] = item
+        return item
+
+    def get_preferences(self, k):
+        """Returns the Preferences of agent k, with the same criteria, items and criterion values order as the
+        original one. They are built once by row in each process and shared by the calls, so they must not be
+        modified (ArgumentModel works on copies)."""
+        row = self.get_row(k)
+        preferences = self.__preferences.get(row)
+        if preferences is None:
+            preferences = self.__preferences[row] = self.__build_preferences(row)
+        return preferences
+
+    def __build_preferences(self, row):
+        """Builds the Preferences of the agent of a given row from the arrays."""
+        n_codes = self.__arrays["values"].shape[2]
+        n_cells = self.__arrays["n_cells"][row]
+        cells = self.__arrays["cells"][row, :n_cells].tolist()
+        cell_values = self.__arrays["cell_values"][row, :n_cells].tolist()
+        criterion_values = []
+        for cell, value in zip(cells, cell_values):
+            item, criterion = divmod(cell, n_codes)
+            criterion_values.append(
+                CriterionValue(
+                    self.get_item(item), self.vocabulary.get_criterion(criterion), self.vocabulary.get_value(value)
+                )
+            )
+        criteria = self.__arrays["criteria"][row, : self.__arrays["n_criteria"][row]]
+        list_criteria = [self.vocabulary.get_criterion(code) for code in criteria.tolist()]
+        return Preferences(
+            list_criteria, criterion_values, self.vocabulary, self.scorings.get(row), self.quantile_bins.get(row)
+        )
+
+    def close(self):
+        """Closes the access to the shared memory blocks from this process."""
+        self.__arrays = {}
+        self.__preferences = {}
+        for block in self.__blocks.values():
+            block.close()
+        self.__item_names.shm.close()
+        self.__item_descriptions.shm.close()
+        self.__item_catalogs.shm.close()
+
+    def unlink(self):
+        """Frees the shared memory blocks, to be called once by the process which created them."""
+        for block in self.__blocks.values():
+            block.unlink()
+        self.__item_names.shm.unlink()
+        self.__item_descriptions.shm.unlink()
+        self.__item_catalogs.shm.unlink()
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+
+from communication.preferences.CriterionName import CriterionName
+from communication.preferences.Value import Value
+
+
+class Term:
+    """Term class.
+    A criterion or a value of a Vocabulary. Like the members of the CriterionName and Value enums, a term has
+    a name and an integer code (value). Terms are unique in their vocabulary and compared by identity.
+
+    attr:
+        name: the name of the term (str)
+        value: the dense integer code of the term in its vocabulary (int)
+    """
+
+    __slots__ = ("name", "value", "__vocabulary", "__is_criterion")
+
+    def __init__(self, vocabulary, is_criterion, name, value):
+        """Creates a new Term, only to be called by its Vocabulary."""
+        self.__vocabulary = vocabulary
+        self.__is_criterion = is_criterion
+        self.name = name
+        self.value = value
+
+    def __repr__(self):
+        """Returns the term as a string."""
+        return f"<{self.__vocabulary.name}.{self.name}: {self.value}>"
+
+    def __reduce__(self):
+        """Pickles the term as its vocabulary and its code, to restore the registered term."""
+        return _get_term, (self.__vocabulary, self.__is_criterion, self.value)
+
+    def get_vocabulary(self):
+        """Returns the vocabulary of the term."""
+        return self.__vocabulary
+
+
+def _get_term(vocabulary, is_criterion, code):
+    return vocabulary.get_criterion(code) if is_criterion else vocabulary.get_value(code)
+
+
+class Vocabulary:
+    """Vocabulary class.
+    This class registers the criteria and the ordinal value scale used by preferences, with dense integer codes
+    (codes of values are ordered from the worst to the best value). The values of the lower half of the scale
+    are bad and the ones of the upper half are good, as VERY_BAD, BAD and GOOD, VERY_GOOD in the preset.
+
+    Vocabularies are registered by name. The terms of the preset DEFAULT_VOCABULARY are the members of the
+    CriterionName and Value enums, the ones of other vocabularies are Terms, and criteria can be added to them.
+    A pickled vocabulary is restored as the vocabulary registered with the same name.
+
+    attr:
+        name: the name of the vocabulary (str)
+    """
+
+    __vocabularies = {}
+
+    def __init__(self, name, criterion_names=(), value_names=()):
+        """Creates and registers a new Vocabulary of Terms with the given names, ordered by code."""
+        if name in Vocabulary.__vocabularies:
+            raise ValueError(f"A vocabulary named {name} is already registered")
+        self.name = name
+        self.__criteria = []
+        self.__criterion_codes = {}
+        self.__frozen = False
+        self.__set_values([Term(self, False, value_name, code) for code, value_name in enumerate(value_names)])
+        for criterion_name in criterion_names:
+            self.add_criterion(criterion_name)
+        Vocabulary.__vocabularies[name] = self
+
+    @staticmethod
+    def from_enums(name, criterion_enum, value_enum):
+        """Creates and registers a new Vocabulary whose terms are the members of enums with dense codes.
+        Its criteria cannot be extended."""
+        vocabulary = Vocabulary(name)
+        vocabulary.__criteria = list(criterion_enum)
+        vocabulary.__criterion_codes = {criterion.name: criterion.value for criterion in vocabulary.__criteria}
+        vocabulary.__set_values(list(value_enum))
+        vocabulary.__frozen = True
+        return vocabulary
+
+    def __set_values(self, values):
+        self.__values = values
+        self.__value_codes = {value.name: value.value for value in values}
+        self.__good_codes = tuple(code for code in range(len(values)) if 2 * code > len(values) - 1)
+        self.__bad_codes = tuple(code for code in range(len(values)) if 2 * code < len(values) - 1)
+
+    def __repr__(self):
+        """Returns the vocabulary as a string."""
+        return f"Vocabulary({self.name}, {len(self.__criteria)} criteria, {len(self.__values)} values)"
+
+    def __reduce__(self):
+        """Pickles the vocabulary as its name and the names of its terms."""
+        if self.__frozen:
+            return Vocabulary.get, (self.name,)
+        return Vocabulary.get_or_create, (self.name, self.get_criterion_names(), self.get_value_names())
+
+    @staticmethod
+    def get(name):
+        """Returns the vocabulary registered with a given name."""
+        return Vocabulary.__vocabularies[name]
+
+    @staticmethod
+    def get_or_create(name, criterion_names, value_names):
+        """Returns the vocabulary registered with a given name, creating it if there is none.
+        The criteria missing from a registered vocabulary are added to it."""
+        vocabulary = Vocabulary.__vocabularies.get(name)
+        if vocabulary is None:
+            return Vocabulary(name, criterion_names, value_names)
+        if list(value_names) != vocabulary.get_value_names():
+            raise ValueError(f"The values of the vocabulary {name} are {vocabulary.get_value_names()}")
+        for criterion_name in criterion_names:
+            vocabulary.add_criterion(criterion_name)
+        return vocabulary
+
+    def add_criterion(self, criterion_name):
+        """Returns the criterion of a given name, registering it with the next code if it is new."""
+        code = self.__criterion_codes.get(criterion_name)
+        if code is not None:
+            return self.__criteria[code]
+        if self.__frozen:
+            raise ValueError(f"The criteria of the vocabulary {self.name} cannot be extended")
+        criterion = Term(self, True, criterion_name, len(self.__criteria))
+        self.__criteria.append(criterion)
+        self.__criterion_codes[criterion_name] = criterion.value
+        return criterion
+
+    def get_criterion(self, code):
+        """Returns the criterion of a given code."""
+        return self.__criteria[code]
+
+    def get_value(self, code):
+        """Returns the value of a given code."""
+        return self.__values[code]
+
+    def get_criterion_by_name(self, name):
+        """Returns the criterion of a given name."""
+        return self.__criteria[self.__criterion_codes[name]]
+
+    def get_value_by_name(self, name):
+        """Returns the value of a given name."""
+        return self.__values[self.__value_codes[name]]
+
+    def get_criteria(self):
+        """Returns the criteria ordered by code."""
+        return list(self.__criteria)
+
+    def get_values(self):
+        """Returns the values ordered by code, from the worst to the best."""
+        return list(self.__values)
+
+    def get_criterion_names(self):
+        """Returns the names of the criteria ordered by code."""
+        return [criterion.name for criterion in self.__criteria]
+
+    def get_value_names(self):
+        """Returns the names of the values ordered by code."""
+        return [value.name for value in self.__values]
+
+    def get_criteria_count(self):
+        """Returns the number of criteria."""
+        return len(self.__criteria)
+
+    def get_values_count(self):
+        """Returns the number of values."""
+        return len(self.__values)
+
+    def get_good_codes(self):
+        """Returns the codes of the good values."""
+        return self.__good_codes
+
+    def get_bad_codes(self):
+        """Returns the codes of the bad values."""
+        return self.__bad_codes
+
+    def is_good(self, value):
+        """Returns whether a value (None for no value) is good."""
+        return value is not None and 2 * value.value > len(self.__values) - 1
+
+    def is_bad(self, value):
+        """Returns whether a value (None for no value) is bad."""
+        return value is not None and 2 * value.value < len(self.__values) - 1
+
+
+DEFAULT_VOCABULARY = Vocabulary.from_enums("default", CriterionName, Value)
+UNKNOWN_CODE = -1  # code of the unknown values in value matrices, below the worst value
+
+
+def get_vocabulary(term):
+    """Returns the vocabulary of a criterion or a value."""
+    return term.get_vocabulary() if isinstance(term, Term) else DEFAULT_VOCABULARY
+
+
+def encode_term(term):
+    """Returns the code of a term of the preset vocabulary, or the Term itself, which pickles with its vocabulary."""
+    return term if isinstance(term, Term) else term.value
+
+
+def decode_criterion(state):
+    """Returns the criterion encoded by encode_term."""
+    return CriterionName(state) if isinstance(state, int) else state
+
+
+def decode_value(state):
+    """Returns the value encoded by encode_term."""
+    return Value(state) if isinstance(state, int) else state
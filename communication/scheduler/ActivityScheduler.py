@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+
+import heapq
+
+from communication.scheduler.BaseScheduler import BaseScheduler
+
+
+class ActivityScheduler(BaseScheduler):
+    """ActivityScheduler class.
+    Scheduler which only steps the agents having pending work, i.e. unread messages or a due timer.
+
+    Agents are stepped in the order they were added, like BaseScheduler. An agent woken during a tick
+    is stepped in the same tick if it comes after the agent currently stepped, otherwise at the next tick.
+    Newly added agents are active at the next tick, and finished agents leave the active set.
+
+    attr:
+        active: the unique ids of the agents to step at the next tick (set)
+        timers: the tick at which each sleeping agent must be woken up (dict)
+    """
+
+    def __init__(self, model):
+        """Create a new ActivityScheduler."""
+        super().__init__(model)
+        self.__ranks = {}
+        self.__next_rank = 0
+        self.__active = set()
+        self.__timers = {}
+        self.__timers_by_tick = {}
+        self.__queue = None
+        self.__queued = set()
+        self.__current_rank = -1
+
+    def add(self, agent):
+        """Add an agent to the schedule, it will be stepped at the next tick."""
+        super().add(agent)
+        self.__ranks[agent.unique_id] = self.__next_rank
+        self.__next_rank += 1
+        self.__active.add(agent.unique_id)
+
+    def remove(self, agent):
+        """Remove an agent from the schedule with its pending timer."""
+        super().remove(agent)
+        del self.__ranks[agent.unique_id]
+        self.__active.discard(agent.unique_id)
+        self.cancel_wakeup(agent)
+
+    def reset(self):
+        """Go back to the first tick, with every agent active and no pending timer."""
+        self.__active = set(self.__ranks)
+        self.__timers = {}
+        self.__timers_by_tick = {}
+        self.steps = 0
+        self.time = 0
+
+    def wake(self, agent):
+        """Mark an agent as having pending work."""
+        unique_id = agent.unique_id
+        if unique_id not in self.__ranks:
+            return
+        if self.__queue is not None and self.__ranks[unique_id] > self.__current_rank:
+            if unique_id not in self.__queued:
+                heapq.heappush(self.__queue, (self.__ranks[unique_id], unique_id))
+                self.__queued.add(unique_id)
+        else:
+            self.__active.add(unique_id)
+
+    def notify_message(self, agent):
+        """Called by the MessageService when a message is delivered to an agent."""
+        self.wake(agent)
+
+    def schedule_wakeup(self, agent, delay=1):
+        """Wake up an agent delay ticks after the current one, keeping the earliest pending timer."""
+        assert delay >= 1, "Timers can only be scheduled for a future tick"
+        tick = self.steps + delay
+        pending_tick = self.__timers.get(agent.unique_id)
+        if pending_tick is not None:
+            if pending_tick <= tick:
+                return
+            self.cancel_wakeup(agent)
+        self.__timers[agent.unique_id] = tick
+        self.__timers_by_tick.setdefault(tick, set()).add(agent.unique_id)
+
+    def cancel_wakeup(self, agent):
+        """Cancel the pending timer of an agent, if any."""
+        tick = self.__timers.pop(agent.unique_id, None)
+        if tick is not None:
+            self.__timers_by_tick[tick].discard(agent.unique_id)
+            if len(self.__timers_by_tick[tick]) == 0:
+                del self.__timers_by_tick[tick]
+
+    def get_active_agents(self):
+        """Return the agents which will be stepped at the next tick, ignoring timers."""
+        return [self._agents[unique_id] for unique_id in sorted(self.__active, key=self.__ranks.get)]
+
+    def is_idle(self):
+        """Return True if no agent has pending work."""
+        return len(self.__active) == 0 and len(self.__timers) == 0
+
+    def step(self):
+        """Execute the step of the agents having pending work, in the order they were added."""
+        for unique_id in self.__timers_by_tick.pop(self.steps, ()):
+            del self.__timers[unique_id]
+            self.__active.add(unique_id)
+
+        self.__queue = [(self.__ranks[unique_id], unique_id) for unique_id in self.__active]
+        heapq.heapify(self.__queue)
+        self.__queued = self.__active
+        self.__active = set()
+        while len(self.__queue) > 0:
+            self.__current_rank, unique_id = heapq.heappop(self.__queue)
+            agent = self._agents.get(unique_id)
+            if agent is None:
+                continue
+            agent.step()
+            if agent.is_finished():
+                self.__active.discard(unique_id)
+                self.cancel_wakeup(agent)
+        self.__queue = None
+        self.__queued = set()
+        self.__current_rank = -1
+
+        self.steps += 1
+        self.time += 1
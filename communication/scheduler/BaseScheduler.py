@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+
+
+class BaseScheduler:
+    """BaseScheduler class.
+    Scheduler stepping every agent once at each tick, in the order they were added, as mesa.time.BaseScheduler.
+    Agents can be added or removed while they are stepped: removed agents are not stepped anymore,
+    added agents are stepped from the next tick.
+
+    attr:
+        model: the model of the agents (Model)
+        steps: the number of ticks done (int)
+        time: the current time (int)
+    """
+
+    def __init__(self, model):
+        """Create a new, empty BaseScheduler."""
+        self.model = model
+        self.steps = 0
+        self.time = 0
+        self._agents = {}
+
+    def add(self, agent):
+        """Add an agent to the schedule."""
+        if agent.unique_id in self._agents:
+            raise Exception(f"Agent with unique id {repr(agent.unique_id)} already added to scheduler")
+        self._agents[agent.unique_id] = agent
+
+    def remove(self, agent):
+        """Remove an agent from the schedule."""
+        del self._agents[agent.unique_id]
+
+    def step(self):
+        """Execute the step of all the agents, one at a time."""
+        for agent in self.agent_buffer():
+            agent.step()
+        self.steps += 1
+        self.time += 1
+
+    def get_agent_count(self):
+        """Return the number of agents in the schedule."""
+        return len(self._agents)
+
+    @property
+    def agents(self):
+        """Return the list of the agents in the schedule."""
+        return list(self._agents.values())
+
+    def agent_buffer(self, shuffled=False):
+        """Yield the agents, allowing agents to be added or removed during the iteration."""
+        agent_keys = list(self._agents)
+        if shuffled:
+            self.model.random.shuffle(agent_keys)
+        for agent_key in agent_keys:
+            agent = self._agents.get(agent_key)
+            if agent is not None:
+                yield agent
@@ -0,0 +1,456 @@
+#!/usr/bin/env python3
+
+from collections import namedtuple
+
+import numpy as np
+
+from communication.preferences.ScoringStrategy import DEFAULT_SCORING
+from communication.preferences.SharedPopulation import get_code_dtype
+from communication.preferences.Vocabulary import DEFAULT_VOCABULARY
+from communication.tournament.DuelEvaluator import TOP_PERCENT, evaluate_duel
+
+MISSING = -1
+
+# performatives of the messages
+NO_MESSAGE, PROPOSE, ASK_WHY, ARGUE, ACCEPT, REJECT, COMMIT = range(7)
+# fields of the messages: performative, content item, then the argument of ARGUE messages
+MESSAGE, ITEM, DECISION, ARGUMENT_ITEM, CRITERION, VALUE, WORST = range(7)
+
+EncodedPopulation = namedtuple(
+    "EncodedPopulation", ["items", "values", "positions", "ranks", "scores", "valid", "vocabulary"]
+)
+
+
+def encode_population(population):
+    """Returns the preferences of a population, which share one vocabulary, as an EncodedPopulation of arrays:
+    items: the Items of the whole population
+    values: (agent, item, criterion) value codes returned by get_value, MISSING if there is none
+    positions: (agent, item) position of the item in the item list of the agent, MISSING if not in it (np.int32)
+    ranks: (agent, criterion) rank of the criterion by importance, the number of criteria of the vocabulary
+    if not a criterion of the agent
+    scores: (agent, item) scores computed as Item.get_score, with the same floating point operations, or ranks
+    ordered as the scores of the agent's scoring strategy if it is not the default one
+    valid: whether every item of the agent has a value on each of its criteria, its scoring strategy does
+    not depend on the scored items and its top x% queries are exact (no quantile bins)
+    vocabulary: the Vocabulary of the population
+    """
+    vocabulary = population[0].get_vocabulary() if len(population) > 0 else DEFAULT_VOCABULARY
+    if any(preferences.get_vocabulary() is not vocabulary for preferences in population):
+        raise ValueError("The preferences of the population do not share one vocabulary")
+    n_criteria = vocabulary.get_criteria_count()
+    item_index = {}
+    items = []
+    states = [preferences.__getstate__()[:4] for preferences in population]
+    for _, agent_items, _, _ in states:
+        for item in agent_items:
+            if item.get_name() not in item_index:
+                item_index[item.get_name()] = len(items)
+                items.append(item)
+
+    n_agents = len(population)
+    values = np.full((n_agents, len(items), n_criteria), MISSING, dtype=get_code_dtype(vocabulary.get_values_count()))
+    positions = np.full((n_agents, len(items)), MISSING, dtype=np.int32)
+    ranks = np.full((n_agents, n_criteria), n_criteria, dtype=get_code_dtype(n_criteria))
+    valid = np.ones(n_agents, dtype=bool)
+    max_criteria = max([len(criteria) for criteria, _, _, _ in states] + [0])
+    criteria_table = np.full((n_agents, max_criteria), MISSING, dtype=np.int64)
+    for k, (criteria, agent_items, n_items, cells) in enumerate(states):
+        indices = np.array([item_index[item.get_name()] for item in agent_items], dtype=np.int64)
+        cells = np.array(cells, dtype=np.int64).reshape(-1, 3)
+        flat_cells = indices[cells[:, 0]] * n_criteria + cells[:, 1]
+        flat_cells, first_cells = np.unique(flat_cells, return_index=True)  # get_value returns the first match
+        values[k].reshape(-1)[flat_cells] = cells[first_cells, 2]
+        positions[k, indices[:n_items]] = np.arange(n_items)
+        distinct_criteria = list(dict.fromkeys(criteria))
+        ranks[k, distinct_criteria] = np.arange(len(distinct_criteria))
+        criteria_table[k, : len(criteria)] = list(criteria)
+        valid[k] = np.all(values[k][np.ix_(indices[:n_items], distinct_criteria)] != MISSING)
+
+    scores = np.zeros((n_agents, len(items)))
+    criterion_weight = 100
+    for position in range(max_criteria):
+        criteria = criteria_table[:, position]
+        position_values = values[np.arange(n_agents), :, np.maximum(criteria, 0)].astype(np.float64)
+        scores += np.where((criteria != MISSING)[:, None], criterion_weight * position_values, 0.0)
+        criterion_weight = criterion_weight / 2
+    for k, preferences in enumerate(population):
+        scoring = preferences.get_scoring()
+        if scoring != DEFAULT_SCORING:
+            scores[k] = scoring.get_ranks(values[k][:, list(states[k][0])].astype(np.int64))
+            valid[k] &= not scoring.depends_on_items
+        valid[k] &= preferences.get_quantile_bins() is None
+    return EncodedPopulation(items, values, positions, ranks, scores, valid, vocabulary)
+
+
+def get_dominance(encoded):
+    """Returns the (agent, item, other item) tensor of whether an item dominates another one on the criteria
+    of the agent, as in ParetoFront."""
+    n_agents, n_items, _ = encoded.values.shape
+    dominance = np.zeros((n_agents, n_items, n_items), dtype=bool)
+    for k in range(n_agents):
+        values = encoded.values[k][:, encoded.ranks[k] != encoded.values.shape[2]]
+        dominance[k] = (values[:, None] >= values[None]).all(axis=2) & (values[:, None] > values[None]).any(axis=2)
+    return dominance
+
+
+def evaluate_duels(
+    pairings,
+    population,
+    agent_names,
+    max_steps=100,
+    detect_cycles=True,
+    pareto_proposals=False,
+    pareto_alternatives=False,
+    batch_size=4096,
+):
+    """Returns the final results of the duels of the given pairings (i, j) of agents of the population,
+    as evaluate_duel and ArgumentModel.get_final_result would, computed by batches of duels in lockstep.
+    population and agent_names can be lists or dicts, they are only indexed with the agents of the pairings.
+
+    Duels whose negotiation leaves the common path of the protocol (an agent without a value for an item on
+    one of its criteria, an argument or a message about an item an agent has already removed, which the
+    model answers with unknown values or an error) are evaluated by evaluate_duel instead.
+    Two agents can never repeat a conversation state, so detect_cycles only matters for these duels.
+    """
+    pairings = list(pairings)
+    agents, pairs = np.unique(np.array(pairings, dtype=np.int64).reshape(-1, 2), return_inverse=True)
+    encoded = encode_population([population[k] for k in agents.tolist()])
+    pairs = pairs.reshape(-1, 2)
+    dominance = get_dominance(encoded) if pareto_proposals or pareto_alternatives else None
+    duel_results = []
+    for start in range(0, len(pairings), batch_size):
+        batch = _DuelBatch(
+            encoded, pairs[start : start + batch_size], max_steps, dominance, pareto_proposals, pareto_alternatives
+        )
+        batch.run()
+        batch_names = [[agent_names[i], agent_names[j]] for i, j in pairings[start : start + batch_size]]
+        duel_results.extend(batch.get_results(batch_names))
+        for b in np.flatnonzero(batch.fallback).tolist():
+            i, j = pairings[start + b]
+            duel_results[start + b] = evaluate_duel(
+                population[i],
+                population[j],
+                batch_names[b],
+                max_steps,
+                detect_cycles,
+                pareto_proposals,
+                pareto_alternatives,
+            )
+    return duel_results
+
+
+class _DuelBatch:
+    """_DuelBatch class.
+    This class advances a batch of two-agent negotiations in lockstep, as DuelEvaluator does for one duel:
+    at each half step, the agent k of every duel handles the only message in flight if it is addressed to it,
+    or proposes its most preferred item. Each kind of message is handled for all the duels at once.
+
+    attr:
+        fallback: the duels to evaluate with evaluate_duel
+        no_criterion: the worst criterion of the arguments without comparison, and rank of absent criteria
+    """
+
+    def __init__(self, encoded, pairs, max_steps, dominance=None, pareto_proposals=False, pareto_alternatives=False):
+        self.items = encoded.items
+        self.dominance = dominance[pairs] if dominance is not None else None
+        self.pareto_proposals = pareto_proposals
+        self.pareto_alternatives = pareto_alternatives
+        self.vocabulary = encoded.vocabulary
+        self.n_criteria = self.vocabulary.get_criteria_count()
+        self.n_values = self.vocabulary.get_values_count()
+        self.no_criterion = self.n_criteria
+        self.max_steps = max_steps
+        self.values = encoded.values[pairs]
+        self.positions = encoded.positions[pairs]
+        self.ranks = encoded.ranks[pairs]
+        self.scores = encoded.scores[pairs]
+        self.alive = self.positions != MISSING
+        n_duels, _, n_items, _ = self.values.shape
+        self.no_args = np.zeros((n_duels, 2, n_items), dtype=bool)
+        self.done = np.zeros((n_duels, 2), dtype=bool)
+        self.fallback = ~encoded.valid[pairs].all(axis=1)
+        self.active = ~self.fallback
+        # codes of the arguments used so far in each duel, with the item they answer to
+        self.used_arguments = np.full((n_duels, 8), MISSING, dtype=np.int64)
+        self.n_used_arguments = np.zeros(n_duels, dtype=np.int64)
+        self.last_message = np.zeros((n_duels, 7), dtype=np.int64)
+        self.pending = np.zeros(n_duels, dtype=bool)
+        self.decisive_message = np.zeros((n_duels, 7), dtype=np.int64)
+        self.decisive_receiver = np.zeros(n_duels, dtype=np.int64)
+        self.decisive_previous = np.zeros((n_duels, 7), dtype=np.int64)
+        self.is_bad = np.isin(np.arange(self.n_values), self.vocabulary.get_bad_codes())
+        self.is_good = np.isin(np.arange(self.n_values), self.vocabulary.get_good_codes())
+
+    def run(self):
+        step_count = 0
+        while self.active.any():
+            self.step(0)
+            self.step(1)
+            step_count += 1
+            self.active &= ~self.done.all(axis=1)
+            if step_count >= self.max_steps:
+                break
+
+    def step(self, k):
+        live = np.flatnonzero(self.active)
+        has_message = self.pending[live]
+        self.propose(live[~has_message], k)
+        handled = live[has_message]
+        self.pending[handled] = False
+        messages = self.last_message[handled]
+        for performative, handle in (
+            (ACCEPT, self.handle_accept),
+            (REJECT, self.handle_reject),
+            (PROPOSE, self.handle_propose),
+            (COMMIT, self.handle_commit),
+            (ARGUE, self.handle_argue),
+            (ASK_WHY, self.handle_ask_why),
+        ):
+            is_performative = messages[:, MESSAGE] == performative
+            if is_performative.any():
+                handle(handled[is_performative], k, messages[is_performative])
+
+    def send(self, duels, k, performative, items, arguments=None, delivered=True):
+        """Sends a message from agent k in each duel, keeping track of the last decisive message."""
+        if performative == ACCEPT or performative == REJECT:
+            decisive = duels
+            if performative == REJECT:
+                decisive = duels[self.last_message[duels, MESSAGE] == ARGUE]
+            self.decisive_previous[decisive] = self.last_message[decisive]
+            self.decisive_receiver[decisive] = 1 - k
+        self.last_message[duels] = 0
+        self.last_message[duels, MESSAGE] = performative
+        self.last_message[duels, ITEM] = items
+        if arguments is not None:
+            self.last_message[duels, DECISION:] = arguments
+        if performative == ACCEPT:
+            self.decisive_message[duels] = self.last_message[duels]
+        elif performative == REJECT:
+            self.decisive_message[decisive] = self.last_message[decisive]
+        self.pending[duels] = delivered
+
+    def check_alive(self, duels, k, items):
+        """Sends the duels where agent k no longer has the item to the fallback, returns the others mask."""
+        alive = self.alive[duels, k, items]
+        self.fallback[duels[~alive]] = True
+        self.active[duels[~alive]] = False
+        return alive
+
+    def get_pareto_front(self, duels, k):
+        """Returns the (duel, item) mask of the items of agent k not dominated by another one it still has."""
+        alive = self.alive[duels, k]
+        return alive & ~(alive[:, :, None] & self.dominance[duels, k]).any(axis=1)
+
+    def propose(self, duels, k):
+        candidates = self.alive[duels, k] & ~self.no_args[duels, k]
+        if self.pareto_proposals:
+            candidates &= self.get_pareto_front(duels, k)
+        has_candidate = candidates.any(axis=1)
+        self.done[duels[~has_candidate], k] = True
+        duels, candidates = duels[has_candidate], candidates[has_candidate]
+        scores = np.where(candidates, self.scores[duels, k], -np.inf)
+        best = candidates & (scores == scores.max(axis=1, keepdims=True))
+        # the first most preferred item in the item list order
+        items = np.where(best, self.positions[duels, k], np.iinfo(np.int32).max).argmin(axis=1)
+        self.send(duels, k, PROPOSE, items)
+
+    def handle_accept(self, duels, k, messages):
+        alive = self.check_alive(duels, k, messages[:, ITEM])
+        duels, items = duels[alive], messages[alive, ITEM]
+        self.send(duels, k, COMMIT, items)
+        self.alive[duels, k, items] = False
+        self.done[duels, k] = True
+
+    def handle_commit(self, duels, k, messages):
+        alive = self.check_alive(duels, k, messages[:, ITEM])
+        duels, items = duels[alive], messages[alive, ITEM]
+        self.send(duels, k, COMMIT, items, delivered=False)
+        self.alive[duels, k, items] = False
+        self.done[duels, k] = True
+
+    def handle_reject(self, duels, k, messages):
+        alive = self.check_alive(duels, k, messages[:, ITEM])
+        duels, items = duels[alive], messages[alive, ITEM]
+        self.alive[duels, k, items] = False
+        self.propose(duels, k)
+
+    def handle_propose(self, duels, k, messages):
+        alive = self.check_alive(duels, k, messages[:, ITEM])
+        duels, items = duels[alive], messages[alive, ITEM]
+        alive_items = self.alive[duels, k]
+        scores = self.scores[duels, k]
+        item_scores = scores[np.arange(len(duels)), items]
+        n_top = alive_items.sum(axis=1) * TOP_PERCENT // 100
+        accepted = (alive_items & (scores > item_scores[:, None])).sum(axis=1) < n_top
+        self.send(duels[accepted], k, ACCEPT, items[accepted])
+        self.send(duels[~accepted], k, ASK_WHY, items[~accepted])
+
+    def handle_ask_why(self, duels, k, messages):
+        alive = self.check_alive(duels, k, messages[:, ITEM])
+        duels, items = duels[alive], messages[alive, ITEM]
+        values = self.values[duels, k, items]
+        good = self.is_good[np.maximum(values, 0)] & (self.ranks[duels, k] != self.no_criterion)
+        criteria = np.where(good, self.ranks[duels, k], self.n_criteria + 1).argmin(axis=1)
+        supported = good.any(axis=1)
+
+        duels_supported, items_supported = duels[supported], items[supported]
+        criteria = criteria[supported]
+        arguments = np.stack(
+            [
+                np.ones(len(duels_supported), dtype=np.int64),
+                items_supported,
+                criteria,
+                values[supported, criteria],
+                np.full(len(duels_supported), self.no_criterion),
+            ],
+            axis=1,
+        )
+        self.use_arguments(duels_supported, items_supported, arguments)
+        self.send(duels_supported, k, ARGUE, items_supported, arguments)
+
+        duels, items = duels[~supported], items[~supported]
+        self.no_args[duels, k, items] = True
+        self.propose(duels, k)
+
+    def handle_argue(self, duels, k, messages):
+        alive = self.check_alive(duels, k, messages[:, ARGUMENT_ITEM])
+        duels, messages = duels[alive], messages[alive]
+        n_duels = len(duels)
+        rows = np.arange(n_duels)
+        decisions = messages[:, DECISION]
+        items = messages[:, ARGUMENT_ITEM]
+        criteria = messages[:, CRITERION]
+        worst_criteria = messages[:, WORST]
+        counter_decisions = 1 - decisions
+        values = self.values[duels, k]
+        ranks = self.ranks[duels, k]
+        criterion_ranks = ranks[rows, criteria]
+        in_criteria = criterion_ranks != self.no_criterion
+        item_values = values[rows, items]
+        # pro arguments are countered with bad values, con arguments with good values
+        wanted = np.where(decisions[:, None] == 1, self.is_bad, self.is_good)
+
+        # a bad (good) value of the item on a more important criterion
+        all_criteria = np.arange(self.n_criteria)
+        better = (ranks < criterion_ranks[:, None]) & (all_criteria != worst_criteria[:, None])
+        better &= np.take_along_axis(wanted, np.maximum(item_values, 0), axis=1)
+        better &= ~self.is_used(
+            duels,
+            self.get_argument_codes(
+                items[:, None],
+                counter_decisions[:, None],
+                items[:, None],
+                all_criteria,
+                criteria[:, None],
+                np.maximum(item_values, 0),
+            ),
+        )
+        better_criteria = np.where(better, ranks, self.n_criteria + 1).argmin(axis=1)
+        has_better = better.any(axis=1)
+
+        # a better alternative on the same criterion, against pro arguments
+        alternative_values = values[rows, :, criteria]
+        alternatives = self.alive[duels, k] & (alternative_values > messages[:, VALUE, None])
+        alternatives &= (decisions == 1)[:, None] & (np.arange(len(self.items)) != items[:, None])
+        if self.pareto_alternatives:
+            alternatives &= self.get_pareto_front(duels, k)
+        alternatives &= ~self.is_used(
+            duels,
+            self.get_argument_codes(
+                items[:, None],
+                1,
+                np.arange(len(self.items)),
+                criteria[:, None],
+                self.no_criterion,
+                np.maximum(alternative_values, 0),
+            ),
+        )
+        best_alternatives = np.where(alternatives, self.positions[duels, k], np.iinfo(np.int32).max).argmin(axis=1)
+        has_alternative = alternatives.any(axis=1)
+
+        # a bad (good) value of the item on the same criterion
+        same_values = np.maximum(item_values[rows, criteria], 0)
+        has_same = wanted[rows, same_values] & ~self.is_used(
+            duels, self.get_argument_codes(items, counter_decisions, items, criteria, self.no_criterion, same_values)
+        )
+
+        has_better &= in_criteria
+        has_alternative &= in_criteria & ~has_better
+        has_same &= in_criteria & ~has_better & ~has_alternative
+        argument_decisions = np.where(has_alternative, 1, counter_decisions)
+        argument_items = np.where(has_alternative, best_alternatives, items)
+        argument_criteria = np.where(has_better, better_criteria, criteria)
+        argument_values = np.where(has_better, item_values[rows, better_criteria], same_values)
+        argument_values = np.where(has_alternative, alternative_values[rows, best_alternatives], argument_values)
+        argument_worst_criteria = np.where(has_better, criteria, self.no_criterion)
+        arguments = np.stack(
+            [argument_decisions, argument_items, argument_criteria, argument_values, argument_worst_criteria], axis=1
+        )
+
+        countered = has_better | has_alternative | has_same
+        self.use_arguments(duels[countered], items[countered], arguments[countered])
+        self.send(duels[countered], k, ARGUE, items[countered], arguments[countered])
+        accepted = ~countered & (decisions == 1)
+        self.send(duels[accepted], k, ACCEPT, items[accepted])
+        rejected = ~countered & (decisions == 0)
+        self.alive[duels[rejected], k, items[rejected]] = False
+        self.send(duels[rejected], k, REJECT, items[rejected])
+
+    def get_argument_codes(self, items, decisions, argument_items, criteria, worst_criteria, values):
+        """Returns the codes of arguments, with the item they answer to."""
+        codes = (items * 2 + decisions) * len(self.items) + argument_items
+        codes = (codes * self.n_criteria + criteria) * (self.n_criteria + 1) + worst_criteria
+        return codes * self.n_values + values
+
+    def is_used(self, duels, codes):
+        """Returns whether the arguments of the given codes (one row by duel) were used in their duel."""
+        used_arguments = self.used_arguments[duels]
+        used_arguments = used_arguments.reshape(used_arguments.shape[:1] + (1,) * (codes.ndim - 1) + used_arguments.shape[1:])
+        return (codes[..., None] == used_arguments).any(axis=-1)
+
+    def use_arguments(self, duels, items, arguments):
+        """Marks the arguments as used for the items they answer to."""
+        if len(duels) > 0 and self.n_used_arguments[duels].max() == self.used_arguments.shape[1]:
+            self.used_arguments = np.pad(
+                self.used_arguments, ((0, 0), (0, self.used_arguments.shape[1])), constant_values=MISSING
+            )
+        decisions, argument_items, criteria, values, worst_criteria = arguments.T
+        codes = self.get_argument_codes(items, decisions, argument_items, criteria, worst_criteria, values)
+        self.used_arguments[duels, self.n_used_arguments[duels]] = codes
+        self.n_used_arguments[duels] += 1
+
+    def get_results(self, agent_names):
+        """Returns the final results of the duels in the format of ArgumentModel.get_final_result (None for the
+        fallback duels), given the names of the two agents of each duel."""
+        criterion_names = self.vocabulary.get_criteria() + [None]
+        values = self.vocabulary.get_values()
+        duel_results = []
+        for decisive_message, receiver, previous_message, fallback, names in zip(
+            self.decisive_message.tolist(),
+            self.decisive_receiver.tolist(),
+            self.decisive_previous.tolist(),
+            self.fallback.tolist(),
+            agent_names,
+        ):
+            if fallback or decisive_message[MESSAGE] == NO_MESSAGE:
+                duel_results.append(None)
+                continue
+            results = {
+                "winning_agent": names[receiver],
+                "winning_item": self.items[decisive_message[ITEM]] if decisive_message[MESSAGE] == ACCEPT else None,
+            }
+            if previous_message[MESSAGE] == ARGUE:
+                results["winning_argument"] = {
+                    "item": self.items[previous_message[ARGUMENT_ITEM]],
+                    "decision": "pro" if previous_message[DECISION] else "con",
+                    "main_criterion": criterion_names[previous_message[CRITERION]],
+                    "value": values[previous_message[VALUE]],
+                    "secondary_criterion": criterion_names[previous_message[WORST]],
+                }
+            else:
+                results["winning_argument"] = {
+                    "item": self.items[previous_message[ITEM]],
+                    "decision": "top_10_percent",
+                }
+            duel_results.append(results)
+        return duel_results
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+
+import hashlib
+import os
+import pickle
+import sys
+from collections import OrderedDict
+
+# model parameters which do not change the outcome of a negotiation, left out of the keys
+IGNORED_PARAMETERS = frozenset({"tracer", "agent_loggers"})
+
+
+def get_preferences_fingerprint(preferences):
+    """Returns a stable fingerprint of preferences: criterion order, items and criterion values in order,
+    with the names of the vocabulary and of its values if it is not the preset one (codes of criteria are
+    stable in a vocabulary), and the scoring strategy and number of quantile bins if they were set."""
+    state = preferences.__getstate__()
+    criteria, items, n_items, cells = state[:4]
+    parts = []
+    if len(state) > 4:
+        vocabulary = state[4]
+        parts.append("\0".join([vocabulary.name] + vocabulary.get_value_names()).encode())
+        if len(state) > 5:
+            parts.append(repr(state[5]).encode())
+        if len(state) > 6:
+            parts.append(repr(state[6]).encode())
+        if sys.byteorder == "big":
+            criteria.byteswap()
+        criteria = criteria.tobytes()
+    if sys.byteorder == "big":
+        cells.byteswap()
+    item_names = "\0".join(item.get_name() for item in items).encode()
+    fingerprint = hashlib.sha256()
+    for part in parts + [criteria, item_names, n_items.to_bytes(4, "little"), cells.tobytes()]:
+        fingerprint.update(len(part).to_bytes(8, "little"))
+        fingerprint.update(part)
+    return fingerprint.hexdigest()
+
+
+def get_parameter_fingerprint(value):
+    """Returns a representation of a model parameter stable across runs and processes: the qualified name of
+    classes and functions, the repr of plain values and of containers of them. Raises a ValueError for other
+    objects, whose repr may hold a memory address."""
+    if value is None or isinstance(value, (bool, int, float, str, bytes)):
+        return repr(value)
+    if isinstance(value, (tuple, list, frozenset, set)):
+        fingerprints = [get_parameter_fingerprint(element) for element in value]
+        if isinstance(value, (frozenset, set)):
+            fingerprints.sort()
+        return f"{type(value).__name__}({', '.join(fingerprints)})"
+    if isinstance(value, dict):
+        items = sorted(
+            f"{get_parameter_fingerprint(key)}: {get_parameter_fingerprint(element)}" for key, element in value.items()
+        )
+        return f"dict({', '.join(items)})"
+    if isinstance(value, type) or (callable(value) and hasattr(value, "__qualname__")):
+        return f"{value.__module__}.{value.__qualname__}"
+    raise ValueError(f"The model parameter {value!r} has no stable representation to be part of a cache key")
+
+
+class DuelCache:
+    """DuelCache class.
+    This class caches the final results of duels, keyed by the fingerprints of the preferences of both agents
+    (in order) and the protocol parameters given to ArgumentModel.
+
+    The most recently used results are kept in memory, and all results are also stored in cache_dir if given.
+    Agent names are not part of the key: results are stored with the position of the winning agent.
+    Two-agent negotiations do not depend on the random generator, so neither is the seed. Parameters which do
+    not change the outcome (IGNORED_PARAMETERS, such as the tracer) are not part of the key either.
+
+    attr:
+        max_size: maximum number of results kept in memory
+        cache_dir: directory of the on-disk store (None for memory only)
+        hits: number of results found in the cache
+        misses: number of results not found in the cache
+    """
+
+    def __init__(self, max_size=100000, cache_dir=None):
+        """Creates a new DuelCache."""
+        self.max_size = max_size
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.misses = 0
+        self.__results = OrderedDict()
+        if cache_dir is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def __len__(self):
+        """Returns the number of results kept in memory."""
+        return len(self.__results)
+
+    @staticmethod
+    def get_key(fingerprint_1, fingerprint_2, model_kwargs=None):
+        """Returns the key of a duel from the fingerprints of the preferences of both agents and the model
+        parameters, raises a ValueError for parameters without a stable representation."""
+        parameters = sorted(
+            (name, get_parameter_fingerprint(value))
+            for name, value in (model_kwargs or {}).items()
+            if name not in IGNORED_PARAMETERS
+        )
+        content = repr((fingerprint_1, fingerprint_2, parameters))
+        return hashlib.sha256(content.encode()).hexdigest()
+
+    def get(self, key, agent_names, default=None):
+        """Returns the cached results of a duel with the given agent names, or default if not in the cache."""
+        if key in self.__results:
+            self.__results.move_to_end(key)
+            stored_results = self.__results[key]
+        else:
+            stored_results = self.__load(key)
+            if stored_results is None:
+                self.misses += 1
+                return default
+            self.__remember(key, stored_results)
+        self.hits += 1
+
+        winner, results = stored_results
+        if results is None:
+            return None
+        return {**results, "winning_agent": agent_names[winner]}
+
+    def put(self, key, agent_names, results):
+        """Caches the results of a duel between agents with the given names."""
+        if results is None:
+            stored_results = (None, None)
+        else:
+            stored_results = (list(agent_names).index(results["winning_agent"]), results)
+        self.__remember(key, stored_results)
+        if self.cache_dir is not None:
+            self.__store(key, stored_results)
+
+    def clear(self):
+        """Forgets the results kept in memory (the on-disk store is left untouched)."""
+        self.__results.clear()
+
+    def __remember(self, key, stored_results):
+        self.__results[key] = stored_results
+        self.__results.move_to_end(key)
+        while len(self.__results) > self.max_size:
+            self.__results.popitem(last=False)
+
+    def __get_path(self, key):
+        return os.path.join(self.cache_dir, key[:2], key + ".pkl")
+
+    def __load(self, key):
+        if self.cache_dir is None:
+            return None
+        try:
+            with open(self.__get_path(key), "rb") as file:
+                return pickle.load(file)
+        except FileNotFoundError:
+            return None
+
+    def __store(self, key, stored_results):
+        path = self.__get_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temporary_path = f"{path}.{os.getpid()}.tmp"
+        with open(temporary_path, "wb") as file:
+            pickle.dump(stored_results, file)
+        os.replace(temporary_path, path)  # atomic, several processes can share the same store
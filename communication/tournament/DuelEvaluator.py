@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+
+from collections import defaultdict
+
+from communication.message.MessagePerformative import MessagePerformative
+from communication.preferences.ParetoFront import ParetoFront
+from communication.preferences.QuantileSketch import QuantileSketch
+from communication.preferences.Vocabulary import UNKNOWN_CODE
+
+TOP_PERCENT = 10  # proposals of items among the top 10% are accepted without arguing
+MAX_CYCLE_STATES = 10000  # conversation states kept for cycle detection, as by ArgumentModel
+
+
+def evaluate_duel(
+    prefs_1,
+    prefs_2,
+    agent_names=None,
+    max_steps=100,
+    detect_cycles=True,
+    pareto_proposals=False,
+    pareto_alternatives=False,
+):
+    """Computes the final result of the negotiation between two ArgumentAgents, as returned by
+    ArgumentModel.get_final_result, without running the model, with the same protocol options.
+
+    With two agents stepped by a BaseScheduler, the negotiation is a single deterministic chain of messages,
+    which is replayed directly on tables of the preferences (the preferences are not modified).
+    The negotiation stops as the model does, after max_steps or when a conversation state repeats itself.
+    """
+    evaluator = DuelEvaluator(prefs_1, prefs_2, agent_names, pareto_proposals, pareto_alternatives)
+    return evaluator.run(max_steps, detect_cycles)
+
+
+class _Negotiator:
+    """_Negotiator class.
+    This class holds what an ArgumentAgent knows during a negotiation, with items as names and criteria
+    and values as codes, and answers the same questions as its Preferences.
+    """
+
+    def __init__(self, preferences, pareto_proposals=False, pareto_alternatives=False):
+        self.pareto_proposals = pareto_proposals
+        self.pareto_alternatives = pareto_alternatives
+        self.pareto_front = None
+        self.vocabulary = preferences.get_vocabulary()
+        self.scoring = preferences.get_scoring()
+        self.quantile_bins = None if self.scoring.depends_on_items else preferences.get_quantile_bins()
+        self.sketch = None
+        self.good_values = self.vocabulary.get_good_codes()
+        self.bad_values = self.vocabulary.get_bad_codes()
+        self.criteria = [criterion_name.value for criterion_name in preferences.get_criterion_name_list()]
+        self.cells = [
+            (criterion_value.get_item().get_name(), criterion_value.get_criterion_name().value,
+             criterion_value.get_value().value)
+            for criterion_value in preferences.get_criterion_value_list()
+        ]
+        self.items = [item.get_name() for item in preferences.get_item_list()]
+        self.values = {}
+        for name, criterion, value in self.cells:
+            self.values.setdefault((name, criterion), value)  # get_value returns the first match
+        self.scores = {}
+        self.preferred_criteria = {}
+        self.done_negotiating = False
+        self.no_args_items = []
+
+    def get_scores(self, names):
+        """Returns the scores of items computed together, cached unless they depend on the scored items."""
+        if self.scoring.depends_on_items:
+            return list(self.scoring.get_row_scores(self.get_value_rows(names)))
+        missing = [name for name in names if name not in self.scores]
+        if missing:
+            self.scores.update(zip(missing, self.scoring.get_row_scores(self.get_value_rows(missing))))
+        return [self.scores[name] for name in names]
+
+    def get_value_rows(self, names):
+        return [[self.values.get((name, criterion), UNKNOWN_CODE) for criterion in self.criteria] for name in names]
+
+    def get_value_matrix(self, names):
+        import numpy as np
+
+        return np.array(self.get_value_rows(names), dtype=np.int64).reshape(len(names), len(self.criteria))
+
+    def get_preferred_criteria(self, criterion):
+        preferred_criteria = self.preferred_criteria.get(criterion)
+        if preferred_criteria is None:
+            first_positions = {}
+            for position, other in enumerate(self.criteria):
+                first_positions.setdefault(other, position)
+            preferred_criteria = [
+                other
+                for other in self.criteria
+                if other != criterion
+                and (criterion not in first_positions or first_positions[other] < first_positions[criterion])
+            ]
+            self.preferred_criteria[criterion] = preferred_criteria
+        return preferred_criteria
+
+    def get_pareto_front(self):
+        if self.pareto_front is None:
+            self.pareto_front = ParetoFront(self.items, self.get_value_matrix(self.items))
+        return self.pareto_front.get_items()
+
+    def most_preferred(self):
+        items = self.get_pareto_front() if self.pareto_proposals else self.items
+        if self.no_args_items:
+            items = [name for name in items if name not in self.no_args_items]
+        if len(items) == 0:
+            return None
+        scores = self.get_scores(items)
+        best = 0
+        for k in range(len(items)):
+            if scores[k] > scores[best]:
+                best = k
+        return items[best]
+
+    def is_item_among_top_x_percent(self, name, x):
+        assert len(self.items) > 0 and name in self.items, f"{name} is not in {self.items}"
+        if self.quantile_bins is not None:
+            if self.sketch is None or self.sketch.needs_rebuild():
+                self.sketch = QuantileSketch(self.get_scores(self.items), self.quantile_bins)
+            return self.sketch.is_among_top_x_percent(self.get_scores([name])[0], x)
+        scores = self.get_scores(self.items)
+        score = scores[self.items.index(name)]
+        scores.sort(reverse=True)
+        return score in scores[: int(len(scores) * x / 100)]
+
+    def remove_item(self, name):
+        """Removes an item with all its criterion values, as Preferences.remove_item does."""
+        if self.sketch is not None and name in self.items:
+            self.sketch.remove(self.get_scores([name])[0])
+        self.items.remove(name)
+        self.cells = [cell for cell in self.cells if cell[0] != name]
+        for key in [key for key in self.values if key[0] == name]:
+            del self.values[key]
+        self.scores.pop(name, None)
+        if self.pareto_front is not None:
+            self.pareto_front.remove(name)
+
+    def support_proposal(self, name):
+        values = [self.values.get((name, criterion)) for criterion in self.criteria]
+        for criterion, value in zip(self.criteria, values):
+            if value in self.good_values:
+                return (True, name, criterion, value, None)
+        self.no_args_items.append(name)
+        return None
+
+    def get_counter_argument(self, argument, used_arguments):
+        """Returns the counter argument of ArgumentAgent.get_counter_argument, where unknown values are skipped.
+        Arguments are (decision, item, criterion, value, worst criterion of the comparison or None) tuples.
+        """
+        decision, name, criterion, x, previous_worst_criterion = argument
+        if criterion not in self.criteria:
+            return None
+        if decision:
+            for better_criterion in self.get_preferred_criteria(criterion):
+                if previous_worst_criterion != better_criterion:
+                    y = self.values.get((name, better_criterion))
+                    if y in self.bad_values:
+                        counter_argument = (False, name, better_criterion, y, criterion)
+                        if counter_argument not in used_arguments:
+                            return counter_argument
+            for alternative in self.get_pareto_front() if self.pareto_alternatives else self.items:
+                y = self.values.get((alternative, criterion))
+                if alternative != name and y is not None and y > x:
+                    counter_argument = (True, alternative, criterion, y, None)
+                    if counter_argument not in used_arguments:
+                        return counter_argument
+            y = self.values.get((name, criterion))
+            if y in self.bad_values:
+                counter_argument = (False, name, criterion, y, None)
+                if counter_argument not in used_arguments:
+                    return counter_argument
+        else:
+            for better_criterion in self.get_preferred_criteria(criterion):
+                if previous_worst_criterion != better_criterion:
+                    y = self.values.get((name, better_criterion))
+                    if y in self.good_values:
+                        counter_argument = (True, name, better_criterion, y, criterion)
+                        if counter_argument not in used_arguments:
+                            return counter_argument
+            y = self.values.get((name, criterion))
+            if y in self.good_values:
+                counter_argument = (True, name, criterion, y, None)
+                if counter_argument not in used_arguments:
+                    return counter_argument
+        return None
+
+
+class DuelEvaluator:
+    """DuelEvaluator class.
+    This class replays the negotiation of ArgumentModel between two agents stepped by a BaseScheduler:
+    at each step, each agent in turn handles the messages it received (instantly delivered), or proposes
+    its most preferred item if it has none.
+
+    Messages are (sender, receiver, performative, item, argument) tuples, and only the last decisive
+    message (an ACCEPT, or a REJECT following an ARGUE) is kept to build the final result.
+
+    attr:
+        agent_names: the names of the two agents
+        step_count: number of steps of the negotiation
+    """
+
+    def __init__(self, prefs_1, prefs_2, agent_names=None, pareto_proposals=False, pareto_alternatives=False):
+        """Creates a new DuelEvaluator."""
+        self.agent_names = list(agent_names) if agent_names else ["A1", "A2"]
+        self.step_count = 0
+        self.__negotiators = [
+            _Negotiator(preferences, pareto_proposals, pareto_alternatives) for preferences in (prefs_1, prefs_2)
+        ]
+        self.__items = {}
+        for preferences in (prefs_2, prefs_1):
+            for criterion_value in preferences.get_criterion_value_list():
+                self.__items[criterion_value.get_item().get_name()] = criterion_value.get_item()
+            for item in preferences.get_item_list():
+                self.__items[item.get_name()] = item
+        self.__mailboxes = [[], []]
+        self.__used_arguments = defaultdict(list)
+        self.__previous_message = None
+        self.__decisive_message = None
+        self.__previous_of_decisive = None
+
+    def run(self, max_steps=100, detect_cycles=True):
+        """Runs the negotiation and returns its final result (None if there is no winner)."""
+        seen_states = set()
+        while True:
+            self.step(0)
+            self.step(1)
+            self.step_count += 1
+            if all(negotiator.done_negotiating for negotiator in self.__negotiators):
+                break
+            if self.step_count >= max_steps:
+                break
+            if detect_cycles:
+                state = self.get_conversation_state()
+                if state in seen_states:
+                    break
+                if len(seen_states) < MAX_CYCLE_STATES:
+                    seen_states.add(state)
+        return self.get_final_result()
+
+    def get_conversation_state(self):
+        """Returns the counterpart of ArgumentModel.get_conversation_state."""
+        agents_state = tuple(
+            (
+                negotiator.done_negotiating,
+                tuple(negotiator.items),
+                frozenset(negotiator.no_args_items),
+                tuple(mailbox),
+            )
+            for negotiator, mailbox in zip(self.__negotiators, self.__mailboxes)
+        )
+        n_used_arguments = sum(len(set(arguments)) for arguments in self.__used_arguments.values())
+        return agents_state, n_used_arguments
+
+    def get_final_result(self):
+        """Returns the final result in the format of ArgumentModel.get_final_result."""
+        if self.__decisive_message is None:
+            return None
+        _, receiver, _, name, _ = self.__decisive_message
+        previous_message = self.__previous_of_decisive
+        results = {
+            "winning_agent": self.agent_names[receiver],
+            "winning_item": self.__items[name] if name is not None else None,
+        }
+        if previous_message[2] == MessagePerformative.ARGUE:
+            vocabulary = self.__negotiators[previous_message[0]].vocabulary
+            decision, argument_name, criterion, value, worst_criterion = previous_message[4]
+            worst_criterion = vocabulary.get_criterion(worst_criterion) if worst_criterion is not None else None
+            results["winning_argument"] = {
+                "item": self.__items[argument_name],
+                "decision": "pro" if decision else "con",
+                "main_criterion": vocabulary.get_criterion(criterion),
+                "value": vocabulary.get_value(value),
+                "secondary_criterion": worst_criterion,
+            }
+        else:
+            results["winning_argument"] = {"item": self.__items[previous_message[3]], "decision": "top_10_percent"}
+        return results
+
+    def send(self, sender, receiver, performative, name, argument=None):
+        """Sends a message, keeping track of the last decisive message."""
+        message = (sender, receiver, performative, name, argument)
+        if performative == MessagePerformative.ACCEPT:
+            self.__decisive_message = message
+            self.__previous_of_decisive = self.__previous_message
+        elif performative == MessagePerformative.REJECT and self.__previous_message[2] == MessagePerformative.ARGUE:
+            self.__decisive_message = (sender, receiver, performative, None, None)
+            self.__previous_of_decisive = self.__previous_message
+        self.__previous_message = message
+        if receiver is not None:
+            self.__mailboxes[receiver].append(message)
+
+    def step(self, k):
+        """Steps agent k as ArgumentAgent.step."""
+        negotiator = self.__negotiators[k]
+        messages = self.__mailboxes[k]
+        self.__mailboxes[k] = []
+        if len(messages) == 0:
+            self.propose(k, 1 - k)
+            return
+        for sender, _, performative, name, argument in messages:
+            if performative == MessagePerformative.ACCEPT:
+                self.send(k, sender, MessagePerformative.COMMIT, name)
+                negotiator.remove_item(name)
+                negotiator.done_negotiating = True
+            elif performative == MessagePerformative.REJECT:
+                negotiator.remove_item(name)
+                self.propose(k, sender)
+            elif performative == MessagePerformative.PROPOSE:
+                if negotiator.is_item_among_top_x_percent(name, TOP_PERCENT):
+                    self.send(k, sender, MessagePerformative.ACCEPT, name)
+                else:
+                    self.send(k, sender, MessagePerformative.ASK_WHY, name)
+            elif performative == MessagePerformative.COMMIT:
+                self.send(k, None, MessagePerformative.COMMIT, name)
+                negotiator.remove_item(name)
+                negotiator.done_negotiating = True
+            elif performative == MessagePerformative.ARGUE:
+                self.handle_argue(k, sender, argument)
+            elif performative == MessagePerformative.ASK_WHY:
+                self.handle_ask_why(k, sender, name)
+
+    def propose(self, k, receiver):
+        negotiator = self.__negotiators[k]
+        name = negotiator.most_preferred()
+        if name is not None:
+            self.send(k, receiver, MessagePerformative.PROPOSE, name)
+        else:
+            negotiator.done_negotiating = True
+
+    def handle_argue(self, k, sender, argument):
+        negotiator = self.__negotiators[k]
+        name = argument[1]
+        counter_argument = negotiator.get_counter_argument(argument, self.__used_arguments.get(name, ()))
+        if counter_argument:
+            self.__used_arguments[name].append(counter_argument)
+            self.send(k, sender, MessagePerformative.ARGUE, name, counter_argument)
+        elif argument[0]:
+            self.send(k, sender, MessagePerformative.ACCEPT, name)
+        else:
+            negotiator.remove_item(name)
+            self.send(k, sender, MessagePerformative.REJECT, name)
+
+    def handle_ask_why(self, k, sender, name):
+        negotiator = self.__negotiators[k]
+        argument = negotiator.support_proposal(name)
+        if argument:
+            self.__used_arguments[name].append(argument)
+            self.send(k, sender, MessagePerformative.ARGUE, name, argument)
+        else:
+            if name not in negotiator.items:
+                raise ValueError("list.remove(x): x not in list")
+            self.propose(k, sender)
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+
+import os
+import pickle
+
+from communication.tournament.Tournament import collect_results, run_pairings
+
+
+class IncrementalTournament:
+    """IncrementalTournament class.
+    This class keeps the outcomes of a round-robin tournament between a changing population of agents:
+    adding an agent only runs its duels against the other agents, and removing one only forgets its duels.
+
+    Each agent gets a permanent id when it is added, and the duel between agents i < j is run and seeded
+    as in run_tournament, so a tournament built incrementally has the same results as a full run.
+
+    attr:
+        seed: seed of the duels (None for unseeded duels)
+        model_kwargs: parameters given to ArgumentModel
+    """
+
+    def __init__(self, seed=None, **model_kwargs):
+        """Creates a new empty IncrementalTournament."""
+        self.seed = seed
+        self.model_kwargs = model_kwargs
+        self.__next_id = 0
+        self.__ids = {}  # agent name -> id, in adding order
+        self.__names = {}
+        self.__population = {}
+        self.__outcomes = {}  # (i, j), i < j -> results of the duel
+        self.__pending = []
+        self.__scores = {}
+
+    def __len__(self):
+        """Returns the number of agents."""
+        return len(self.__ids)
+
+    def __contains__(self, name):
+        return name in self.__ids
+
+    def add_agent(self, name, preferences):
+        """Adds an agent, whose duels are run at the next update."""
+        if name in self.__ids:
+            raise ValueError(f"Agent {name} is already in the tournament")
+        new_id = self.__next_id
+        self.__next_id += 1
+        self.__pending.extend((other_id, new_id) for other_id in self.__ids.values())
+        self.__ids[name] = new_id
+        self.__names[new_id] = name
+        self.__population[new_id] = preferences
+        self.__scores[new_id] = 0
+
+    def add_agents(self, population):
+        """Adds agents from a dict of preferences by name."""
+        for name, preferences in population.items():
+            self.add_agent(name, preferences)
+
+    def remove_agent(self, name):
+        """Removes an agent and forgets its duels, updating the scores of its opponents."""
+        removed_id = self.__ids.pop(name)
+        del self.__names[removed_id]
+        del self.__population[removed_id]
+        del self.__scores[removed_id]
+        for other_id in self.__ids.values():
+            pairing = (min(removed_id, other_id), max(removed_id, other_id))
+            results = self.__outcomes.pop(pairing, None)
+            if results:
+                self.__scores[other_id] += 1 if results["winning_agent"] == name else -1
+        if self.__pending:
+            self.__pending = [pairing for pairing in self.__pending if removed_id not in pairing]
+
+    def get_pending_pairings(self):
+        """Returns the pairings (i, j) of agent ids whose duels have not been run yet."""
+        return list(self.__pending)
+
+    def update(self, **run_kwargs):
+        """Runs the pending duels and returns their number.
+        Keyword arguments are the ones of run_pairings (n_workers, chunk_size, shared_memory, cache), and
+        parameters of ArgumentModel or seed overriding the ones of the tournament for this update.
+        If the run fails, the duels stay pending for the next update.
+        """
+        pairings = self.__pending
+        run_kwargs = {"seed": self.seed, **self.model_kwargs, **run_kwargs}
+        duel_results = run_pairings(pairings, self.__population, self.__names, **run_kwargs)
+        for (i, j), results in zip(pairings, duel_results):
+            self.__outcomes[(i, j)] = results
+            if results:
+                score = 1 if results["winning_agent"] == self.__names[i] else -1
+                self.__scores[i] += score
+                self.__scores[j] -= score
+        self.__pending = []
+        return len(pairings)
+
+    def get_agent_names(self):
+        """Returns the names of the agents, in adding order."""
+        return list(self.__ids)
+
+    def get_preferences(self, name):
+        """Returns the preferences of an agent."""
+        return self.__population[self.__ids[name]]
+
+    def get_duel_results(self, name_1, name_2):
+        """Returns the results of the duel between two agents (None if there is no winner)."""
+        id_1, id_2 = self.__ids[name_1], self.__ids[name_2]
+        return self.__outcomes[(min(id_1, id_2), max(id_1, id_2))]
+
+    def get_score(self, name):
+        """Returns the number of duels won minus the number of duels lost by an agent."""
+        return self.__scores[self.__ids[name]]
+
+    def get_scores(self):
+        """Returns the scores of the agents by name, in adding order."""
+        return {name: self.__scores[agent_id] for name, agent_id in self.__ids.items()}
+
+    def get_ranking(self):
+        """Returns the agent names sorted by decreasing score (ties in adding order)."""
+        return sorted(self.__ids, key=lambda name: -self.__scores[self.__ids[name]])
+
+    def get_result(self):
+        """Returns the TournamentResult of the duels run so far, with agents in adding order and duels in
+        pairing order."""
+        ids = list(self.__ids.values())
+        positions = {agent_id: position for position, agent_id in enumerate(ids)}
+        pairings = sorted(self.__outcomes)
+        return collect_results(
+            len(ids),
+            list(self.__ids),
+            [(positions[i], positions[j]) for i, j in pairings],
+            [self.__outcomes[pairing] for pairing in pairings],
+        )
+
+    def save(self, path):
+        """Saves the tournament to a file."""
+        temporary_path = f"{path}.{os.getpid()}.tmp"
+        with open(temporary_path, "wb") as file:
+            pickle.dump(self, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary_path, path)
+
+    @staticmethod
+    def load(path):
+        """Loads a tournament saved with save."""
+        with open(path, "rb") as file:
+            return pickle.load(file)
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+
+from collections import namedtuple
+from statistics import NormalDist
+
+import numpy as np
+
+from communication.tournament.Tournament import run_pairings
+
+RANDOM = "random"
+SWISS = "swiss"
+SWISS_WINDOW = 10  # number of opponents of similar score looked at before giving up on pairing an agent
+
+SampledTournamentResult = namedtuple(
+    "SampledTournamentResult", ["scores", "lower_bounds", "upper_bounds", "n_played", "n_duels", "n_rounds"]
+)
+
+
+def run_sampled_tournament(
+    population,
+    agent_names=None,
+    pairing=SWISS,
+    min_rounds=3,
+    max_rounds=None,
+    rank_correlation=0.99,
+    tolerance=None,
+    confidence=0.95,
+    seed=None,
+    **kwargs,
+):
+    """Estimates the round-robin scores of agents (duels won minus duels lost against all the other agents)
+    by running rounds of sampled duels, where each agent plays at most one duel per round.
+
+    With RANDOM pairings, agents meet random opponents and the scores are unbiased estimates of the
+    round-robin ones. With SWISS pairings, agents meet opponents of similar score, which separates the
+    top of the ranking with fewer duels, and the scores estimate the results against such opponents.
+    The same two agents never meet twice.
+
+    Rounds stop after max_rounds (n_agents - 1 by default), or after min_rounds once the Spearman correlation
+    between the scores of two successive rounds reaches rank_correlation, or once all the confidence
+    intervals are narrower than tolerance (a fraction of the n_agents - 1 score range), or once all the pairs
+    of agents have met, the scores being then the round-robin ones.
+    Other keyword arguments are the ones of run_pairings (n_workers, cache, ArgumentModel parameters...).
+
+    :return: a SampledTournamentResult with the estimated scores, their confidence intervals, the number of
+        duels of each agent, and the total numbers of duels and rounds.
+    """
+    if pairing not in (RANDOM, SWISS):
+        raise ValueError(f"Unknown pairing {pairing}")
+    n_agents = len(population)
+    if agent_names is None:
+        agent_names = [f"A{i}" for i in range(n_agents)]
+    if max_rounds is None:
+        max_rounds = n_agents - 1
+    rng = np.random.default_rng(seed)
+    z = NormalDist().inv_cdf((1 + confidence) / 2)
+
+    totals = np.zeros(n_agents)
+    squared_totals = np.zeros(n_agents)
+    n_played = np.zeros(n_agents, dtype=np.int64)
+    played = set()
+    n_duels = 0
+    n_rounds = 0
+    scores = np.zeros(n_agents)
+    previous_ranks = None
+    while n_rounds < max_rounds:
+        if pairing == SWISS:
+            order = np.lexsort((rng.random(n_agents), -_get_means(totals, n_played))).tolist()
+            pairings = _get_swiss_pairings(order, played)
+        else:
+            pairings = []
+        if not pairings:  # the agents of similar scores have all met, any pair which has not met yet will do
+            pairings = _get_random_pairings(rng.permutation(n_agents).tolist(), played)
+        if not pairings:  # all the pairs have met
+            break
+        duel_results = run_pairings(pairings, population, agent_names, seed=seed, **kwargs)
+        for (i, j), results in zip(pairings, duel_results):
+            played.add((i, j))
+            score = 0
+            if results:
+                score = 1 if results["winning_agent"] == agent_names[i] else -1
+            totals[[i, j]] += (score, -score)
+            squared_totals[[i, j]] += score * score
+            n_played[[i, j]] += 1
+        n_duels += len(pairings)
+        n_rounds += 1
+
+        means = _get_means(totals, n_played)
+        scores = (n_agents - 1) * means
+        half_widths = (n_agents - 1) * z * _get_standard_errors(means, squared_totals, n_played)
+        ranks = _get_ranks(scores)
+        if n_rounds >= min_rounds:
+            if tolerance is not None and half_widths.max() <= tolerance * (n_agents - 1):
+                break
+            if previous_ranks is not None and _get_correlation(ranks, previous_ranks) >= rank_correlation:
+                break
+        previous_ranks = ranks
+
+    if n_rounds == 0:
+        half_widths = np.full(n_agents, float(max(n_agents - 1, 0)))
+    return SampledTournamentResult(scores, scores - half_widths, scores + half_widths, n_played, n_duels, n_rounds)
+
+
+def _get_means(totals, n_played):
+    return totals / np.maximum(n_played, 1)
+
+
+def _get_standard_errors(means, squared_totals, n_played):
+    """Returns the standard errors of the mean duel scores, the widest possible (1) with less than 2 duels."""
+    counts = np.maximum(n_played, 2)
+    variances = np.maximum(squared_totals / counts - means**2, 0) * counts / (counts - 1)
+    return np.where(n_played >= 2, np.sqrt(variances / counts), 1.0)
+
+
+def _get_ranks(values):
+    """Returns the ranks of values, ties getting their average rank."""
+    _, inverse, counts = np.unique(values, return_inverse=True, return_counts=True)
+    average_ranks = np.cumsum(counts) - (counts - 1) / 2
+    return average_ranks[inverse]
+
+
+def _get_correlation(ranks, other_ranks):
+    if ranks.std() == 0 or other_ranks.std() == 0:
+        return 1.0 if np.array_equal(ranks, other_ranks) else 0.0
+    return np.corrcoef(ranks, other_ranks)[0, 1]
+
+
+def _get_random_pairings(order, played):
+    """Pairs each agent of a random order with the next unpaired agent it has not met yet, so that there are
+    no pairings only once all the pairs have met."""
+    return _get_swiss_pairings(order, played, window=None)
+
+
+def _get_swiss_pairings(order, played, window=SWISS_WINDOW):
+    """Pairs each agent of an order by score with the next unpaired agent it has not met yet, giving up on an
+    agent after window opponents it has already met (never if window is None)."""
+    pairings = []
+    paired = set()
+    for position, agent in enumerate(order):
+        if agent in paired:
+            continue
+        n_checked = 0
+        for next_position in range(position + 1, len(order)):
+            other = order[next_position]
+            if other in paired:
+                continue
+            pairing = (min(agent, other), max(agent, other))
+            if pairing not in played:
+                pairings.append(pairing)
+                paired.update(pairing)
+                break
+            n_checked += 1
+            if window is not None and n_checked >= window:
+                break
+    return pairings
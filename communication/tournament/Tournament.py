@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+
+import itertools
+import math
+import os
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+
+from communication.preferences.SharedPopulation import SharedPopulation
+from communication.tournament.BatchEvaluator import evaluate_duels
+from communication.tournament.DuelCache import get_preferences_fingerprint
+from communication.tournament.DuelEvaluator import evaluate_duel
+from pw_argumentation import ArgumentModel
+
+TournamentResult = namedtuple("TournamentResult", ["duels_results", "winning_items", "winning_arguments"])
+
+_MISSING = object()  # marks the duels not found in the cache
+
+
+def get_duel_seed(seed, i, j):
+    """Returns the seed of the duel between agents i and j, which does not depend on the order duels are run in."""
+    if seed is None:
+        return None
+    return int(np.random.SeedSequence(seed, spawn_key=(i, j)).generate_state(1)[0])
+
+
+def get_pairings(n_agents):
+    """Returns an iterator over the round-robin pairings (i, j), i < j, in the order of the sequential loop."""
+    return ((i, j) for i in range(n_agents) for j in range(i + 1, n_agents))
+
+
+def run_duel(prefs_1, prefs_2, agent_names=None, seed=None, cache=None, direct=False, **model_kwargs):
+    """Runs a negotiation between two agents and returns its final result (None if there is no winner).
+    If a DuelCache is given, the result is looked up in it first and stored in it after the negotiation.
+    With direct, the result is computed by evaluate_duel instead of running an ArgumentModel.
+    """
+    if cache is not None:
+        agent_names = agent_names or ["A1", "A2"]
+        key = cache.get_key(get_preferences_fingerprint(prefs_1), get_preferences_fingerprint(prefs_2), model_kwargs)
+        results = cache.get(key, agent_names, default=_MISSING)
+        if results is _MISSING:
+            results = run_duel(prefs_1, prefs_2, agent_names, seed, direct=direct, **model_kwargs)
+            cache.put(key, agent_names, results)
+        return results
+
+    if direct:
+        return evaluate_duel(prefs_1, prefs_2, agent_names, **model_kwargs)
+    argument_model = ArgumentModel([prefs_1, prefs_2], agent_names, seed=seed, **model_kwargs)
+    argument_model.run_model()
+    results = argument_model.get_result()
+    return results
+
+
+def run_duels(pairings, population, agent_names, seed=None, model_kwargs=None):
+    """Runs the duels of a list of pairings and returns their results in the same order.
+    population and agent_names can be lists or dicts, they are only indexed with the agents of the pairings.
+    The ArgumentModel of the first duel is reset and reused for the next ones.
+    """
+    model_kwargs = dict(model_kwargs or {})
+    if model_kwargs.pop("batched", False):
+        model_kwargs.pop("direct", None)
+        return evaluate_duels(pairings, population, agent_names, **model_kwargs)
+    if model_kwargs.get("direct"):
+        return [
+            run_duel(population[i], population[j], [agent_names[i], agent_names[j]], **model_kwargs)
+            for i, j in pairings
+        ]
+    duel_results = []
+    argument_model = None
+    for i, j in pairings:
+        agents_prefs = [population[i], population[j]]
+        duel_names = [agent_names[i], agent_names[j]]
+        if argument_model is None:
+            argument_model = ArgumentModel(agents_prefs, duel_names, seed=get_duel_seed(seed, i, j), **model_kwargs)
+        else:
+            argument_model.reset(agents_prefs, duel_names, get_duel_seed(seed, i, j))
+        argument_model.run_model()
+        results = argument_model.get_result()
+        duel_results.append(results)
+    return duel_results
+
+
+def run_tournament(population, agent_names=None, **kwargs):
+    """Runs a round-robin tournament between agents with the given preferences.
+    Keyword arguments are the ones of run_pairings.
+
+    :return: a TournamentResult with the duels matrix (1 if the row agent won, -1 if it lost, 0 if no winner),
+        and the winning items and arguments of the duels with a winner, in pairing order.
+    """
+    n_agents = len(population)
+    if agent_names is None:
+        agent_names = [f"A{i}" for i in range(n_agents)]
+    duel_results = run_pairings(get_pairings(n_agents), population, agent_names, **kwargs)
+    return collect_results(n_agents, agent_names, get_pairings(n_agents), duel_results)
+
+
+def run_pairings(
+    pairings,
+    population,
+    agent_names,
+    n_workers=None,
+    chunk_size=None,
+    seed=None,
+    shared_memory=False,
+    cache=None,
+    direct=False,
+    batched=False,
+    **model_kwargs,
+):
+    """Runs the duels of the given pairings (i, j) of agents of the population and returns their results in order.
+
+    Pairings are sent by chunks to a pool of n_workers processes (all cpus by default, n_workers=1 runs
+    in the current process). Each duel is seeded from (seed, i, j), so the results do not depend on the
+    number of workers nor on the chunk size.
+    With shared_memory, the population is copied once in a SharedPopulation that the workers attach to,
+    instead of sending the preferences of the agents with every chunk.
+    With a DuelCache, only the duels missing from the cache are run, and their results are cached.
+    With direct, duels are computed by evaluate_duel, which gives the same results much faster.
+    With batched, the duels of each worker are computed together by evaluate_duels.
+    Extra keyword arguments are passed to ArgumentModel.
+    """
+    if cache is not None:
+        pairings = list(pairings)
+        fingerprints = {}
+        for k in {k for pairing in pairings for k in pairing}:
+            fingerprints[k] = get_preferences_fingerprint(population[k])
+        keys = [cache.get_key(fingerprints[i], fingerprints[j], model_kwargs) for i, j in pairings]
+        duel_results = [
+            cache.get(key, (agent_names[i], agent_names[j]), default=_MISSING)
+            for key, (i, j) in zip(keys, pairings)
+        ]
+        missing = [k for k, results in enumerate(duel_results) if results is _MISSING]
+        missing_results = run_pairings(
+            [pairings[k] for k in missing],
+            population,
+            agent_names,
+            n_workers,
+            chunk_size,
+            seed,
+            shared_memory,
+            direct=direct,
+            batched=batched,
+            **model_kwargs,
+        )
+        for k, results in zip(missing, missing_results):
+            i, j = pairings[k]
+            cache.put(keys[k], (agent_names[i], agent_names[j]), results)
+            duel_results[k] = results
+        return duel_results
+
+    if direct:
+        model_kwargs = {**model_kwargs, "direct": True}
+    if batched:
+        model_kwargs = {**model_kwargs, "batched": True}
+    if n_workers is None:
+        n_workers = os.cpu_count() or 1
+    if n_workers == 1:
+        return run_duels(pairings, population, agent_names, seed, model_kwargs)
+
+    pairings = list(pairings)
+    if len(pairings) <= 1:
+        return run_duels(pairings, population, agent_names, seed, model_kwargs)
+    if chunk_size is None:
+        chunk_size = max(1, math.ceil(len(pairings) / (4 * n_workers)))
+    if shared_memory:
+        with SharedPopulation.create(population) as shared_population:
+            return _run_parallel(
+                pairings,
+                n_workers,
+                chunk_size,
+                lambda chunk, agents: (_run_shared_duels, chunk, {k: agent_names[k] for k in agents}),
+                seed,
+                model_kwargs,
+                initializer=_attach_shared_population,
+                initargs=(shared_population.get_spec(),),
+            )
+    # only send the preferences and names of the agents playing in the chunk
+    return _run_parallel(
+        pairings,
+        n_workers,
+        chunk_size,
+        lambda chunk, agents: (
+            run_duels,
+            chunk,
+            {k: population[k] for k in agents},
+            {k: agent_names[k] for k in agents},
+        ),
+        seed,
+        model_kwargs,
+    )
+
+
+def _run_parallel(pairings, n_workers, chunk_size, make_job, seed, model_kwargs, initializer=None, initargs=()):
+    """Runs duels on a process pool, keeping a bounded number of chunks in flight.
+    make_job(chunk, agents) returns the function to run on the chunk followed by its first arguments.
+    """
+    pairings = iter(pairings)
+    chunks = iter(lambda: list(itertools.islice(pairings, chunk_size)), [])
+    chunks_results = {}
+    with ProcessPoolExecutor(n_workers, initializer=initializer, initargs=initargs) as executor:
+        futures = {}
+        for chunk_index, chunk in enumerate(chunks):
+            if len(futures) >= 2 * n_workers:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    chunks_results[futures.pop(future)] = future.result()
+            job = make_job(chunk, {k for pairing in chunk for k in pairing})
+            futures[executor.submit(*job, seed, model_kwargs)] = chunk_index
+        for future in futures:
+            chunks_results[futures[future]] = future.result()
+    return [results for chunk_index in range(len(chunks_results)) for results in chunks_results[chunk_index]]
+
+
+_shared_population = None  # population attached by each worker process
+
+
+def _attach_shared_population(spec):
+    global _shared_population
+    _shared_population = SharedPopulation.attach(spec)
+
+
+def _run_shared_duels(pairings, agent_names, seed, model_kwargs):
+    return run_duels(pairings, _shared_population, agent_names, seed, model_kwargs)
+
+
+def collect_results(n_agents, agent_names, pairings, duel_results):
+    """Gathers the results of the duels of the given pairings in a TournamentResult."""
+    duels_results = np.zeros((n_agents, n_agents))
+    winning_items = []
+    winning_arguments = []
+    for (i, j), results in zip(pairings, duel_results):
+        if results:
+            score = 1 if results["winning_agent"] == agent_names[i] else -1
+            duels_results[i, j] = score
+            duels_results[j, i] = -score
+            winning_items.append(results["winning_item"])
+            winning_arguments.append(results["winning_argument"])
+    return TournamentResult(duels_results, winning_items, winning_arguments)
@@ -0,0 +1,20 @@
+#!/usr/bin/env python3
+
+from enum import Enum
+
+
+class EventType(Enum):
+    """EventType enum class.
+    Enumeration containing the possible types of events traced during a negotiation.
+    """
+    PROPOSE = 0
+    ACCEPT = 1
+    COMMIT = 2
+    ASK_WHY = 3
+    ARGUE = 4
+    REJECT = 5
+    REMOVE_ITEM = 6  # an item is removed from the preferences of the agent
+    NO_ARGUMENT = 7  # the agent has no argument to support its proposal
+    UNKNOWN_CRITERION = 8  # the agent received an argument on a criterion it does not have
+    UNKNOWN_MESSAGE = 9
+    DONE = 10  # the agent has no more items to propose
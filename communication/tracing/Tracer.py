@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+
+import json
+import logging
+from collections import namedtuple
+
+from communication.message.MessagePerformative import MessagePerformative
+from communication.tracing.EventType import EventType
+
+# cause: the performative of the message the agent was handling, None if it had no message
+TraceEvent = namedtuple("TraceEvent", ["step", "event_type", "agent", "target", "item", "argument", "cause"])
+
+_DEBUG_EVENTS = (EventType.REMOVE_ITEM, EventType.NO_ARGUMENT, EventType.UNKNOWN_CRITERION)
+
+
+def get_event_level(event):
+    """Returns the logging level of an event."""
+    if event.event_type == EventType.UNKNOWN_MESSAGE:
+        return logging.WARNING
+    if event.event_type in _DEBUG_EVENTS:
+        return logging.DEBUG
+    return logging.INFO
+
+
+def format_event(event):
+    """Returns the log message of an event."""
+    event_type, target, cause = event.event_type, event.target, event.cause
+    item = event.item.get_name() if event.item is not None else None
+    received = f"Received {cause.name} message from {target}." if cause is not None else "No messages received."
+    if event_type == EventType.PROPOSE:
+        if cause == MessagePerformative.ASK_WHY:
+            return f"No args for previous item. Proposing new item: {item} to {target}"
+        return f"{received} Proposing {item} to {target}"
+    if event_type == EventType.DONE:
+        if cause == MessagePerformative.ASK_WHY:
+            return "No args for previous item. No more items to propose."
+        return f"{received} No items to propose."
+    if event_type == EventType.ARGUE:
+        if cause == MessagePerformative.ASK_WHY:
+            return f"{received} Giving argument: {event.argument}"
+        return f"Received argument from {target}. Sending counter argument: {event.argument}"
+    if event_type == EventType.ACCEPT:
+        if cause == MessagePerformative.PROPOSE:
+            return f"Accepting proposal {item} from {target} because it is among top 10%"
+        return f"Accepting proposal {item} from {target} because no counter argument"
+    if event_type == EventType.ASK_WHY:
+        return f"Asking why {item} from {target}"
+    if event_type == EventType.REJECT:
+        return f"Rejecting my proposal {item} because no counter argument"
+    if event_type == EventType.COMMIT:
+        return f"{received} Committing {item}"
+    if event_type == EventType.REMOVE_ITEM:
+        return f"Removed {item} from preferences"
+    if event_type == EventType.NO_ARGUMENT:
+        return f"Agent {event.agent} received ASK_WHY message but has no arguments to support {item}"
+    if event_type == EventType.UNKNOWN_CRITERION:
+        return f"Received an argument with a criterion not in the agent's preferences: {event.argument}"
+    return f"Unknown message received: {cause}"
+
+
+class Tracer:
+    """Tracer class.
+    Base class of the tracers receiving the events of a negotiation. It is disabled and drops every event:
+    the agents only build events when the tracer of their model is enabled, so tracing costs nothing by default.
+
+    attr:
+        enabled: whether the events must be built and emitted (bool)
+    """
+
+    enabled = False
+
+    def emit(self, event):
+        """Handles a TraceEvent."""
+
+
+class LoggingTracer(Tracer):
+    """LoggingTracer class.
+    Tracer which logs the events with the logger named after the agent, as ArgumentAgent loggers.
+    Messages are only formatted for the events the logger is enabled for.
+    """
+
+    enabled = True
+
+    def emit(self, event):
+        """Logs a TraceEvent."""
+        logger = logging.getLogger(event.agent)
+        level = get_event_level(event)
+        if logger.isEnabledFor(level):
+            logger.log(level, format_event(event))
+
+
+class FileTracer(Tracer):
+    """FileTracer class.
+    Tracer which writes the events in a file, one JSON object by line. It can be used as a context manager.
+
+    attr:
+        file: the file the events are written to
+    """
+
+    enabled = True
+
+    def __init__(self, path):
+        """Creates a new FileTracer writing to the given path."""
+        self.file = open(path, "w")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def emit(self, event):
+        """Writes a TraceEvent as a JSON line."""
+        record = {
+            "step": event.step,
+            "event_type": event.event_type.name,
+            "agent": event.agent,
+            "target": event.target,
+            "item": event.item.get_name() if event.item is not None else None,
+            "argument": str(event.argument) if event.argument is not None else None,
+            "cause": event.cause.name if event.cause is not None else None,
+        }
+        self.file.write(json.dumps(record) + "\n")
+
+    def close(self):
+        """Closes the file."""
+        self.file.close()
+
+
+class MemoryTracer(Tracer):
+    """MemoryTracer class.
+    Tracer which collects the events in memory.
+
+    attr:
+        events: the TraceEvents received so far (list)
+    """
+
+    enabled = True
+
+    def __init__(self):
+        """Creates a new MemoryTracer."""
+        self.events = []
+
+    def emit(self, event):
+        """Stores a TraceEvent."""
+        self.events.append(event)
+
+    def get_events(self, event_type=None):
+        """Returns the events received so far, only the ones of the given EventType if any."""
+        if event_type is None:
+            return list(self.events)
+        return [event for event in self.events if event.event_type == event_type]
+
+    def clear(self):
+        """Forgets the events received so far."""
+        self.events.clear()
@@ -1,8 +1,6 @@
-from mesa import Model
-from mesa.time import RandomActivation, BaseScheduler
-
-
 from communication.agent.CommunicatingAgent import CommunicatingAgent
+from communication.agent.Conversation import Conversation
+from communication.model.Model import Model, get_random_seed
 
 from communication.message.MessageService import MessageService
 from communication.message.MessagePerformative import MessagePerformative
@@ -10,36 +8,102 @@ from communication.message.Message import Message
 
 from communication.preferences.CriterionName import CriterionName
 from communication.preferences.CriterionValue import CriterionValue
-from communication.preferences.Item import Item
+from communication.preferences.ItemCatalog import DEFAULT_CATALOG
 from communication.preferences.Value import Value
 from communication.preferences.Preferences import Preferences
+from communication.preferences.Vocabulary import DEFAULT_VOCABULARY, Vocabulary
 
 from communication.arguments.Argument import Argument
 
+from communication.scheduler.ActivityScheduler import ActivityScheduler
+from communication.scheduler.BaseScheduler import BaseScheduler
+
+from communication.tracing.EventType import EventType
+from communication.tracing.Tracer import LoggingTracer, TraceEvent, Tracer
+
 import random as rd
-import pandas as pd
-import numpy as np
 import copy
 import logging
-import colorama
 from collections import defaultdict
 
-global_arguments_dict = defaultdict(list)
+# ANSI codes of the colorama.Fore colors of the agent logs (colorama is only needed to enable them on Windows)
+LOG_COLORS = ["\033[33m", "\033[34m", "\033[35m", "\033[36m", "\033[37m", "\033[31m", "\033[32m"]
+
+OUTCOME_FINISHED = "finished"  # all agents are done negotiating
+OUTCOME_CYCLE = "cycle"  # the conversation state repeated itself
+OUTCOME_MAX_STEPS = "max_steps"  # the step budget is exhausted
+
+MAX_CYCLE_STATES = 10000  # conversation states kept for cycle detection, longer cycles are left to max_steps
 
 
 class ArgumentAgent(CommunicatingAgent):
-    """ArgumentAgent which inherit from CommunicatingAgent."""
+    """ArgumentAgent which inherit from CommunicatingAgent.
+
+    The agent negotiates in its default conversation, with targets drawn at random, unless the model opens
+    conversations with given partners: it then negotiates in each of them at once. preferences,
+    done_negotiating and no_args_items are the ones of the conversation the agent is currently stepping.
+    Without a log color, the agent has no console logger, as in large populations.
+    """
 
-    def __init__(self, unique_id, model, name, preferences, log_color):
+    def __init__(self, unique_id, model, name, preferences, log_color=None):
         super().__init__(unique_id, model, name)
-        self.preferences = preferences
-        self.logger = self._init_logger(name, log_color)
-        self.done_negotiating = False
-        self.no_args_items = []  # items for which we have no arguments. We never propose those items again
+        self.conversation = self.__default_conversation = Conversation(None, None, preferences, model.used_arguments)
+        self.conversations = []  # the conversations opened by the model, ordered by id
+        self.log_color = log_color
+        self.logger = self._init_logger(name, log_color) if log_color is not None else None
+
+    def reset(self, preferences, name=None):
+        """Reinitialises the agent in place for a new negotiation with the given preferences."""
+        renamed = name is not None and name != self.get_name()
+        super().reset(name)
+        if renamed and self.log_color is not None:
+            self.logger = self._init_logger(name, self.log_color)
+        self.conversation = self.__default_conversation = Conversation(
+            None, None, preferences, self.model.used_arguments
+        )
+        self.conversations = []
+
+    @property
+    def preferences(self):
+        """The preferences of the agent in its current conversation."""
+        return self.conversation.preferences
+
+    @preferences.setter
+    def preferences(self, preferences):
+        self.conversation.preferences = preferences
+
+    @property
+    def done_negotiating(self):
+        """Whether the agent is done negotiating in its current conversation."""
+        return self.conversation.done_negotiating
+
+    @done_negotiating.setter
+    def done_negotiating(self, done_negotiating):
+        self.conversation.done_negotiating = done_negotiating
+
+    @property
+    def no_args_items(self):
+        """The items for which the agent has no arguments in its current conversation, never proposed again."""
+        return self.conversation.no_args_items
+
+    @no_args_items.setter
+    def no_args_items(self, no_args_items):
+        self.conversation.no_args_items = no_args_items
+
+    def open_conversation(self, conversation):
+        """Adds a conversation in which the agent negotiates with its partner, with its own preferences."""
+        self.conversations.append(conversation)
+
+    def create_message(self, receiver, performative, content):
+        """Returns a new message of the agent in its current conversation."""
+        return Message(self.get_name(), receiver, performative, content, self.conversation.conversation_id)
 
     @staticmethod
     def _init_logger(name, log_color):
+        """Returns the logger of the agent, adding its console handler only the first time the name is used."""
         logger = logging.getLogger(name)
+        if logger.handlers:
+            return logger
         console = logging.StreamHandler()
         console.setLevel(logging.DEBUG)
 
@@ -48,24 +112,58 @@ class ArgumentAgent(CommunicatingAgent):
         logger.addHandler(console)
         return logger
 
+    def is_finished(self):
+        if self.conversations:
+            return all(conversation.closed or conversation.done_negotiating for conversation in self.conversations)
+        return self.done_negotiating
+
+    def get_proposal(self):
+        """Returns the most preferred item the agent can propose (None if there is none), among the items of
+        its Pareto front with the pareto_proposals option of the model."""
+        item_list = self.preferences.get_pareto_front() if self.model.pareto_proposals else None
+        return self.preferences.most_preferred(item_list, exclude_list=self.no_args_items)
+
+    def trace(self, event_type, target=None, item=None, argument=None, cause=None):
+        """Emits an event to the tracer of the model, only building it if the tracer is enabled."""
+        tracer = self.model.tracer
+        if tracer.enabled:
+            tracer.emit(TraceEvent(self.model.step_count, event_type, self.get_name(), target, item, argument, cause))
+
     def step(self):
         super().step()  # TODO: check if this is needed
-        messages = self.get_new_messages()
+        if not self.conversations:
+            self.step_conversation(self.get_new_messages())
+            return
+        messages = self.get_new_messages_by_conversation()
+        # the ActivityScheduler only steps agents with pending work, i.e. conversations with new messages
+        steps_idle = not isinstance(self.model.schedule, ActivityScheduler)
+        for conversation in self.conversations:
+            conversation_messages = messages.get(conversation.conversation_id, [])
+            if conversation.closed or not (conversation_messages or steps_idle or not conversation.opened):
+                continue
+            conversation.opened = True
+            self.conversation = conversation
+            self.step_conversation(conversation_messages)
+        self.conversation = self.__default_conversation
+
+    def step_conversation(self, messages):
+        """Handles the new messages of the current conversation, or makes a proposal if there are none."""
         if len(messages) == 0:
             # propose item
-            item = self.preferences.most_preferred(exclude_list=self.no_args_items)
+            item = self.get_proposal()
             if item:
-                target = self.get_random_target()
-                proposal = Message(
-                    self.get_name(),
-                    target.get_name(),
+                target_name = self.conversation.partner
+                if target_name is None:
+                    target_name = self.get_random_target().get_name()
+                proposal = self.create_message(
+                    target_name,
                     MessagePerformative.PROPOSE,
                     [item],
                 )
-                self.logger.info(f"No messages received. Proposing {item.get_name()} to {target.get_name()}")
+                self.trace(EventType.PROPOSE, target_name, item)
                 self.send_message(proposal)
             else:
-                self.logger.info("No messages received. No items to propose.")
+                self.trace(EventType.DONE)
                 self.done_negotiating = True
         else:
             for message in messages:
@@ -82,7 +180,7 @@ class ArgumentAgent(CommunicatingAgent):
                 elif message.get_performative() == MessagePerformative.ASK_WHY:
                     self.handle_ask_why(message)
                 else:
-                    self.logger.warning(f"Unknown message received: {message.get_performative()}")
+                    self.trace(EventType.UNKNOWN_MESSAGE, message.get_exp(), cause=message.get_performative())
 
     def handle_argue(self, message):
         # item = message.get_content()[0]
@@ -93,36 +191,33 @@ class ArgumentAgent(CommunicatingAgent):
         )  # TODO: check this: basically we completely forget about the old item when we argue for a better alternative
         counter_argument = self.get_counter_argument(argument)
         if counter_argument:
-            message = Message(
-                self.get_name(),
+            message = self.create_message(
                 target_name,
                 MessagePerformative.ARGUE,
                 [item, counter_argument],  # TODO: Warning: item and counter_argument.item are not the same
             )
-            self.logger.info(f"Received argument from {target_name}. Sending counter argument: {counter_argument}")
-            global_arguments_dict[argument.get_item()].append(counter_argument)
+            self.trace(EventType.ARGUE, target_name, item, counter_argument, MessagePerformative.ARGUE)
+            self.conversation.used_arguments[argument.get_item()].append(counter_argument)
             self.send_message(message)
 
         elif argument.get_conclusion()[1]:  # accept proposal
-            message = Message(
-                self.get_name(),
+            message = self.create_message(
                 target_name,
                 MessagePerformative.ACCEPT,
                 [item],
             )
-            self.logger.info(f"Accepting proposal {item.get_name()} from {target_name} because no counter argument")
+            self.trace(EventType.ACCEPT, target_name, item, cause=MessagePerformative.ARGUE)
             self.send_message(message)
 
         else:  # reject item
             self.preferences.remove_item(item)
-            self.logger.debug(f"Removed {item.get_name()} from preferences. New preferences: {self.preferences}")
-            message = Message(
-                self.get_name(),
+            self.trace(EventType.REMOVE_ITEM, target_name, item, cause=MessagePerformative.ARGUE)
+            message = self.create_message(
                 target_name,
                 MessagePerformative.REJECT,
                 [item],
             )
-            self.logger.info(f"Rejecting my proposal {item.get_name()} because no counter argument")
+            self.trace(EventType.REJECT, target_name, item, cause=MessagePerformative.ARGUE)
             self.send_message(message)
 
     def handle_ask_why(self, message):
@@ -130,79 +225,73 @@ class ArgumentAgent(CommunicatingAgent):
         target_name = message.get_exp()
         argument = self.support_proposal(item)  # TODO: case where no supporting args
         if argument:
-            message = Message(
-                self.get_name(),
+            message = self.create_message(
                 target_name,
                 MessagePerformative.ARGUE,
                 [item, argument],
             )
-            self.logger.info(f"Received ASK_WHY message from {target_name}. Giving argument:{argument}")
-            global_arguments_dict[item].append(argument)
+            self.trace(EventType.ARGUE, target_name, item, argument, MessagePerformative.ASK_WHY)
+            self.conversation.used_arguments[item].append(argument)
             self.send_message(message)
         else:
             # propose another item
             other_items = self.preferences.get_item_list().copy()
             other_items.remove(item)
-            item = self.preferences.most_preferred(exclude_list=self.no_args_items)
+            item = self.get_proposal()
             if item:
-                proposal = Message(self.get_name(), target_name, MessagePerformative.PROPOSE, [item])
-                self.logger.info(f"No args for previous item. Proposing new item: {item.get_name()} to {target_name}")
+                proposal = self.create_message(target_name, MessagePerformative.PROPOSE, [item])
+                self.trace(EventType.PROPOSE, target_name, item, cause=MessagePerformative.ASK_WHY)
                 self.send_message(proposal)
             else:
-                self.logger.info(" No args for previous item. No more items to propose.")
+                self.trace(EventType.DONE, target_name, cause=MessagePerformative.ASK_WHY)
                 self.done_negotiating = True
 
     def handle_commit(self, message):
         item = message.get_content()[0]
         target_name = message.get_exp()
-        message = Message(
-            self.get_name(),
+        message = self.create_message(
             None,
             MessagePerformative.COMMIT,
             [item],
         )
-        self.logger.info(f"Received COMMIT message from {target_name}. Committing {item.get_name()}")
+        self.trace(EventType.COMMIT, target_name, item, cause=MessagePerformative.COMMIT)
         self.send_message(message)
         self.preferences.remove_item(item)
-        self.logger.debug(f"Removed {item.get_name()} from preferences. New preferences: {self.preferences}")
+        self.trace(EventType.REMOVE_ITEM, target_name, item, cause=MessagePerformative.COMMIT)
         self.done_negotiating = True
 
     def handle_accept(self, message):
         item = message.get_content()[0]
         target_name = message.get_exp()
-        message = Message(
-            self.get_name(),
+        message = self.create_message(
             target_name,
             MessagePerformative.COMMIT,
             [item],
         )
-        self.logger.info(f"Received ACCEPT message from {target_name}. Committing {item.get_name()}")
+        self.trace(EventType.COMMIT, target_name, item, cause=MessagePerformative.ACCEPT)
         self.send_message(message)
         self.preferences.remove_item(item)
-        self.logger.debug(f"Removed {item.get_name()} from preferences. New preferences: {self.preferences}")
+        self.trace(EventType.REMOVE_ITEM, target_name, item, cause=MessagePerformative.ACCEPT)
         self.done_negotiating = True
 
     def handle_reject(self, message):
         item = message.get_content()[0]
         target_name = message.get_exp()
         self.preferences.remove_item(item)
-        self.logger.debug(f"Removed {item.get_name()} from preferences. New preferences: {self.preferences}")
+        self.trace(EventType.REMOVE_ITEM, target_name, item, cause=MessagePerformative.REJECT)
 
         # propose new item
-        item = self.preferences.most_preferred(exclude_list=self.no_args_items)
+        item = self.get_proposal()
         if item:
-            proposal = Message(
-                self.get_name(),
+            proposal = self.create_message(
                 target_name,
                 MessagePerformative.PROPOSE,
                 [item],
             )
-            self.logger.info(
-                f"Received REJECT message from {target_name}. Proposing {item.get_name()} to {target_name}"
-            )
+            self.trace(EventType.PROPOSE, target_name, item, cause=MessagePerformative.REJECT)
             self.send_message(proposal)
         else:
-            self.logger.info(f"Received REJECT message from {target_name}. No items to propose.")
+            self.trace(EventType.DONE, target_name, cause=MessagePerformative.REJECT)
             self.done_negotiating = True
 
     def handle_propose(self, message):
@@ -211,29 +300,23 @@ class ArgumentAgent(CommunicatingAgent):
         item = message.get_content()[0]
         PERCENT = 10
         if self.preferences.is_item_among_top_x_percent(item, PERCENT):
-            message = Message(
-                self.get_name(),
+            message = self.create_message(
                 target_name,
                 MessagePerformative.ACCEPT,
                 [item],
             )
-            self.logger.info(
-                f"Accepting proposal {item.get_name()} from {target_name} because it is among top {PERCENT}%"
-            )
+            self.trace(EventType.ACCEPT, target_name, item, cause=MessagePerformative.PROPOSE)
         else:
-            message = Message(
-                self.get_name(),
+            message = self.create_message(
                 target_name,
                 MessagePerformative.ASK_WHY,
                 [item],
             )
-            self.logger.info(f"Asking why {item.get_name()} from {target_name}")
+            self.trace(EventType.ASK_WHY, target_name, item, cause=MessagePerformative.PROPOSE)
         self.send_message(message)
 
     def get_random_target(self):
-        return self.random.choice(
-            [agent for agent in self.model.schedule.agents if agent.get_name() != self.get_name()]
-        )
+        return self.model.get_random_peer(self)
 
     def get_preference(self):
         return self.preferences
@@ -241,11 +324,11 @@ class ArgumentAgent(CommunicatingAgent):
     def generate_random_preferences(self, list_items=None):
         if list_items is None or len(list_items) == 0:
             list_items = [
-                Item("Engine 1"),
-                Item("Engine 2"),
-                Item("Engine 3"),
-                Item("Engine 4"),
-                Item("Engine 5"),
+                DEFAULT_CATALOG.get_or_create("Engine 1"),
+                DEFAULT_CATALOG.get_or_create("Engine 2"),
+                DEFAULT_CATALOG.get_or_create("Engine 3"),
+                DEFAULT_CATALOG.get_or_create("Engine 4"),
+                DEFAULT_CATALOG.get_or_create("Engine 5"),
             ]
 
         list_criteria = [
@@ -265,7 +348,7 @@ class ArgumentAgent(CommunicatingAgent):
         ]
 
         # Select random subsets of criteria
-        criteria_subset = rd.sample(list_criteria, rd.randint(1, len(list_criteria)))
+        criteria_subset = self.random.sample(list_criteria, self.random.randint(1, len(list_criteria)))
 
         agent_pref = Preferences()
         agent_pref.set_criterion_name_list(criteria_subset)
@@ -273,7 +356,7 @@ class ArgumentAgent(CommunicatingAgent):
         for item in list_items:
             # Add a random value for each criterion
             for criterion_name in criteria_subset:
-                agent_pref.add_criterion_value(CriterionValue(item, criterion_name, rd.choice(values_list)))
+                agent_pref.add_criterion_value(CriterionValue(item, criterion_name, self.random.choice(values_list)))
 
         self.preferences = agent_pref
 
@@ -288,10 +371,11 @@ class ArgumentAgent(CommunicatingAgent):
         arg_list = []
 
         # iterate through all criteria (ordered by importance)
+        vocabulary = self.preferences.get_vocabulary()
         criterion_name_list = self.preferences.get_criterion_name_list()
         for i, crit_name in enumerate(criterion_name_list):
-            value = self.preferences.get_value(item, crit_name)
-            if value in [Value.VERY_GOOD, Value.GOOD]:
+            value = self.preferences.get_known_value(item, crit_name)
+            if vocabulary.is_good(value):
                 # add arg of type ARGUE(E <= Environment Impact=Very Good)
                 arg = Argument(True, item)
                 arg.add_premise_couple_values(crit_name, value)
@@ -315,10 +399,11 @@ class ArgumentAgent(CommunicatingAgent):
         arg_list = []
 
         # iterate through all criteria (ordered by importance)
+        vocabulary = self.preferences.get_vocabulary()
         criterion_name_list = self.preferences.get_criterion_name_list()
         for i, crit_name in enumerate(criterion_name_list):
-            value = self.preferences.get_value(item, crit_name)
-            if value in [Value.VERY_BAD, Value.BAD]:
+            value = self.preferences.get_known_value(item, crit_name)
+            if vocabulary.is_bad(value):
                 # add arg of type ARGUE(not E <= Environment Impact=Very Bad)
                 arg = Argument(False, item)
                 arg.add_premise_couple_values(crit_name, value)
@@ -341,9 +426,7 @@ class ArgumentAgent(CommunicatingAgent):
         """
         arg_list = self.List_supporting_proposal(item)
         if len(arg_list) == 0:
-            self.logger.debug(
-                f"Agent {self.get_name()} received ASK_WHY message but has no arguments to support {item}"
-            )
+            self.trace(EventType.NO_ARGUMENT, item=item, cause=MessagePerformative.ASK_WHY)
             self.no_args_items.append(item)
             return None
         return arg_list[0]
@@ -359,15 +442,17 @@ class ArgumentAgent(CommunicatingAgent):
         """Returns a counter argument such as:
         1. the agent has a better alternative on the same criterion or a more important criterion
         2. the agent thinks badly of this item on the same or a more important criterion
+        The values unknown to the agent are neither good, bad nor better.
         """
         item, decision = argument.get_conclusion()
         criterion, prev_worst_criterion = argument.get_comparison()
         criterion, x = argument.get_couple_value()
 
         if criterion not in self.preferences.get_criterion_name_list():
-            self.logger.debug(f"Received an argument with a criterion not in the agent's preferences: {criterion}")
+            self.trace(EventType.UNKNOWN_CRITERION, item=item, argument=argument, cause=MessagePerformative.ARGUE)
             return None
 
+        vocabulary = self.preferences.get_vocabulary()
         if decision is True:  # received PRO argument
             # iterate through better criteria (assume agents have same criteria)
             for better_criterion in self.preferences.get_preferred_criteria(criterion):
@@ -375,34 +460,32 @@ class ArgumentAgent(CommunicatingAgent):
                     prev_worst_criterion != better_criterion
                 ):  # TODO try to avoid loop by giving the same previously rejected criterion
                     # has bad evaluation on more important criterion
-                    y = self.preferences.get_value(item, better_criterion)
-                    if y in [
-                        Value.VERY_BAD,
-                        Value.BAD,
-                    ]:  # TODO: could be replaced with y < x
+                    y = self.preferences.get_known_value(item, better_criterion)
+                    if vocabulary.is_bad(y):  # TODO: could be replaced with y < x
                         arg = Argument(False, item)
                         arg.add_premise_couple_values(better_criterion, y)
                         arg.add_premise_comparison(better_criterion, criterion)
-                        if arg not in global_arguments_dict[item]:
+                        if arg not in self.conversation.used_arguments[item]:
                             return arg  # argue(not oi, cj = y with y is worst than x, cj > ci)
 
             # check for better alternative on same criterion
-            for alternative in self.preferences.get_item_list():
-                y = self.preferences.get_value(alternative, criterion)
+            if self.model.pareto_alternatives:
+                alternatives = self.preferences.get_pareto_front()
+            else:
+                alternatives = self.preferences.get_item_list()
+            for alternative in alternatives:
+                y = self.preferences.get_known_value(alternative, criterion)
                 if alternative != item and y and y.value > x.value:
                     arg = Argument(True, alternative)  # TODO: Argument(False, item) ??
                     arg.add_premise_couple_values(criterion, y)
-                    if arg not in global_arguments_dict[item]:
+                    if arg not in self.conversation.used_arguments[item]:
                         return arg  # argue(oj , ci = y, y is better than x) TODO: handle counter argument of this case
 
             # check for bad evaluation on same criterion
-            if self.preferences.get_value(item, criterion) in [
-                Value.VERY_BAD,
-                Value.BAD,
-            ]:
+            if vocabulary.is_bad(self.preferences.get_known_value(item, criterion)):
                 arg = Argument(False, item)
-                arg.add_premise_couple_values(criterion, self.preferences.get_value(item, criterion))
-                if arg not in global_arguments_dict[item]:
+                arg.add_premise_couple_values(criterion, self.preferences.get_known_value(item, criterion))
+                if arg not in self.conversation.used_arguments[item]:
                     return arg  # argue(not oi, ci = y, y is worst than x)
         else:  # received CON argument
             # TODO: problem: not agreeing on evaluations/preferences can lead to loops
@@ -413,15 +496,12 @@ class ArgumentAgent(CommunicatingAgent):
                     prev_worst_criterion != better_criterion
                 ):  # TODO try to avoid loop by giving the same previously rejected criterion
                     # has good evaluation on more important criterion
-                    y = self.preferences.get_value(item, better_criterion)
-                    if y in [
-                        Value.VERY_GOOD,
-                        Value.GOOD,
-                    ]:
+                    y = self.preferences.get_known_value(item, better_criterion)
+                    if vocabulary.is_good(y):
                         arg = Argument(True, item)
                         arg.add_premise_couple_values(better_criterion, y)
                         arg.add_premise_comparison(better_criterion, criterion)
-                        if arg not in global_arguments_dict[item]:
+                        if arg not in self.conversation.used_arguments[item]:
                             return arg  # argue(oi, cj = y with y is better than x, cj > ci)
 
             # check for better alternative on same criterion
@@ -430,43 +510,70 @@ class ArgumentAgent(CommunicatingAgent):
             #     if alternative != item and y and y.value > x.value:
             #         arg = Argument(True, item)
             #         arg.add_premise_couple_values(criterion, y)
-            #         if arg not in global_arguments_dict[item]:
+            #         if arg not in self.conversation.used_arguments[item]:
             #             return arg  # argue(oj , ci = y, y is better than x)
 
             # check for good evaluation on same criterion
-            if self.preferences.get_value(item, criterion) in [
-                Value.VERY_GOOD,
-                Value.GOOD,
-            ]:
+            if vocabulary.is_good(self.preferences.get_known_value(item, criterion)):
                 arg = Argument(True, item)
-                arg.add_premise_couple_values(criterion, self.preferences.get_value(item, criterion))
-                if arg not in global_arguments_dict[item]:
+                arg.add_premise_couple_values(criterion, self.preferences.get_known_value(item, criterion))
+                if arg not in self.conversation.used_arguments[item]:
                     return arg  # argue(oi, ci = y, y is better than x)
 
 
 class ArgumentModel(Model):
     """ArgumentModel which inherit from Model."""
 
-    def __init__(self, agents_prefs=None, agent_names=None):
-        global global_arguments_dict
-        self.schedule = BaseScheduler(self)  # RandomActivation(self)
+    def __init__(
+        self,
+        agents_prefs=None,
+        agent_names=None,
+        scheduler_cls=BaseScheduler,
+        max_steps=100,
+        detect_cycles=True,
+        seed=None,
+        tracer=None,
+        pareto_proposals=False,
+        pareto_alternatives=False,
+        conversations=None,
+        contacts=None,
+        agent_loggers=True,
+    ):
+        """Creates a new ArgumentModel.
+        scheduler_cls: BaseScheduler steps every agent at each tick, ActivityScheduler only the agents with pending work
+        max_steps: step budget after which the negotiation is stopped
+        detect_cycles: stops the negotiation as soon as a conversation state repeats itself, only with two
+        agents or conversations, as a repeated state does not repeat random targets
+        seed: seed of the model random number generator
+        tracer: Tracer receiving the events of the negotiation, disabled by default
+        pareto_proposals: agents only propose items of their Pareto front (not dominated on their criteria)
+        pareto_alternatives: agents only counter arguments with better alternatives of their Pareto front
+        conversations: (agent name, agent name) pairs negotiating at once, conversation k being the negotiation
+        of pair k, with its own copies of the preferences of both agents. Every agent must be in a conversation
+        (a ValueError is raised otherwise). If None, the agents negotiate in a single conversation with targets
+        drawn at random.
+        contacts: sparse contact graph mapping agent names to the names of the agents they can propose to in the
+        default conversation. Every agent must have contacts, all of them agents of the model (a ValueError is
+        raised otherwise). If None, targets are drawn among all the other agents.
+        agent_loggers: adds a colored console handler to the logger of each agent, to disable for large
+        populations (with thousands of agents, prefer conversations, an ActivityScheduler and a LoggingTracer).
+        """
+        if seed is not None:
+            self.reset_randomizer(seed)
+        self.schedule = scheduler_cls(self)
+        self.tracer = tracer if tracer is not None else Tracer()
         self.agents = []
 
         MessageService.clear_instance()  # clears old MessageService singleton
         self.__messages_service = MessageService(self.schedule)
 
-        # clear global_arguments_dict
-        global_arguments_dict = defaultdict(list)
-
-        available_colors = [
-            colorama.Fore.YELLOW,
-            colorama.Fore.BLUE,
-            colorama.Fore.MAGENTA,
-            colorama.Fore.CYAN,
-            colorama.Fore.WHITE,
-            colorama.Fore.RED,
-            colorama.Fore.GREEN,
-        ]
+        self.used_arguments = defaultdict(list)  # arguments used in the default conversation, by item
+        self.conversations = conversations
+        self.contacts = contacts
+
+        # colors are reused when there are more agents than colors
+        n_agents = len(agents_prefs) if agents_prefs else 2
+        available_colors = [LOG_COLORS[i % len(LOG_COLORS)] if agent_loggers else None for i in range(n_agents)]
 
         if agents_prefs is None or len(agents_prefs) == 0:
             for i, agent_name in enumerate(["Bob", "Alice"]):
@@ -488,22 +595,261 @@ class ArgumentModel(Model):
                 self.schedule.add(a)
         self.running = True
         self.step_count = 0
+        self.max_steps = max_steps
+        self.detect_cycles = detect_cycles
+        self.pareto_proposals = pareto_proposals
+        self.pareto_alternatives = pareto_alternatives
+        self.outcome = None  # why the negotiation stopped: OUTCOME_FINISHED, OUTCOME_CYCLE or OUTCOME_MAX_STEPS
+        self.__seen_states = set()
+        self.__index_agents()
+        self.__open_conversations()
+
+    def __index_agents(self):
+        """Indexes the positions of the agents by name, for lookups and peer draws in constant time, and checks
+        that the contact graph only leads to agents of the model."""
+        self.__agent_positions = {}
+        for position, agent in enumerate(self.agents):
+            self.__agent_positions.setdefault(agent.get_name(), position)
+        if self.contacts is not None:
+            lonely_names = [agent.get_name() for agent in self.agents if not self.contacts.get(agent.get_name())]
+            if lonely_names:
+                raise ValueError(f"Agents {lonely_names} have no contacts")
+            unknown_names = sorted(
+                {name for names in self.contacts.values() for name in names} - self.__agent_positions.keys()
+            )
+            if unknown_names:
+                raise ValueError(f"No agents named {unknown_names}")
+
+    def __open_conversations(self):
+        """Opens the conversations of the model in its agents, with copies of their preferences."""
+        self.conversation_outcomes = []  # why each conversation stopped, None while it goes on
+        self.__participants = []  # the (agent, conversation) pairs of each conversation
+        self.__conversation_seen_states = []
+        self.__open_conversation_ids = list(range(len(self.conversations or ())))
+        for conversation_id, names in enumerate(self.conversations or ()):
+            agents = [self.get_agent(name) for name in names]
+            used_arguments = defaultdict(list)
+            participants = []
+            for agent, partner in zip(agents, agents[::-1]):
+                preferences = copy.deepcopy(agent.preferences)
+                conversation = Conversation(conversation_id, partner.get_name(), preferences, used_arguments)
+                agent.open_conversation(conversation)
+                participants.append((agent, conversation))
+            self.conversation_outcomes.append(None)
+            self.__participants.append(participants)
+            self.__conversation_seen_states.append(set())
+        if self.conversations is not None:
+            # the messages of an agent out of the conversations would have no conversation to be read in
+            lonely_names = [agent.get_name() for agent in self.agents if not agent.conversations]
+            if lonely_names:
+                raise ValueError(f"Agents {lonely_names} are in no conversation")
+
+    def reset(self, agents_prefs, agent_names=None, seed=None, conversations=None):
+        """Reinitialises the model and its agents in place for a new negotiation, as a new
+        ArgumentModel(agents_prefs, agent_names, seed=seed, conversations=conversations) with the same options
+        would start, so that the same objects can be reused for many negotiations.
+        Without new conversations, the agents of the conversations of the model are renamed with them, as the
+        agents of its contact graph.
+        """
+        if len(agents_prefs) != len(self.agents):
+            raise ValueError(f"Expected preferences for {len(self.agents)} agents, got {len(agents_prefs)}")
+        if conversations is None and self.conversations is not None:
+            positions = [[self.__agent_positions[name] for name in names] for names in self.conversations]
+        if self.contacts is not None:
+            contact_positions = {
+                self.__agent_positions[name]: [self.__agent_positions[contact] for contact in contacts]
+                for name, contacts in self.contacts.items()
+                if name in self.__agent_positions
+            }
+        self._seed = seed
+        self._seed_sequence = None
+        self.random.seed(get_random_seed(seed))
+        if hasattr(self.schedule, "reset"):
+            self.schedule.reset()
+        else:
+            self.schedule.steps = 0
+            self.schedule.time = 0
+        self.__messages_service.reset()
+        self.used_arguments = defaultdict(list)
+
+        agents_prefs = copy.deepcopy(agents_prefs)
+        for i, (agent, preferences) in enumerate(zip(self.agents, agents_prefs)):
+            if agent_names is None or len(agent_names) == 0:
+                agent_name = f"A{i+1}"
+            else:
+                agent_name = agent_names[i]
+            agent.reset(preferences, agent_name)
+        if conversations is not None:
+            self.conversations = conversations
+        elif self.conversations is not None:
+            self.conversations = [tuple(self.agents[k].get_name() for k in pair) for pair in positions]
+        if self.contacts is not None:
+            self.contacts = {
+                self.agents[position].get_name(): [self.agents[k].get_name() for k in contacts]
+                for position, contacts in contact_positions.items()
+            }
+        self.running = True
+        self.step_count = 0
+        self.outcome = None
+        self.__seen_states = set()
+        self.__index_agents()
+        self.__open_conversations()
 
     def step(self):
         self.__messages_service.dispatch_messages()
         self.schedule.step()
         self.step_count += 1
-        if all(agent.done_negotiating for agent in self.agents):
-            self.running = False
-        if self.step_count == 100:
-            self.running = False
+        if self.conversations is not None:
+            self.__close_conversations()
+        # the agents of an open conversation are not all finished
+        if (not self.__open_conversation_ids and all(agent.is_finished() for agent in self.agents)) or (
+            isinstance(self.schedule, ActivityScheduler) and self.schedule.is_idle()
+        ):
+            self.stop(OUTCOME_FINISHED)
+        elif self.step_count >= self.max_steps:
+            self.stop(OUTCOME_MAX_STEPS)
+        elif self.detect_cycles and self.conversations is None and len(self.agents) <= 2:
+            state = self.get_conversation_state()
+            if state in self.__seen_states:
+                self.stop(OUTCOME_CYCLE)
+            elif len(self.__seen_states) < MAX_CYCLE_STATES:
+                self.__seen_states.add(state)
+
+    def stop(self, outcome):
+        self.running = False
+        self.outcome = outcome
+        for conversation_id, conversation_outcome in enumerate(self.conversation_outcomes):
+            if conversation_outcome is None:
+                self.conversation_outcomes[conversation_id] = outcome
+
+    def __close_conversations(self):
+        """Closes the conversations in which both agents are done, or whose state repeats itself, as the model
+        stops a single negotiation. Only the open conversations are visited."""
+        open_conversation_ids = []
+        for conversation_id in self.__open_conversation_ids:
+            participants = self.__participants[conversation_id]
+            outcome = None
+            if all(conversation.done_negotiating for _, conversation in participants):
+                outcome = OUTCOME_FINISHED
+            elif self.detect_cycles and self.step_count < self.max_steps:
+                state = self.get_conversation_state(conversation_id)
+                seen_states = self.__conversation_seen_states[conversation_id]
+                if state in seen_states:
+                    outcome = OUTCOME_CYCLE
+                elif len(seen_states) < MAX_CYCLE_STATES:
+                    seen_states.add(state)
+            if outcome is not None:
+                self.conversation_outcomes[conversation_id] = outcome
+                for _, conversation in participants:
+                    conversation.closed = True
+            else:
+                open_conversation_ids.append(conversation_id)
+        self.__open_conversation_ids = open_conversation_ids
+
+    def get_agent(self, name):
+        """Returns the agent of a given name, raises a ValueError if there is none."""
+        position = self.__agent_positions.get(name)
+        if position is None:
+            raise ValueError(f"No agent named {name}")
+        return self.agents[position]
+
+    def get_random_peer(self, agent):
+        """Returns an agent drawn at random among the contacts of a given agent, or among all the other agents
+        if the model has no contact graph, in constant time."""
+        if self.contacts is not None:
+            return self.get_agent(self.random.choice(self.contacts[agent.get_name()]))
+        # same draw as random.choice over the other agents, without building their list
+        position = self.__agent_positions[agent.get_name()]
+        k = self.random.randrange(len(self.agents) - 1)
+        return self.agents[k + 1 if k >= position else k]
+
+    def add_items(self, criterion_values):
+        """Adds items while the agents negotiate: criterion_values maps agent names to the criterion values of
+        the items arriving for them, added in bulk with Preferences.add_items. The agents still negotiating
+        consider the new items from their next proposal, in each of their conversations."""
+        for name, agent_criterion_values in criterion_values.items():
+            agent = self.get_agent(name)
+            agent_criterion_values = list(agent_criterion_values)
+            for conversation in [agent.conversation] + agent.conversations:
+                conversation.preferences.add_items(agent_criterion_values)
+
+    def remove_items(self, items, agent_names=None):
+        """Removes items leaving while the agents negotiate from the preferences of the agents knowing them
+        (of the given agents only if agent_names is given). Items of pending messages must not be removed."""
+        agents = self.agents if agent_names is None else [self.get_agent(name) for name in agent_names]
+        for agent in agents:
+            for conversation in [agent.conversation] + agent.conversations:
+                for item in items:
+                    if item in conversation.preferences.get_item_list():
+                        conversation.preferences.remove_item(item)
+
+    def get_conversation_state(self, conversation_id=None):
+        """Returns a hashable snapshot of everything the rest of the negotiation depends on:
+        pending messages (proposals and arguments), remaining items, items without arguments and used arguments.
+        The protocol being deterministic, the negotiation of two agents loops forever once a state repeats itself
+        (with more agents, targets drawn at random can still break the loop).
+        With a conversation id, returns the snapshot of this conversation of the model.
+        """
+        if conversation_id is not None:
+            participants = self.__participants[conversation_id]
+            agents_state = tuple(
+                conversation.get_state()
+                + (
+                    tuple(
+                        (message.get_exp(), message.get_performative(), tuple(message.get_content()))
+                        for message in agent.peek_new_messages(conversation_id)
+                    ),
+                )
+                for agent, conversation in participants
+            )
+            used_arguments = participants[0][1].used_arguments
+            return agents_state, sum(len(set(arguments)) for arguments in used_arguments.values())
+        agents_state = tuple(
+            (
+                agent.done_negotiating,
+                tuple(agent.preferences.get_item_list()),
+                frozenset(agent.no_args_items),
+                tuple(
+                    (message.get_exp(), message.get_dest(), message.get_performative(), tuple(message.get_content()))
+                    for message in agent.peek_new_messages()
+                ),
+            )
+            for agent in self.agents
+        )
+        # arguments are only ever added to used_arguments, so counting them tells whether it changed
+        n_used_arguments = sum(len(set(arguments)) for arguments in self.used_arguments.values())
+        return agents_state, n_used_arguments
 
     def get_message_history(self):
+        import pandas as pd  # only needed to build the DataFrame
+
         history = self.__messages_service.get_message_history()
         return pd.DataFrame(history)
 
+    def get_conversation_results(self):
+        """Returns the results of the conversations of the model, by conversation id."""
+        histories = [[] for _ in self.conversation_outcomes]
+        for message in self.__messages_service.get_message_history():
+            conversation_id = message.get("conversation_id")
+            if conversation_id is not None:
+                histories[conversation_id].append(message)
+        return [self.__get_history_result(history) for history in histories]
+
     def get_final_result(self):
+        """Returns the result of the negotiation and the message history as a DataFrame."""
+        return self.get_result(), self.get_message_history()
+
+    def get_result(self, conversation_id=None):
+        """Returns the result of the negotiation (None if there is no winner), without building the history.
+        With a conversation id, returns the result of this conversation of the model."""
         history = self.__messages_service.get_message_history()
+        if conversation_id is not None:
+            history = [message for message in history if message.get("conversation_id") == conversation_id]
+        return self.__get_history_result(history)
+
+    @staticmethod
+    def __get_history_result(history):
+        """Returns the result of a negotiation from its message history."""
         results = {}
         for i in range(len(history) - 1, -1, -1):
             if history[i]["performative"] == MessagePerformative.ACCEPT:
@@ -517,12 +863,12 @@ class ArgumentModel(Model):
                         "value": history[i - 1]["value"],
                         "secondary_criterion": history[i - 1]["secondary_criterion"],
                     }
-                    return results, pd.DataFrame(history)
+                    return results
                 results["winning_argument"] = {
                     "item": history[i - 1]["item"],
                     "decision": "top_10_percent",
                 }
-                return results, pd.DataFrame(history)
+                return results
             elif history[i]["performative"] == MessagePerformative.REJECT:
                 results["winning_agent"] = history[i]["receiver"]
                 results["winning_item"] = None
@@ -534,8 +880,8 @@ class ArgumentModel(Model):
                         "value": history[i - 1]["value"],
                         "secondary_criterion": history[i - 1]["secondary_criterion"],
                     }
-                    return results, pd.DataFrame(history)
-        return None, pd.DataFrame(history)
+                    return results
+        return None
 
 
 def format_argument(arg):
@@ -549,33 +895,95 @@ def format_argument(arg):
     return s
 
 
-def generate_pref_df(n_items=2, n_crit=len(CriterionName), n_values=len(Value), drop_prefs=False):
+def get_generated_vocabulary(n_crit, n_values):
+    """Returns the vocabulary of generated preferences: the preset one if it has enough criteria and values,
+    else a registered vocabulary of n_crit criteria CRITERION_k and n_values values VALUE_k."""
+    if n_crit <= DEFAULT_VOCABULARY.get_criteria_count() and n_values <= DEFAULT_VOCABULARY.get_values_count():
+        return DEFAULT_VOCABULARY
+    return Vocabulary.get_or_create(
+        f"generated_{n_crit}_{n_values}",
+        [f"CRITERION_{k}" for k in range(n_crit)],
+        [f"VALUE_{k}" for k in range(n_values)],
+    )
+
+
+def generate_pref_df(
+    n_items=2, n_crit=len(CriterionName), n_values=len(Value), drop_prefs=False, rng=None, missing_rate=0.0
+):
+    """Generates random preferences as a DataFrame of values, with items as rows and criteria as columns.
+    rng: numpy Generator, or seed of one (int or SeedSequence), uses the global numpy random state if None
+    missing_rate: probability of each value to be unknown (NaN)
+    """
+    import numpy as np
+    import pandas as pd
+
+    if rng is None:
+        rng = np.random  # the global random state functions, named as the methods of a Generator
+        integers = np.random.randint
+    else:
+        rng = np.random.default_rng(rng)
+        integers = rng.integers
+
     # generate preferences
-    df = pd.DataFrame(np.random.randint(0, n_values, size=(n_items, n_crit)))
+    df = pd.DataFrame(integers(0, n_values, size=(n_items, n_crit)))
     # shuffle agent criteria preference order
-    df.columns = np.random.permutation(df.columns)
+    df.columns = rng.permutation(df.columns)
     # drop random number of preferences
     if drop_prefs:
-        df = df.drop(columns=np.random.choice(df.columns, size=np.random.randint(0, len(df.columns)), replace=False))
+        df = df.drop(columns=rng.choice(df.columns, size=integers(0, len(df.columns)), replace=False))
+    if missing_rate > 0:
+        df = df.mask(rng.random(size=df.shape) < missing_rate)
     return df
 
 
-def generate_preferences(n_items=2, n_crit=len(CriterionName), n_values=len(Value), drop_prefs=False):
-    df = generate_pref_df(n_items=n_items, n_crit=n_crit, n_values=n_values, drop_prefs=drop_prefs)
+def generate_preferences(
+    n_items=2,
+    n_crit=len(CriterionName),
+    n_values=len(Value),
+    drop_prefs=False,
+    rng=None,
+    vocabulary=None,
+    missing_rate=0.0,
+    catalog=DEFAULT_CATALOG,
+):
+    """Generates random preferences, returned with their DataFrame.
+    rng: numpy Generator, or seed of one (int or SeedSequence), uses the global random states if None
+    vocabulary: Vocabulary with at least n_crit criteria and n_values values, see get_generated_vocabulary if None
+    missing_rate: probability of each value to be unknown, the preferences only store the known ones
+    catalog: ItemCatalog interning the items item1, item2, ...
+    """
+    if vocabulary is None:
+        vocabulary = get_generated_vocabulary(n_crit, n_values)
+    if rng is not None:
+        import numpy as np
+
+        rng = np.random.default_rng(rng)
+    df = generate_pref_df(
+        n_items=n_items, n_crit=n_crit, n_values=n_values, drop_prefs=drop_prefs, rng=rng, missing_rate=missing_rate
+    )
     list_criteria = []
     criteria_values = []
     for i, row in df.iterrows():
-        for j, val in row.iteritems():
-            list_criteria.append(CriterionName(j))
-            criteria_values.append(CriterionValue(Item(f"item{i+1}"), CriterionName(j), Value(val)))
-            df.rename(columns={j: CriterionName(j).name}, inplace=True)
-        df.rename(index={i: Item(f"item{i+1}")}, inplace=True)
-
-    rd.shuffle(criteria_values)  # avoid order bias on items for arguments
-    return Preferences(list_criteria, criteria_values), df
+        item = catalog.get_or_create(f"item{i+1}")
+        for j, val in row.items():
+            criterion = vocabulary.get_criterion(j)
+            list_criteria.append(criterion)
+            if val == val:  # NaN for unknown values
+                criteria_values.append(CriterionValue(item, criterion, vocabulary.get_value(int(val))))
+            df.rename(columns={j: criterion.name}, inplace=True)
+        df.rename(index={i: item}, inplace=True)
+
+    # avoid order bias on items for arguments
+    if rng is None:
+        rd.shuffle(criteria_values)
+    else:
+        criteria_values = [criteria_values[k] for k in rng.permutation(len(criteria_values))]
+    return Preferences(list_criteria, criteria_values, vocabulary), df
 
 
 if __name__ == "__main__":
+    import colorama
+
     colorama.init()  # used to print colored text on Windows
     logging.basicConfig(level=logging.DEBUG)  # DEBUG, INFO, WARNING, ERROR
     logging.root.handlers = []
@@ -591,7 +999,7 @@ if __name__ == "__main__":
     print(df2)
     print("-" * 100)
 
-    argument_model = ArgumentModel([prefs_1, prefs_2])
+    argument_model = ArgumentModel([prefs_1, prefs_2], tracer=LoggingTracer())
     argument_model.run_model()
 
     results, history = argument_model.get_final_result()
@@ -0,0 +1,25 @@
+import pickle
+import unittest
+
+from communication.arguments.Argument import Argument
+from communication.preferences.CriterionName import CriterionName
+from communication.preferences.Item import Item
+from communication.preferences.Value import Value
+
+
+class TestArgument(unittest.TestCase):
+    def test_pickle(self):
+        """test pickling arguments"""
+        argument = Argument(False, Item("item1"))
+        argument.add_premise_couple_values(CriterionName.DURABILITY, Value.VERY_BAD)
+        argument.add_premise_comparison(CriterionName.DURABILITY, CriterionName.NOISE)
+
+        restored_argument = pickle.loads(pickle.dumps(argument))
+        self.assertEqual(restored_argument, argument)
+        self.assertEqual(hash(restored_argument), hash(argument))
+        self.assertEqual(restored_argument.get_comparison(), (CriterionName.DURABILITY, CriterionName.NOISE))
+        self.assertEqual(restored_argument.get_couple_value(), (CriterionName.DURABILITY, Value.VERY_BAD))
+
+
+if __name__ == "__main__":
+    unittest.main()
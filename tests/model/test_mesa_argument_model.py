@@ -0,0 +1,45 @@
+import random
+import unittest
+
+import mesa
+import numpy as np
+
+from communication.model.MesaArgumentModel import MesaArgumentModel
+from communication.scheduler.BaseScheduler import BaseScheduler
+from pw_argumentation import ArgumentModel, generate_preferences
+
+
+class TestMesaArgumentModel(unittest.TestCase):
+    def setUp(self):
+        random.seed(0)
+        np.random.seed(0)
+
+    def test_same_negotiation(self):
+        for _ in range(20):
+            agents_prefs = [generate_preferences(n_items=6)[0] for _ in range(2)]
+            argument_model = ArgumentModel(agents_prefs, seed=0)
+            argument_model.run_model()
+            mesa_model = MesaArgumentModel(agents_prefs, seed=0)
+            mesa_model.run_model()
+
+            self.assertIsInstance(mesa_model, mesa.Model)
+            self.assertIsInstance(mesa_model.schedule, mesa.time.BaseScheduler)
+            self.assertNotIsInstance(argument_model.schedule, mesa.time.BaseScheduler)
+            self.assertIsInstance(argument_model.schedule, BaseScheduler)
+            self.assertEqual(mesa_model.step_count, argument_model.step_count)
+            self.assertTrue(mesa_model.get_message_history().equals(argument_model.get_message_history()))
+
+    def test_data_collector(self):
+        mesa_model = MesaArgumentModel([generate_preferences(n_items=4)[0] for _ in range(2)])
+        mesa_model.datacollector = mesa.DataCollector(
+            model_reporters={"messages": lambda model: len(model.get_message_history())},
+            agent_reporters={"done": "done_negotiating"},
+        )
+        while mesa_model.running:
+            mesa_model.step()
+            mesa_model.datacollector.collect(mesa_model)
+        self.assertEqual(len(mesa_model.datacollector.get_model_vars_dataframe()), mesa_model.step_count)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,31 @@
+import unittest
+
+import numpy as np
+
+from communication.model.Model import Model
+
+
+class TestModel(unittest.TestCase):
+    def test_seed(self):
+        self.assertEqual(Model(seed=1).random.random(), Model(seed=1).random.random())
+        model = Model(seed=np.random.SeedSequence(1))
+        self.assertEqual(model.random.random(), Model(seed=np.random.SeedSequence(1)).random.random())
+        model.reset_randomizer()
+        self.assertEqual(model.random.random(), Model(seed=np.random.SeedSequence(1)).random.random())
+
+    def test_spawn_seeds(self):
+        seeds = Model(seed=1).spawn_seeds(3)
+        self.assertEqual([seed.generate_state(1)[0] for seed in seeds], [
+            seed.generate_state(1)[0] for seed in np.random.SeedSequence(1).spawn(3)
+        ])
+        model = Model(seed=1)
+        model.spawn_seeds(2)
+        self.assertEqual(model.spawn_seeds(1)[0].spawn_key, seeds[2].spawn_key)
+
+        seed_sequence = np.random.SeedSequence(1)
+        Model(seed=seed_sequence).spawn_seeds(2)
+        self.assertEqual(seed_sequence.n_children_spawned, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
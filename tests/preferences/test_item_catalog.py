@@ -0,0 +1,55 @@
+import copy
+import pickle
+import unittest
+
+from communication.preferences.Item import Item
+from communication.preferences.ItemCatalog import DEFAULT_CATALOG, ItemCatalog
+from pw_argumentation import generate_preferences
+
+
+class TestItemCatalog(unittest.TestCase):
+    def test_interning(self):
+        catalog = ItemCatalog.get_or_create_catalog("test_interning")
+        engine = catalog.get_or_create("Engine", "A super cool engine")
+        self.assertIs(catalog.get_or_create("Engine", "Another description"), engine)
+        self.assertEqual(engine.get_description(), "A super cool engine")
+        other = catalog.get_or_create("Other engine")
+        self.assertEqual((engine.get_id(), other.get_id()), (0, 1))
+        self.assertIs(catalog.get_item(1), other)
+        self.assertIs(catalog.get_item_by_name("Engine"), engine)
+        self.assertEqual(catalog.get_ids([other, "Engine"]), [1, 0])
+        self.assertIn("Engine", catalog)
+        self.assertEqual(len(catalog), 2)
+        with self.assertRaises(ValueError):
+            ItemCatalog("test_interning")
+
+    def test_equality(self):
+        catalog = ItemCatalog.get_or_create_catalog("test_equality")
+        engine = catalog.get_or_create("Engine")
+        self.assertEqual(engine, Item("Engine"))
+        self.assertEqual(engine, "Engine")
+        self.assertEqual(hash(engine), hash("Engine"))
+        self.assertNotEqual(engine, catalog.get_or_create("Other engine"))
+        self.assertIsNone(Item("Engine").get_id())
+
+    def test_pickle(self):
+        catalog = ItemCatalog.get_or_create_catalog("test_pickle")
+        engine = catalog.get_or_create("Engine", "A super cool engine")
+        self.assertIs(pickle.loads(pickle.dumps(engine)), engine)
+        self.assertIs(copy.deepcopy(engine), engine)
+        self.assertIs(pickle.loads(pickle.dumps(catalog)), catalog)
+        restored = pickle.loads(pickle.dumps(Item("Engine", "A plain engine")))
+        self.assertEqual(restored.get_description(), "A plain engine")
+        self.assertIsNone(restored.get_catalog())
+
+    def test_generate_preferences(self):
+        population = [generate_preferences(n_items=5)[0] for _ in range(2)]
+        items = [cv.get_item() for preferences in population for cv in preferences.get_criterion_value_list()]
+        self.assertEqual(len({id(item) for item in items}), 5)
+        self.assertTrue(all(item.get_catalog() is DEFAULT_CATALOG for item in items))
+        copied = copy.deepcopy(population[0])
+        self.assertIs(copied.get_item_list()[0], population[0].get_item_list()[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import random
+import unittest
+
+import numpy as np
+
+from communication.preferences.ParetoFront import ParetoFront
+from communication.tournament.BatchEvaluator import evaluate_duels
+from communication.tournament.DuelEvaluator import evaluate_duel
+from pw_argumentation import ArgumentModel, generate_preferences
+
+
+def get_brute_force_front(items, values):
+    """Returns the items not dominated by another one, by comparing all the pairs."""
+    return [
+        item
+        for item, row in zip(items, values)
+        if not any((other >= row).all() and (other > row).any() for other in values)
+    ]
+
+
+class TestParetoFront(unittest.TestCase):
+    def setUp(self):
+        random.seed(0)
+        np.random.seed(0)
+
+    def test_remove(self):
+        for _ in range(20):
+            n_items = random.randint(1, 30)
+            items = [f"item{k}" for k in range(n_items)]
+            values = np.random.randint(0, 3, size=(n_items, random.randint(1, 4)))
+            pareto_front = ParetoFront(items, values)
+            alive = list(range(n_items))
+            while alive:
+                self.assertEqual(
+                    pareto_front.get_items(), get_brute_force_front([items[k] for k in alive], values[alive])
+                )
+                k = alive.pop(random.randrange(len(alive)))
+                pareto_front.remove(items[k])
+
+    def test_add(self):
+        for _ in range(20):
+            n_criteria = random.randint(1, 4)
+            items = []
+            values = np.zeros((0, n_criteria), dtype=np.int64)
+            pareto_front = ParetoFront(items, values)
+            for batch in range(random.randint(1, 5)):
+                new_items = [f"item{batch}_{k}" for k in range(random.randint(0, 10))]
+                new_values = np.random.randint(0, 3, size=(len(new_items), n_criteria))
+                pareto_front.add(new_items, new_values)
+                items += new_items
+                values = np.concatenate([values, new_values])
+                self.assertEqual(pareto_front.get_items(), get_brute_force_front(items, values))
+
+    def test_preferences(self):
+        preferences = generate_preferences(n_items=20, n_values=3)[0]
+        items = list(preferences.get_item_list())
+        values = preferences.get_value_matrix(items)
+        self.assertEqual(preferences.get_pareto_front(), get_brute_force_front(items, values))
+        self.assertIn(preferences.most_preferred(), preferences.get_pareto_front())
+        removed = preferences.get_pareto_front()[0]
+        preferences.remove_item(removed)
+        alive = [k for k, item in enumerate(items) if item != removed]
+        self.assertEqual(preferences.get_pareto_front(), get_brute_force_front([items[k] for k in alive], values[alive]))
+
+    def test_matches_argument_model(self):
+        population = [generate_preferences(n_items=8)[0] for _ in range(8)]
+        pairings = [(i, j) for i in range(len(population)) for j in range(len(population)) if i != j]
+        agent_names = [f"A{i}" for i in range(len(population))]
+        for options in (
+            {"pareto_proposals": True},
+            {"pareto_alternatives": True},
+            {"pareto_proposals": True, "pareto_alternatives": True},
+        ):
+            batch_results = evaluate_duels(pairings, population, agent_names, **options)
+            for (i, j), batch_result in zip(pairings, batch_results):
+                names = [agent_names[i], agent_names[j]]
+                argument_model = ArgumentModel([population[i], population[j]], agent_names=names, **options)
+                argument_model.run_model()
+                result = argument_model.get_result()
+                self.assertEqual(evaluate_duel(population[i], population[j], names, **options), result)
+                self.assertEqual(batch_result, result)
+
+
+if __name__ == "__main__":
+    unittest.main()
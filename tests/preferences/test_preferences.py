@@ -1,3 +1,5 @@
+import copy
+import pickle
 import unittest
 from typing import Dict, List, Tuple
 
@@ -136,6 +138,89 @@ class TestPreferences(unittest.TestCase):
         self.assertTrue(agent_pref.is_item_among_top_x_percent(diesel_engine, 50))
         self.assertFalse(agent_pref.is_item_among_top_x_percent(electric_engine, 50))
 
+    def test_unknown_values(self):
+        """test the explicit unknown values of sparse preferences"""
+        diesel_engine = self.items["diesel_engine"]
+        petrol_engine = Item("Petrol Engine", "A quite classic engine")
+        agent_pref = self.agent_pref
+        agent_pref.add_criterion_value(CriterionValue(petrol_engine, CriterionName.NOISE, Value.GOOD))
+
+        self.assertIsNone(agent_pref.get_known_value(petrol_engine, CriterionName.DURABILITY))
+        self.assertRaises(Exception, agent_pref.get_value, petrol_engine, CriterionName.DURABILITY)
+        self.assertEqual(agent_pref.get_item_values(petrol_engine), [(CriterionName.NOISE, Value.GOOD)])
+        self.assertEqual(len(agent_pref.get_criterion_values(CriterionName.NOISE)), 3)
+        # unknown values are ranked below the worst value
+        self.assertEqual(agent_pref.most_preferred(), diesel_engine)
+
+        agent_pref.remove_item(petrol_engine)
+        self.assertIsNone(agent_pref.get_known_value(petrol_engine, CriterionName.NOISE))
+        self.assertEqual(len(agent_pref.get_criterion_values(CriterionName.NOISE)), 2)
+
+        # every value of a removed item becomes unknown, even the consecutive ones
+        electric_engine = self.items["electric_engine"]
+        agent_pref.remove_item(electric_engine)
+        self.assertEqual(agent_pref.get_item_values(electric_engine), [])
+        self.assertNotIn(electric_engine, [value.get_item() for value in agent_pref.get_criterion_value_list()])
+
+    def test_readd_item(self):
+        """test re-adding a removed item with new values"""
+        agent_pref = self.agent_pref
+        electric_engine = self.items["electric_engine"]
+        agent_pref.remove_item(electric_engine)
+        criteria = agent_pref.get_criterion_name_list()
+        agent_pref.add_items(CriterionValue(electric_engine, criterion, Value.VERY_GOOD) for criterion in criteria)
+        expected = [(criterion, Value.VERY_GOOD) for criterion in criteria]
+        self.assertEqual(agent_pref.get_item_values(electric_engine), expected)
+        criterion_values = agent_pref.get_criterion_value_list()
+        values = [value.get_value() for value in criterion_values if value.get_item() == electric_engine]
+        self.assertEqual(values, [Value.VERY_GOOD] * len(criteria))
+        self.assertEqual(agent_pref.most_preferred(), electric_engine)
+
+    def test_add_items(self):
+        """test adding items in bulk with incremental indexes"""
+        agent_pref = self.agent_pref
+        agent_pref.set_quantile_bins(2)
+        self.assertEqual(agent_pref.get_pareto_front(), list(self.items.values()))
+        self.assertTrue(agent_pref.is_item_among_top_x_percent(self.items["diesel_engine"], 50))
+        turbo_engine = Item("Turbo Engine", "A diesel engine, quieter")
+        values = {
+            CriterionName.PRODUCTION_COST: Value.VERY_GOOD,
+            CriterionName.CONSUMPTION: Value.GOOD,
+            CriterionName.DURABILITY: Value.VERY_GOOD,
+            CriterionName.ENVIRONMENT_IMPACT: Value.VERY_BAD,
+            CriterionName.NOISE: Value.GOOD,
+        }
+        agent_pref.add_items(CriterionValue(turbo_engine, criterion, value) for criterion, value in values.items())
+
+        self.assertEqual(agent_pref.get_item_list(), [*self.items.values(), turbo_engine])
+        self.assertEqual(agent_pref.get_value(turbo_engine, CriterionName.NOISE), Value.GOOD)
+        self.assertEqual(agent_pref.get_pareto_front(), [self.items["electric_engine"], turbo_engine])
+        self.assertEqual(len(agent_pref.get_quantile_sketch()), 3)
+        self.assertEqual(agent_pref.most_preferred(), turbo_engine)
+
+    def test_pickle(self):
+        """test pickling preferences"""
+        agent_pref = self.agent_pref
+        agent_pref.remove_item(self.items["electric_engine"])
+
+        for restored_pref in [pickle.loads(pickle.dumps(agent_pref)), copy.deepcopy(agent_pref)]:
+            self.assertEqual(restored_pref.get_criterion_name_list(), agent_pref.get_criterion_name_list())
+            self.assertEqual(restored_pref.get_item_list(), agent_pref.get_item_list())
+            self.assertEqual(
+                restored_pref.get_item_list()[0].get_description(), "A super cool diesel engine"
+            )
+            self.assertEqual(
+                [
+                    (value.get_item(), value.get_criterion_name(), value.get_value())
+                    for value in restored_pref.get_criterion_value_list()
+                ],
+                [
+                    (value.get_item(), value.get_criterion_name(), value.get_value())
+                    for value in agent_pref.get_criterion_value_list()
+                ],
+            )
+        self.assertNotIn(b"_CriterionValue__", pickle.dumps(agent_pref))
+
 
 if __name__ == "__main__":
     unittest.main()
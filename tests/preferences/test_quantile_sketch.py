@@ -0,0 +1,128 @@
+import pickle
+import random
+import unittest
+
+import numpy as np
+
+from communication.preferences.CriterionValue import CriterionValue
+from communication.preferences.CriterionName import CriterionName
+from communication.preferences.Item import Item
+from communication.preferences.Preferences import Preferences
+from communication.preferences.QuantileSketch import QuantileSketch
+from communication.preferences.Value import Value
+from communication.tournament.BatchEvaluator import evaluate_duels
+from communication.tournament.DuelEvaluator import evaluate_duel
+from pw_argumentation import ArgumentModel, generate_preferences
+
+
+def get_exact_top(scores, x):
+    """Returns whether each score is among the top x%, as Preferences.is_item_among_top_x_percent computes it."""
+    scores = np.asarray(scores)
+    n_top = int(len(scores) * x / 100)
+    if n_top == 0:
+        return np.zeros(len(scores), dtype=bool)
+    return scores >= np.sort(scores)[::-1][n_top - 1]
+
+
+class TestQuantileSketch(unittest.TestCase):
+    def setUp(self):
+        random.seed(0)
+        np.random.seed(0)
+
+    def assert_rank_error(self, sketch, scores, x, bound):
+        threshold = sketch.get_threshold(x)
+        approximate = np.array(scores) >= threshold if threshold is not None else False
+        errors = np.count_nonzero(get_exact_top(scores, x) != approximate)
+        self.assertLessEqual(errors, bound, f"top {x}% of {len(scores)} scores")
+
+    def test_error_bound(self):
+        for n_bins in (10, 20, 50):
+            scores = [random.random() for _ in range(1000)]
+            sketch = QuantileSketch(scores, n_bins)
+            n_built = len(scores)
+            for _ in range(500):
+                if random.random() < 0.5 and len(scores) > 100:
+                    score = scores.pop(random.randrange(len(scores)))
+                    sketch.remove(score)
+                else:
+                    score = random.random() ** 2 * 1.2 - 0.1
+                    scores.append(score)
+                    sketch.insert(score)
+                if sketch.needs_rebuild():
+                    sketch = QuantileSketch(scores, n_bins)
+                    n_built = len(scores)
+                self.assertEqual(len(sketch), len(scores))
+                for x in (1, 2, 5, 10, 25, 50, 90):
+                    self.assert_rank_error(sketch, scores, x, max(n_built, len(scores)) / n_bins + 0.5)
+
+    def test_top_bin(self):
+        scores = [random.random() for _ in range(1000)]
+        sketch = QuantileSketch(scores, 10)
+        for x in (1, 5, 10, 15):
+            self.assert_rank_error(sketch, scores, x, 50)
+
+    def test_lower_scores(self):
+        scores = [random.random() for _ in range(100)]
+        sketch = QuantileSketch(scores, 10)
+        for score in (-1.0, -2.0):
+            scores.append(score)
+            sketch.insert(score)
+        self.assertTrue(sketch.is_among_top_x_percent(-2.0, 100))
+        self.assert_rank_error(sketch, scores, 100, 0)
+        for x in (50, 90, 95):
+            self.assert_rank_error(sketch, scores, x, 100 / 10 + 0.5)
+
+    def test_ties(self):
+        scores = [(2, 0)] * 10 + [(1, 5)] * 85 + [(0, 0)] * 5
+        sketch = QuantileSketch(scores, 10)
+        self.assertTrue(sketch.is_among_top_x_percent((2, 0), 10))
+        self.assertFalse(sketch.is_among_top_x_percent((1, 5), 10))
+        self.assertTrue(sketch.is_among_top_x_percent((1, 5), 50))
+        self.assertFalse(sketch.is_among_top_x_percent((2, 0), 0))
+        self.assertFalse(QuantileSketch([], 10).is_among_top_x_percent(1.0, 100))
+
+    def test_preferences(self):
+        criteria = list(CriterionName)
+        items = [Item(f"item{k}") for k in range(500)]
+        preferences = Preferences(
+            criteria,
+            [CriterionValue(item, criterion, random.choice(list(Value))) for item in items for criterion in criteria],
+        )
+        exact = get_exact_top(preferences.get_scores(items), 10)
+        preferences.set_quantile_bins(50)
+        approximate = [preferences.is_item_among_top_x_percent(item, 10) for item in items]
+        self.assertLessEqual(np.count_nonzero(exact != approximate), len(items) / 50)
+        restored = pickle.loads(pickle.dumps(preferences))
+        self.assertEqual(restored.get_quantile_bins(), 50)
+        self.assertEqual([restored.is_item_among_top_x_percent(item, 10) for item in items], approximate)
+
+        for item in items[:150]:
+            preferences.remove_item(item)
+        best = Item("best", "")
+        for criterion_name in preferences.get_criterion_name_list():
+            preferences.add_criterion_value(CriterionValue(best, criterion_name, Value.VERY_GOOD))
+        self.assertEqual(len(preferences.get_quantile_sketch()), len(preferences.get_item_list()))
+        self.assertTrue(preferences.is_item_among_top_x_percent(best, 10))
+        remaining = preferences.get_item_list()
+        exact = get_exact_top(preferences.get_scores(remaining), 10)
+        approximate = [preferences.is_item_among_top_x_percent(item, 10) for item in remaining]
+        self.assertLessEqual(np.count_nonzero(exact != approximate), len(remaining) / 50 + 1)
+
+    def test_matches_argument_model(self):
+        population = [generate_preferences(n_items=12)[0] for _ in range(6)]
+        for preferences in population:
+            preferences.set_quantile_bins(3)
+        pairings = [(i, j) for i in range(len(population)) for j in range(len(population)) if i != j]
+        agent_names = [f"A{i}" for i in range(len(population))]
+        batch_results = evaluate_duels(pairings, population, agent_names)
+        for (i, j), batch_result in zip(pairings, batch_results):
+            names = [agent_names[i], agent_names[j]]
+            argument_model = ArgumentModel([population[i], population[j]], agent_names=names)
+            argument_model.run_model()
+            result = argument_model.get_result()
+            self.assertEqual(evaluate_duel(population[i], population[j], names), result)
+            self.assertEqual(batch_result, result)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import pickle
+import random
+import unittest
+
+import numpy as np
+
+from communication.preferences.ScoringStrategy import (
+    BordaScoring,
+    HalvingScoring,
+    LexicographicScoring,
+    WeightedScoring,
+)
+from communication.tournament.BatchEvaluator import evaluate_duels
+from communication.tournament.DuelEvaluator import evaluate_duel
+from pw_argumentation import ArgumentModel, generate_preferences
+
+
+def get_legacy_score(row):
+    """Returns the score of an item as the scalar loop of Item.get_score used to compute it."""
+    criterion_weight = 100
+    score = 0
+    for value in row:
+        score = score + criterion_weight * value
+        criterion_weight = criterion_weight / 2
+    return score
+
+
+class TestScoringStrategy(unittest.TestCase):
+    def setUp(self):
+        random.seed(0)
+        np.random.seed(0)
+
+    def test_halving(self):
+        values = np.random.randint(0, 5, size=(20, 8))
+        self.assertEqual(list(HalvingScoring().get_scores(values)), [get_legacy_score(row) for row in values.tolist()])
+
+    def test_weighted(self):
+        values = np.array([[4, 0, 1], [1, 3, 2]])
+        self.assertEqual(list(WeightedScoring([1, 2]).get_scores(values)), [4.0, 7.0])
+        self.assertEqual(WeightedScoring([1, 2]), WeightedScoring((1.0, 2.0)))
+        self.assertNotEqual(WeightedScoring([1, 2]), WeightedScoring([2, 1]))
+
+    def test_lexicographic(self):
+        values = np.full((3, 60), 2)
+        values[1, 59] = 3
+        values[2, 0] = 1
+        self.assertEqual(HalvingScoring().get_scores(values)[0], HalvingScoring().get_scores(values)[1])
+        scores = LexicographicScoring().get_scores(values)
+        self.assertGreater(scores[1], scores[0])
+        self.assertGreater(scores[0], scores[2])
+        self.assertEqual(list(LexicographicScoring().get_ranks(values)), [1, 2, 0])
+
+    def test_borda(self):
+        values = np.array([[4, 0], [1, 3], [4, 2]])
+        self.assertEqual(list(BordaScoring().get_scores(values)), [1 + 0, 0 + 2, 1 + 1])
+        self.assertEqual(list(BordaScoring().get_scores(values[:, :0])), [0, 0, 0])
+
+    def test_row_scores(self):
+        values = np.random.randint(-1, 5, size=(20, 8))
+        for scoring in (HalvingScoring(), WeightedScoring([0.1, 3, 0.7]), LexicographicScoring(), BordaScoring()):
+            self.assertEqual(list(scoring.get_row_scores(values.tolist())), list(scoring.get_scores(values)))
+            self.assertEqual(list(scoring.get_row_scores([])), [])
+
+    def test_preferences(self):
+        preferences = generate_preferences(n_items=4)[0]
+        preferences.set_scoring(LexicographicScoring())
+        restored = pickle.loads(pickle.dumps(preferences))
+        self.assertEqual(restored.get_scoring(), LexicographicScoring())
+        items = preferences.get_item_list()
+        values = preferences.get_value_matrix(items)
+        best = max(range(len(items)), key=lambda k: (tuple(values[k]), -k))
+        self.assertEqual(preferences.most_preferred(), items[best])
+
+    def test_matches_argument_model(self):
+        for scoring in (HalvingScoring(), WeightedScoring([1, 3, 2]), LexicographicScoring(), BordaScoring()):
+            population = [generate_preferences(n_items=6, n_values=3)[0] for _ in range(5)]
+            for preferences in population:
+                preferences.set_scoring(scoring)
+            pairings = [(i, j) for i in range(len(population)) for j in range(len(population)) if i != j]
+            agent_names = [f"A{i}" for i in range(len(population))]
+            batch_results = evaluate_duels(pairings, population, agent_names)
+            for (i, j), batch_result in zip(pairings, batch_results):
+                names = [agent_names[i], agent_names[j]]
+                argument_model = ArgumentModel([population[i], population[j]], agent_names=names)
+                argument_model.run_model()
+                result = argument_model.get_result()
+                self.assertEqual(evaluate_duel(population[i], population[j], names), result)
+                self.assertEqual(batch_result, result)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+import random
+import unittest
+
+import numpy as np
+
+from communication.preferences.CriterionName import CriterionName
+from communication.preferences.CriterionValue import CriterionValue
+from communication.preferences.Item import Item
+from communication.preferences.ItemCatalog import DEFAULT_CATALOG
+from communication.preferences.Preferences import Preferences
+from communication.preferences.SharedPopulation import SharedPopulation
+from communication.preferences.Value import Value
+from communication.tournament.Tournament import run_tournament
+from pw_argumentation import generate_preferences
+
+
+class TestSharedPopulation(unittest.TestCase):
+    def setUp(self):
+        random.seed(0)
+        np.random.seed(0)
+        self.population = [generate_preferences(n_items=4, drop_prefs=True)[0] for _ in range(5)]
+
+    def assertSamePreferences(self, preferences, other):
+        self.assertEqual(preferences.get_criterion_name_list(), other.get_criterion_name_list())
+        self.assertEqual(
+            [item.get_name() for item in preferences.get_item_list()],
+            [item.get_name() for item in other.get_item_list()],
+        )
+        self.assertEqual(
+            [
+                (value.get_item().get_name(), value.get_criterion_name(), value.get_value())
+                for value in preferences.get_criterion_value_list()
+            ],
+            [
+                (value.get_item().get_name(), value.get_criterion_name(), value.get_value())
+                for value in other.get_criterion_value_list()
+            ],
+        )
+
+    def test_round_trip(self):
+        with SharedPopulation.create(self.population) as shared_population:
+            self.assertEqual(len(shared_population), 5)
+            for k, preferences in enumerate(self.population):
+                self.assertSamePreferences(preferences, shared_population[k])
+
+    def test_duplicate_cells_and_plain_items(self):
+        item = Item("Plain engine", "Not interned")
+        criteria = [CriterionName.PRODUCTION_COST]
+        preferences = Preferences(
+            criteria,
+            [
+                CriterionValue(item, CriterionName.PRODUCTION_COST, Value.GOOD),
+                CriterionValue(item, CriterionName.PRODUCTION_COST, Value.BAD),
+            ],
+        )
+        with SharedPopulation.create(self.population + [preferences]) as shared_population:
+            restored = shared_population[len(self.population)]
+            self.assertSamePreferences(preferences, restored)
+            self.assertEqual(restored.get_value(item, CriterionName.PRODUCTION_COST), Value.GOOD)
+            self.assertIsNone(restored.get_item_list()[0].get_catalog())
+            # interned items are restored as the items of their catalog
+            interned = shared_population[0].get_item_list()[0]
+            self.assertIs(interned, self.population[0].get_item_list()[0])
+            self.assertIs(interned.get_catalog(), DEFAULT_CATALOG)
+
+        # an item of the same name as an interned one keeps its own catalog
+        namesake = Item(self.population[0].get_item_list()[0].get_name(), "Not interned")
+        preferences = Preferences(criteria, [CriterionValue(namesake, CriterionName.PRODUCTION_COST, Value.GOOD)])
+        with SharedPopulation.create(self.population + [preferences]) as shared_population:
+            self.assertIsNone(shared_population[len(self.population)].get_item_list()[0].get_catalog())
+            self.assertIs(shared_population[0].get_item_list()[0].get_catalog(), DEFAULT_CATALOG)
+
+    def test_cached_preferences(self):
+        with SharedPopulation.create(self.population) as shared_population:
+            self.assertIs(shared_population[1], shared_population[1])
+            attached_population = SharedPopulation.attach(shared_population.get_spec())
+            self.assertIs(attached_population.get_preferences(1), attached_population.get_preferences(1))
+            self.assertSamePreferences(self.population[1], attached_population.get_preferences(1))
+            attached_population.close()
+
+    def test_attach(self):
+        with SharedPopulation.create(self.population) as shared_population:
+            attached_population = SharedPopulation.attach(shared_population.get_spec())
+            np.testing.assert_array_equal(attached_population.get_values(), shared_population.get_values())
+            self.assertSamePreferences(self.population[2], attached_population.get_preferences(2))
+            attached_population.close()
+
+    def test_shared_memory_tournament(self):
+        sequential = run_tournament(self.population, n_workers=1)
+        shared = run_tournament(self.population, n_workers=2, shared_memory=True)
+
+        np.testing.assert_array_equal(sequential.duels_results, shared.duels_results)
+        self.assertEqual(sequential.winning_items, shared.winning_items)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import pickle
+import random
+import unittest
+
+import numpy as np
+
+from communication.arguments.Argument import Argument
+from communication.preferences.CriterionName import CriterionName
+from communication.preferences.Item import Item
+from communication.preferences.Value import Value
+from communication.preferences.Vocabulary import DEFAULT_VOCABULARY, Vocabulary
+from communication.tournament.BatchEvaluator import evaluate_duels
+from communication.tournament.DuelCache import get_preferences_fingerprint
+from communication.tournament.DuelEvaluator import evaluate_duel
+from pw_argumentation import ArgumentModel, generate_preferences
+
+
+class TestVocabulary(unittest.TestCase):
+    def setUp(self):
+        random.seed(0)
+        np.random.seed(0)
+
+    def test_default_vocabulary(self):
+        self.assertEqual(DEFAULT_VOCABULARY.get_criteria(), list(CriterionName))
+        self.assertEqual(DEFAULT_VOCABULARY.get_values(), list(Value))
+        self.assertEqual(DEFAULT_VOCABULARY.get_good_codes(), (Value.GOOD.value, Value.VERY_GOOD.value))
+        self.assertEqual(DEFAULT_VOCABULARY.get_bad_codes(), (Value.VERY_BAD.value, Value.BAD.value))
+        self.assertIs(Vocabulary.get("default"), DEFAULT_VOCABULARY)
+        self.assertRaises(ValueError, DEFAULT_VOCABULARY.add_criterion, "PRICE")
+
+    def test_codes(self):
+        vocabulary = Vocabulary("test_codes", ["PRICE", "WEIGHT"], ["LOW", "MEDIUM", "HIGH"])
+        price = vocabulary.get_criterion_by_name("PRICE")
+        self.assertEqual((price.name, price.value), ("PRICE", 0))
+        self.assertIs(vocabulary.add_criterion("PRICE"), price)
+        self.assertEqual(vocabulary.add_criterion("SIZE").value, 2)
+        self.assertEqual(vocabulary.get_criterion_names(), ["PRICE", "WEIGHT", "SIZE"])
+        self.assertEqual(vocabulary.get_good_codes(), (2,))
+        self.assertEqual(vocabulary.get_bad_codes(), (0,))
+        self.assertTrue(vocabulary.is_good(vocabulary.get_value_by_name("HIGH")))
+        self.assertFalse(vocabulary.is_bad(vocabulary.get_value_by_name("MEDIUM")))
+        self.assertFalse(vocabulary.is_good(None))
+        self.assertRaises(ValueError, Vocabulary, "test_codes")
+        self.assertRaises(ValueError, Vocabulary.get_or_create, "test_codes", [], ["LOW", "HIGH"])
+
+    def test_pickle(self):
+        vocabulary = Vocabulary.get_or_create("test_pickle", ["PRICE", "WEIGHT"], ["BAD", "AVERAGE", "GOOD"])
+        argument = Argument(True, Item("item1", ""))
+        argument.add_premise_couple_values(vocabulary.get_criterion(1), vocabulary.get_value(2))
+        argument.add_premise_comparison(vocabulary.get_criterion(1), vocabulary.get_criterion(0))
+        restored_argument = pickle.loads(pickle.dumps(argument))
+        self.assertEqual(restored_argument, argument)
+        self.assertIs(restored_argument.get_couple_value()[0], vocabulary.get_criterion(1))
+        self.assertIs(pickle.loads(pickle.dumps(vocabulary)), vocabulary)
+
+    def test_many_criteria(self):
+        population = [generate_preferences(n_items=4, n_crit=40, n_values=7)[0] for _ in range(4)]
+        vocabulary = population[0].get_vocabulary()
+        self.assertEqual(vocabulary.get_criteria_count(), 40)
+        self.assertEqual(vocabulary.get_values_count(), 7)
+
+        restored = pickle.loads(pickle.dumps(population[0]))
+        self.assertIs(restored.get_vocabulary(), vocabulary)
+        self.assertEqual(restored.get_criterion_name_list(), population[0].get_criterion_name_list())
+        self.assertEqual(get_preferences_fingerprint(restored), get_preferences_fingerprint(population[0]))
+
+        pairings = [(i, j) for i in range(len(population)) for j in range(len(population)) if i != j]
+        agent_names = [f"A{i}" for i in range(len(population))]
+        batch_results = evaluate_duels(pairings, population, agent_names)
+        for (i, j), batch_result in zip(pairings, batch_results):
+            argument_model = ArgumentModel([population[i], population[j]], agent_names=[agent_names[i], agent_names[j]])
+            argument_model.run_model()
+            result = argument_model.get_result()
+            self.assertEqual(evaluate_duel(population[i], population[j], [agent_names[i], agent_names[j]]), result)
+            self.assertEqual(batch_result, result)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+import unittest
+
+from communication.agent.CommunicatingAgent import CommunicatingAgent
+from communication.message.Message import Message
+from communication.message.MessagePerformative import MessagePerformative
+from communication.message.MessageService import MessageService
+from communication.model.Model import Model
+from communication.preferences.CriterionName import CriterionName
+from communication.preferences.CriterionValue import CriterionValue
+from communication.preferences.Item import Item
+from communication.preferences.Preferences import Preferences
+from communication.preferences.Value import Value
+from communication.scheduler.ActivityScheduler import ActivityScheduler
+from pw_argumentation import ArgumentModel, generate_preferences
+
+
+class CountingAgent(CommunicatingAgent):
+    """Agent counting its steps and reading its mailbox."""
+
+    def __init__(self, unique_id, model, name):
+        super().__init__(unique_id, model, name)
+        self.n_steps = 0
+        self.finished = False
+
+    def is_finished(self):
+        return self.finished
+
+    def step(self):
+        self.n_steps += 1
+        self.get_new_messages()
+
+
+class CountingModel(Model):
+    def __init__(self, n_agents):
+        self.schedule = ActivityScheduler(self)
+        MessageService.clear_instance()
+        self.messages_service = MessageService(self.schedule)
+        self.agents = [CountingAgent(i, self, f"Agent{i}") for i in range(n_agents)]
+        for agent in self.agents:
+            self.schedule.add(agent)
+
+    def step(self):
+        self.messages_service.dispatch_messages()
+        self.schedule.step()
+
+
+class TestActivityScheduler(unittest.TestCase):
+    def test_only_agents_with_pending_work_are_stepped(self):
+        model = CountingModel(3)
+        model.step()
+        self.assertEqual([agent.n_steps for agent in model.agents], [1, 1, 1])
+        self.assertTrue(model.schedule.is_idle())
+
+        model.step()
+        self.assertEqual([agent.n_steps for agent in model.agents], [1, 1, 1])
+
+        model.agents[0].send_message(Message("Agent0", "Agent2", MessagePerformative.COMMIT, ["hello"]))
+        self.assertEqual(model.schedule.get_active_agents(), [model.agents[2]])
+        model.step()
+        self.assertEqual([agent.n_steps for agent in model.agents], [1, 1, 2])
+
+    def test_timers(self):
+        model = CountingModel(2)
+        model.step()
+        model.schedule.schedule_wakeup(model.agents[1], delay=1)
+        self.assertFalse(model.schedule.is_idle())
+        model.step()
+        self.assertEqual(model.agents[1].n_steps, 1)
+        model.step()
+        self.assertEqual(model.agents[1].n_steps, 2)
+        self.assertTrue(model.schedule.is_idle())
+
+    def test_finished_agents_are_removed(self):
+        model = CountingModel(2)
+        model.agents[0].finished = True
+        model.schedule.schedule_wakeup(model.agents[0], delay=3)
+        model.step()
+        self.assertTrue(model.schedule.is_idle())
+
+    def test_same_result_as_base_scheduler_without_idle_agents(self):
+        """In this scenario, every agent still negotiating has a message to read at each tick, so skipping idle
+        agents changes nothing. In general the conversations can differ, as idle agents make no new proposals."""
+        item1 = Item("item1", "")
+        item2 = Item("item2", "")
+        list_criteria = [CriterionName.PRODUCTION_COST, CriterionName.DURABILITY]
+        agents_prefs = [
+            Preferences(
+                list_criteria,
+                [
+                    CriterionValue(item1, CriterionName.PRODUCTION_COST, Value.VERY_GOOD),
+                    CriterionValue(item1, CriterionName.DURABILITY, Value.VERY_BAD),
+                    CriterionValue(item2, CriterionName.PRODUCTION_COST, Value.VERY_BAD),
+                    CriterionValue(item2, CriterionName.DURABILITY, Value.VERY_BAD),
+                ],
+            ),
+            Preferences(
+                list_criteria[::-1],
+                [
+                    CriterionValue(item1, CriterionName.PRODUCTION_COST, Value.VERY_GOOD),
+                    CriterionValue(item1, CriterionName.DURABILITY, Value.VERY_BAD),
+                    CriterionValue(item2, CriterionName.PRODUCTION_COST, Value.VERY_BAD),
+                    CriterionValue(item2, CriterionName.DURABILITY, Value.VERY_GOOD),
+                ],
+            ),
+        ]
+
+        base_model = ArgumentModel(agents_prefs)
+        base_model.run_model()
+        activity_model = ArgumentModel(agents_prefs, scheduler_cls=ActivityScheduler)
+        activity_model.run_model()
+
+        self.assertEqual(base_model.get_final_result()[0], activity_model.get_final_result()[0])
+
+    def test_same_termination_as_base_scheduler(self):
+        for seed in range(20):
+            agents_prefs = [generate_preferences(n_items=5, rng=2 * seed + k)[0] for k in range(2)]
+            base_model = ArgumentModel(agents_prefs)
+            base_model.run_model()
+            activity_model = ArgumentModel(agents_prefs, scheduler_cls=ActivityScheduler)
+            activity_model.run_model()
+            self.assertFalse(activity_model.running)
+            self.assertEqual(base_model.outcome, activity_model.outcome)
+        self.assertTrue(activity_model.schedule.is_idle())
+
+
+if __name__ == "__main__":
+    unittest.main()
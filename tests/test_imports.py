@@ -0,0 +1,60 @@
+import subprocess
+import sys
+import unittest
+
+HEAVY_MODULES = ["colorama", "mesa", "numpy", "pandas"]
+CORE_MODULES = [
+    "communication.arguments.Argument",
+    "communication.mailbox.Mailbox",
+    "communication.message.MessageService",
+    "communication.model.Model",
+    "communication.preferences.Preferences",
+    "communication.scheduler.ActivityScheduler",
+    "communication.tournament.DuelEvaluator",
+    "communication.tracing.Tracer",
+]
+IMPORT_TIME_BUDGET = 0.1  # seconds to import all the core modules, or pw_argumentation
+
+
+def get_imports(modules, statements="pass"):
+    """Imports the modules in a new interpreter, runs the statements and returns the heavy modules it loaded and
+    the import time of the given modules, as measured by python -X importtime."""
+    code = (
+        f"import sys; import {', '.join(modules)}; {statements}; "
+        f"print(','.join(m for m in {HEAVY_MODULES} if m in sys.modules))"
+    )
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True, check=True
+    )
+    import_time = 0
+    for line in process.stderr.splitlines():
+        fields = line.split("|")
+        if len(fields) == 3 and fields[2].strip() in modules:
+            import_time += int(fields[1]) / 1e6  # cumulative time in microseconds
+    return [module for module in process.stdout.strip().split(",") if module], import_time
+
+
+class TestImports(unittest.TestCase):
+    def test_core_modules(self):
+        heavy_modules, import_time = get_imports(CORE_MODULES)
+        self.assertEqual(heavy_modules, [])
+        self.assertLess(import_time, IMPORT_TIME_BUDGET)
+
+    def test_pw_argumentation(self):
+        heavy_modules, import_time = get_imports(["pw_argumentation"])
+        self.assertEqual(heavy_modules, [])
+        self.assertLess(import_time, IMPORT_TIME_BUDGET)
+
+    def test_duels(self):
+        # the default scoring ranks the items in pure Python, only the Pareto options and DataFrames need NumPy
+        statements = (
+            "model = pw_argumentation.ArgumentModel(seed=0, agent_loggers=False); model.run_model(); "
+            "agents = model.agents; "
+            "communication.tournament.DuelEvaluator.evaluate_duel(agents[0].preferences, agents[1].preferences)"
+        )
+        heavy_modules, _ = get_imports(["pw_argumentation", "communication.tournament.DuelEvaluator"], statements)
+        self.assertEqual(heavy_modules, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,10 @@
 import logging
+import random
 import unittest
+from unittest import mock
+
 import colorama
+import numpy as np
 
 from communication.message.MessagePerformative import MessagePerformative
 from communication.preferences.CriterionName import CriterionName
@@ -8,7 +12,9 @@ from communication.preferences.CriterionValue import CriterionValue
 from communication.preferences.Item import Item
 from communication.preferences.Preferences import Preferences
 from communication.preferences.Value import Value
-from pw_argumentation import ArgumentModel
+from communication.scheduler.ActivityScheduler import ActivityScheduler
+from communication.scheduler.BaseScheduler import BaseScheduler
+from pw_argumentation import ArgumentModel, OUTCOME_CYCLE, OUTCOME_FINISHED, OUTCOME_MAX_STEPS, generate_preferences
 
 values_list = [
     Value.VERY_GOOD,
@@ -243,6 +249,231 @@ class TestArgumentation(unittest.TestCase):
             ],
         )
 
+    def get_scenario_3_prefs(self):
+        item1 = Item("item1", "")
+        item2 = Item("item2", "")
+        list_criteria = [CriterionName.PRODUCTION_COST, CriterionName.DURABILITY]
+        return [
+            Preferences(
+                list_criteria,
+                [
+                    CriterionValue(item1, CriterionName.PRODUCTION_COST, values_list[0]),
+                    CriterionValue(item1, CriterionName.DURABILITY, values_list[4]),
+                    CriterionValue(item2, CriterionName.PRODUCTION_COST, values_list[4]),
+                    CriterionValue(item2, CriterionName.DURABILITY, values_list[4]),
+                ],
+            ),
+            Preferences(
+                list_criteria[::-1],
+                [
+                    CriterionValue(item1, CriterionName.PRODUCTION_COST, values_list[0]),
+                    CriterionValue(item1, CriterionName.DURABILITY, values_list[4]),
+                    CriterionValue(item2, CriterionName.PRODUCTION_COST, values_list[4]),
+                    CriterionValue(item2, CriterionName.DURABILITY, values_list[0]),
+                ],
+            ),
+        ]
+
+    def test_outcome_finished(self):
+        argument_model = ArgumentModel(self.get_scenario_3_prefs())
+        argument_model.run_model()
+        self.assertEqual(argument_model.outcome, OUTCOME_FINISHED)
+
+    def test_step_budget(self):
+        argument_model = ArgumentModel(self.get_scenario_3_prefs(), max_steps=2)
+        argument_model.run_model()
+        self.assertEqual(argument_model.step_count, 2)
+        self.assertEqual(argument_model.outcome, OUTCOME_MAX_STEPS)
+
+    def test_conversation_state(self):
+        model_1 = ArgumentModel(self.get_scenario_3_prefs())
+        model_2 = ArgumentModel(self.get_scenario_3_prefs())
+        model_1.step()
+        model_2.step()
+        self.assertEqual(model_1.get_conversation_state(), model_2.get_conversation_state())
+        model_2.step()
+        self.assertNotEqual(model_1.get_conversation_state(), model_2.get_conversation_state())
+
+    def test_cycle_detection(self):
+        argument_model = ArgumentModel(self.get_scenario_3_prefs())
+        # pretend the conversation state never changes
+        argument_model.get_conversation_state = lambda: None
+        argument_model.run_model()
+        self.assertEqual(argument_model.step_count, 2)
+        self.assertEqual(argument_model.outcome, OUTCOME_CYCLE)
+
+        # only the first MAX_CYCLE_STATES states are kept
+        argument_model = ArgumentModel(self.get_scenario_3_prefs(), max_steps=5)
+        states = iter([0, 1, 1, 1])
+        argument_model.get_conversation_state = lambda: next(states, 1)
+        with mock.patch("pw_argumentation.MAX_CYCLE_STATES", 1):
+            argument_model.run_model()
+        self.assertNotEqual(argument_model.outcome, OUTCOME_CYCLE)
+
+        # random targets can break a repeated state
+        population = [generate_preferences(n_items=4, rng=seed)[0] for seed in range(3)]
+        argument_model = ArgumentModel(population, max_steps=1)
+        argument_model.get_conversation_state = mock.Mock(return_value=None)
+        argument_model.run_model()
+        argument_model.get_conversation_state.assert_not_called()
+
+    def test_reset(self):
+        for scheduler_cls in (BaseScheduler, ActivityScheduler):
+            fresh_model = ArgumentModel(self.get_scenario_3_prefs(), ["Bob", "Alice"], scheduler_cls, seed=0)
+            fresh_model.run_model()
+
+            argument_model = ArgumentModel(self.get_scenario_3_prefs()[::-1], scheduler_cls=scheduler_cls)
+            argument_model.step()  # leave the negotiation with pending messages
+            argument_model.reset(self.get_scenario_3_prefs(), ["Bob", "Alice"], seed=0)
+            self.assertEqual([agent.get_name() for agent in argument_model.agents], ["Bob", "Alice"])
+            argument_model.run_model()
+
+            self.assertEqual(argument_model.outcome, fresh_model.outcome)
+            self.assertEqual(argument_model.step_count, fresh_model.step_count)
+            self.assertTrue(argument_model.get_message_history().equals(fresh_model.get_message_history()))
+            self.assertEqual(argument_model.get_final_result()[0], fresh_model.get_final_result()[0])
+
+        with self.assertRaises(ValueError):
+            argument_model.reset(self.get_scenario_3_prefs()[:1])
+
+    def test_streaming_items(self):
+        argument_model = ArgumentModel(self.get_scenario_3_prefs(), ["Bob", "Alice"])
+        argument_model.step()
+        new_item = Item("New Engine", "A brand new engine")
+        argument_model.add_items(
+            {
+                agent.get_name(): [
+                    CriterionValue(new_item, criterion, Value.VERY_GOOD)
+                    for criterion in agent.preferences.get_criterion_name_list()
+                ]
+                for agent in argument_model.agents
+            }
+        )
+        self.assertEqual(argument_model.agents[0].get_proposal(), new_item)
+        argument_model.run_model()
+        self.assertEqual(argument_model.get_result()["winning_item"], new_item)
+
+        argument_model = ArgumentModel(self.get_scenario_3_prefs(), ["Bob", "Alice"])
+        item = argument_model.agents[0].preferences.get_item_list()[0]
+        argument_model.remove_items([item], ["Bob"])
+        self.assertNotIn(item, argument_model.agents[0].preferences.get_item_list())
+        self.assertIn(item, argument_model.agents[1].preferences.get_item_list())
+        with self.assertRaises(ValueError):
+            argument_model.add_items({"Carol": []})
+
+        # an item leaving and coming back with new values keeps none of its old ones
+        argument_model.step()
+        argument_model.remove_items([item])
+        argument_model.add_items(
+            {
+                agent.get_name(): [
+                    CriterionValue(item, criterion, Value.VERY_BAD)
+                    for criterion in agent.preferences.get_criterion_name_list()
+                ]
+                for agent in argument_model.agents
+            }
+        )
+        for agent in argument_model.agents:
+            expected = [(criterion, Value.VERY_BAD) for criterion in agent.preferences.get_criterion_name_list()]
+            self.assertEqual(agent.preferences.get_item_values(item), expected)
+
+    def test_conversations(self):
+        population = [generate_preferences(n_items=6, rng=seed)[0] for seed in range(5)]
+        names = [f"A{k}" for k in range(len(population))]
+        pairs = [(0, 1), (0, 2), (1, 2), (3, 4), (4, 0), (2, 3)]
+        for scheduler_cls in (BaseScheduler, ActivityScheduler):
+            argument_model = ArgumentModel(
+                population, names, scheduler_cls, conversations=[(names[i], names[j]) for i, j in pairs]
+            )
+            argument_model.run_model()
+            self.assertEqual(argument_model.outcome, OUTCOME_FINISHED)
+            results = argument_model.get_conversation_results()
+            for conversation_id, (i, j) in enumerate(pairs):
+                # agents are stepped in the order of the model in each conversation
+                i, j = sorted((i, j))
+                duel_model = ArgumentModel([population[i], population[j]], [names[i], names[j]], scheduler_cls)
+                duel_model.run_model()
+                self.assertEqual(results[conversation_id], duel_model.get_result())
+                self.assertEqual(argument_model.conversation_outcomes[conversation_id], duel_model.outcome)
+            agent = argument_model.get_agent("A0")
+            self.assertEqual([conversation.partner for conversation in agent.conversations], ["A1", "A2", "A4"])
+            messages = agent.get_messages_from_conversation(0)
+            self.assertTrue(messages and all(message.get_conversation_id() == 0 for message in messages))
+            # the preferences of the agents are copied in each conversation
+            self.assertEqual(agent.preferences.get_item_list(), population[0].get_item_list())
+
+        # the messages of an agent out of the conversations would never be read
+        with self.assertRaises(ValueError):
+            ArgumentModel(population, names, conversations=[("A0", "A1"), ("A2", "A3")])
+
+        # the conversations follow the agents renamed on reset, unless new ones are given
+        new_names = [f"B{k}" for k in range(len(population))]
+        new_pairs = [(new_names[i], new_names[j]) for i, j in pairs]
+        fresh_model = ArgumentModel(population, new_names, ActivityScheduler, conversations=new_pairs)
+        fresh_model.run_model()
+        argument_model.reset(population, new_names)
+        self.assertEqual(argument_model.conversations, fresh_model.conversations)
+        argument_model.run_model()
+        self.assertEqual(argument_model.get_conversation_results(), fresh_model.get_conversation_results())
+        ring = [(new_names[k], new_names[(k + 1) % len(new_names)]) for k in range(len(new_names))]
+        argument_model.reset(population, new_names, conversations=ring)
+        partners = [conversation.partner for conversation in argument_model.agents[0].conversations]
+        self.assertEqual(partners, ["B1", "B4"])
+        with self.assertRaises(ValueError):
+            argument_model.reset(population, names, conversations=ring)
+
+    def test_large_population(self):
+        population = [generate_preferences(n_items=4, rng=seed)[0] for seed in range(12)]
+        names = [f"A{k}" for k in range(len(population))]
+        argument_model = ArgumentModel(population, names, seed=0, agent_loggers=False)
+        self.assertTrue(all(agent.logger is None for agent in argument_model.agents))
+        # targets are drawn as random.choice over the other agents
+        legacy_random = random.Random(0)
+        agent = argument_model.get_agent("A5")
+        for _ in range(50):
+            others = [other for other in argument_model.agents if other is not agent]
+            self.assertIs(agent.get_random_target(), legacy_random.choice(others))
+        self.assertEqual(ArgumentModel(population, names).agents[7].log_color, ArgumentModel().agents[0].log_color)
+
+        contacts = {name: [names[(k + 1) % len(names)], names[k - 1]] for k, name in enumerate(names)}
+        argument_model = ArgumentModel(population, names, seed=0, contacts=contacts, agent_loggers=False)
+        for agent in argument_model.agents:
+            targets = {agent.get_random_target().get_name() for _ in range(20)}
+            self.assertEqual(targets, set(contacts[agent.get_name()]))
+        new_names = [f"B{k}" for k in range(len(population))]
+        argument_model.reset(population, new_names)
+        self.assertEqual(argument_model.contacts["B0"], ["B1", "B11"])
+        # every agent must be able to draw a target among the agents of the model
+        for invalid_contacts in ({**contacts, "A3": []}, {**contacts, "A3": ["A4", "Carol"]}, {"A0": ["A1"]}):
+            with self.assertRaises(ValueError):
+                ArgumentModel(population, names, contacts=invalid_contacts, agent_loggers=False)
+
+        ring = [(names[k], names[(k + 1) % len(names)]) for k in range(len(names))]
+        argument_model = ArgumentModel(
+            population, names, ActivityScheduler, conversations=ring, agent_loggers=False
+        )
+        argument_model.run_model()
+        self.assertNotIn(None, argument_model.conversation_outcomes)
+        results = argument_model.get_conversation_results()
+        self.assertEqual(results, [argument_model.get_result(k) for k in range(len(ring))])
+
+    def test_seeded_preferences(self):
+        np.random.seed(0)
+        random.seed(0)
+        states = np.random.get_state(), random.getstate()
+        preferences, df = generate_preferences(n_items=4, drop_prefs=True, rng=1)
+        same_preferences, _ = generate_preferences(n_items=4, drop_prefs=True, rng=1)
+        self.assertEqual(preferences.__getstate__(), same_preferences.__getstate__())
+        self.assertEqual(len(df), 4)
+        self.assertEqual(random.getstate(), states[1])
+        np.testing.assert_equal(np.random.get_state(), states[0])
+
+        random_prefs = [
+            [agent.preferences.__getstate__() for agent in ArgumentModel(seed=seed).agents] for seed in (1, 1, 2)
+        ]
+        self.assertEqual(random_prefs[0], random_prefs[1])
+        self.assertNotEqual(random_prefs[0], random_prefs[2])
+
 
 if __name__ == "__main__":
     colorama.init()  # INFO: used to print colored text on Windows
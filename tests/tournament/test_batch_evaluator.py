@@ -0,0 +1,96 @@
+import random
+import unittest
+
+import numpy as np
+
+from communication.tournament.BatchEvaluator import encode_population, evaluate_duels
+from communication.tournament.Tournament import get_pairings, run_tournament
+from pw_argumentation import ArgumentModel, generate_preferences
+
+
+def get_model_result(prefs_1, prefs_2, **model_kwargs):
+    """Returns the final result of an ArgumentModel, or the type of the exception it raised."""
+    try:
+        argument_model = ArgumentModel([prefs_1, prefs_2], **model_kwargs)
+        argument_model.run_model()
+        return argument_model.get_final_result()[0]
+    except Exception as exception:
+        return type(exception)
+
+
+def get_batch_results(pairings, population, agent_names, **kwargs):
+    """Returns the results of evaluate_duels, or the type of the exception of each duel raising one."""
+    results = []
+    for pairing in pairings:
+        try:
+            results.extend(evaluate_duels([pairing], population, agent_names, **kwargs))
+        except Exception as exception:
+            results.append(type(exception))
+    return results
+
+
+class TestBatchEvaluator(unittest.TestCase):
+    def setUp(self):
+        random.seed(0)
+        np.random.seed(0)
+
+    def test_matches_argument_model(self):
+        population = [generate_preferences(n_items=8)[0] for _ in range(8)]
+        population += [generate_preferences(n_items=8, drop_prefs=True)[0] for _ in range(4)]
+        agent_names = [f"A{i}" for i in range(len(population))]
+        pairings = list(get_pairings(len(population)))
+        expected = [
+            get_model_result(population[i], population[j], agent_names=[agent_names[i], agent_names[j]])
+            for i, j in pairings
+        ]
+        self.assertEqual(get_batch_results(pairings, population, agent_names), expected)
+
+        # duels without errors are evaluated together
+        valid = [k for k, results in enumerate(expected) if not isinstance(results, type)]
+        results = evaluate_duels([pairings[k] for k in valid], population, agent_names, batch_size=7)
+        self.assertEqual(results, [expected[k] for k in valid])
+
+    def test_sparse_preferences(self):
+        population = [generate_preferences(n_items=8, missing_rate=0.2)[0] for _ in range(8)]
+        agent_names = [f"A{i}" for i in range(len(population))]
+        pairings = list(get_pairings(len(population)))
+        expected = [
+            get_model_result(population[i], population[j], agent_names=[agent_names[i], agent_names[j]])
+            for i, j in pairings
+        ]
+        self.assertEqual(get_batch_results(pairings, population, agent_names), expected)
+        self.assertTrue(any(results is not None and not isinstance(results, type) for results in expected))
+
+    def test_step_budget(self):
+        population = [generate_preferences(n_items=8)[0] for _ in range(4)]
+        agent_names = ["Bob", "Alice", "Carol", "Dave"]
+        pairings = list(get_pairings(4))
+        for max_steps in range(1, 4):
+            expected = [
+                get_model_result(
+                    population[i], population[j], agent_names=[agent_names[i], agent_names[j]], max_steps=max_steps
+                )
+                for i, j in pairings
+            ]
+            self.assertEqual(evaluate_duels(pairings, population, agent_names, max_steps=max_steps), expected)
+
+    def test_encode_population(self):
+        population = [generate_preferences(n_items=5)[0] for _ in range(3)]
+        encoded = encode_population(population)
+        self.assertEqual(len(encoded.items), 5)
+        for k, preferences in enumerate(population):
+            for i, item in enumerate(encoded.items):
+                self.assertEqual(encoded.scores[k, i], item.get_score(preferences))
+
+    def test_batched_tournament(self):
+        population = [generate_preferences(n_items=5)[0] for _ in range(6)]
+        result = run_tournament(population, n_workers=1)
+        batched = run_tournament(population, n_workers=1, batched=True)
+
+        np.testing.assert_array_equal(result.duels_results, batched.duels_results)
+        self.assertEqual(result.winning_items, batched.winning_items)
+        self.assertEqual(result.winning_arguments, batched.winning_arguments)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import random
+import tempfile
+import unittest
+
+import numpy as np
+
+from communication.scheduler.ActivityScheduler import ActivityScheduler
+from communication.tournament.DuelCache import DuelCache, get_parameter_fingerprint, get_preferences_fingerprint
+from communication.tournament.Tournament import run_duel, run_tournament
+from communication.tracing.Tracer import MemoryTracer
+from pw_argumentation import generate_preferences
+
+
+class TestDuelCache(unittest.TestCase):
+    def setUp(self):
+        random.seed(0)
+        np.random.seed(0)
+        self.population = [generate_preferences(n_items=5)[0] for _ in range(5)]
+
+    def test_fingerprint(self):
+        prefs_1, prefs_2 = self.population[:2]
+        self.assertEqual(get_preferences_fingerprint(prefs_1), get_preferences_fingerprint(prefs_1))
+        self.assertNotEqual(get_preferences_fingerprint(prefs_1), get_preferences_fingerprint(prefs_2))
+
+    def test_key(self):
+        self.assertNotEqual(DuelCache.get_key("a", "b"), DuelCache.get_key("b", "a"))
+        self.assertNotEqual(DuelCache.get_key("a", "b"), DuelCache.get_key("a", "b", {"max_steps": 10}))
+        # classes are keyed by qualified name, tracers do not change the outcome
+        self.assertEqual(
+            DuelCache.get_key("a", "b", {"scheduler_cls": ActivityScheduler, "tracer": MemoryTracer()}),
+            DuelCache.get_key("a", "b", {"scheduler_cls": ActivityScheduler, "tracer": MemoryTracer()}),
+        )
+        self.assertEqual(DuelCache.get_key("a", "b"), DuelCache.get_key("a", "b", {"tracer": MemoryTracer()}))
+        self.assertIn("ActivityScheduler", get_parameter_fingerprint(ActivityScheduler))
+        with self.assertRaises(ValueError):
+            DuelCache.get_key("a", "b", {"max_steps": object()})
+
+    def test_cached_duel(self):
+        cache = DuelCache()
+        prefs_1, prefs_2 = self.population[:2]
+        results = run_duel(prefs_1, prefs_2, ["A1", "A2"])
+
+        self.assertEqual(run_duel(prefs_1, prefs_2, ["A1", "A2"], cache=cache), results)
+        self.assertEqual((cache.hits, cache.misses), (0, 1))
+        self.assertEqual(run_duel(prefs_1, prefs_2, ["A1", "A2"], cache=cache), results)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+        # agent names are not part of the key
+        renamed_results = run_duel(prefs_1, prefs_2, ["Bob", "Alice"], cache=cache)
+        self.assertEqual(cache.hits, 2)
+        if results:
+            self.assertEqual(renamed_results["winning_agent"], {"A1": "Bob", "A2": "Alice"}[results["winning_agent"]])
+
+    def test_lru_eviction(self):
+        cache = DuelCache(max_size=2)
+        cache.put("a", ["A1", "A2"], None)
+        cache.put("b", ["A1", "A2"], None)
+        cache.get("a", ["A1", "A2"])
+        cache.put("c", ["A1", "A2"], None)
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.get("b", ["A1", "A2"], default="missing"), "missing")
+        self.assertIsNone(cache.get("a", ["A1", "A2"], default="missing"))
+
+    def test_disk_store_and_tournament(self):
+        reference = run_tournament(self.population, n_workers=1)
+        with tempfile.TemporaryDirectory() as cache_dir:
+            run_tournament(self.population, n_workers=1, cache=DuelCache(cache_dir=cache_dir))
+
+            cache = DuelCache(cache_dir=cache_dir)
+            cached = run_tournament(self.population, n_workers=1, cache=cache)
+            self.assertEqual((cache.hits, cache.misses), (10, 0))
+
+        np.testing.assert_array_equal(cached.duels_results, reference.duels_results)
+        self.assertEqual(cached.winning_arguments, reference.winning_arguments)
+
+
+if __name__ == "__main__":
+    unittest.main()
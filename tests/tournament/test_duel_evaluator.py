@@ -0,0 +1,69 @@
+import random
+import unittest
+
+import numpy as np
+
+from communication.tournament.DuelEvaluator import evaluate_duel
+from communication.tournament.Tournament import run_tournament
+from pw_argumentation import ArgumentModel, generate_preferences
+
+
+def get_model_result(prefs_1, prefs_2, **model_kwargs):
+    """Returns the final result of an ArgumentModel, or the type of the exception it raised."""
+    try:
+        argument_model = ArgumentModel([prefs_1, prefs_2], **model_kwargs)
+        argument_model.run_model()
+        return argument_model.get_final_result()[0]
+    except Exception as exception:
+        return type(exception)
+
+
+def get_direct_result(prefs_1, prefs_2, **model_kwargs):
+    try:
+        return evaluate_duel(prefs_1, prefs_2, **model_kwargs)
+    except Exception as exception:
+        return type(exception)
+
+
+class TestDuelEvaluator(unittest.TestCase):
+    def setUp(self):
+        random.seed(0)
+        np.random.seed(0)
+
+    def test_matches_argument_model(self):
+        for _ in range(100):
+            n_items = random.randint(1, 10)
+            drop_prefs = random.random() < 0.3
+            prefs_1 = generate_preferences(n_items=n_items, drop_prefs=drop_prefs)[0]
+            prefs_2 = generate_preferences(n_items=n_items, drop_prefs=drop_prefs)[0]
+            self.assertEqual(get_direct_result(prefs_1, prefs_2), get_model_result(prefs_1, prefs_2))
+
+    def test_step_budget(self):
+        for max_steps in range(1, 5):
+            prefs_1 = generate_preferences(n_items=8)[0]
+            prefs_2 = generate_preferences(n_items=8)[0]
+            self.assertEqual(
+                get_direct_result(prefs_1, prefs_2, max_steps=max_steps, agent_names=["Bob", "Alice"]),
+                get_model_result(prefs_1, prefs_2, max_steps=max_steps, agent_names=["Bob", "Alice"]),
+            )
+
+    def test_preferences_unchanged(self):
+        prefs_1 = generate_preferences(n_items=5)[0]
+        prefs_2 = generate_preferences(n_items=5)[0]
+        state_1, state_2 = prefs_1.__getstate__(), prefs_2.__getstate__()
+        evaluate_duel(prefs_1, prefs_2)
+        self.assertEqual(prefs_1.__getstate__(), state_1)
+        self.assertEqual(prefs_2.__getstate__(), state_2)
+
+    def test_direct_tournament(self):
+        population = [generate_preferences(n_items=5)[0] for _ in range(6)]
+        result = run_tournament(population, n_workers=1)
+        direct = run_tournament(population, n_workers=1, direct=True)
+
+        np.testing.assert_array_equal(result.duels_results, direct.duels_results)
+        self.assertEqual(result.winning_items, direct.winning_items)
+        self.assertEqual(result.winning_arguments, direct.winning_arguments)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+import os
+import random
+import tempfile
+import unittest
+
+import numpy as np
+
+from communication.tournament.IncrementalTournament import IncrementalTournament
+from communication.tournament.Tournament import run_tournament
+from pw_argumentation import generate_preferences
+
+
+class TestIncrementalTournament(unittest.TestCase):
+    def setUp(self):
+        random.seed(0)
+        np.random.seed(0)
+        self.population = [generate_preferences(n_items=5)[0] for _ in range(6)]
+        self.names = [f"A{i}" for i in range(6)]
+
+    def test_matches_full_tournament(self):
+        tournament = IncrementalTournament(seed=3)
+        tournament.add_agents(dict(zip(self.names[:4], self.population[:4])))
+        self.assertEqual(tournament.update(n_workers=1), 6)
+        tournament.add_agents(dict(zip(self.names[4:], self.population[4:])))
+        self.assertEqual(len(tournament.get_pending_pairings()), 9)
+        self.assertEqual(tournament.update(n_workers=1), 9)
+        self.assertEqual(tournament.update(n_workers=1), 0)
+
+        full = run_tournament(self.population, self.names, n_workers=1, seed=3)
+        result = tournament.get_result()
+        np.testing.assert_array_equal(result.duels_results, full.duels_results)
+        self.assertEqual(result.winning_items, full.winning_items)
+        self.assertEqual(result.winning_arguments, full.winning_arguments)
+        self.assertEqual(list(tournament.get_scores().values()), full.duels_results.sum(axis=1).tolist())
+
+    def test_remove_agent(self):
+        tournament = IncrementalTournament()
+        tournament.add_agents(dict(zip(self.names, self.population)))
+        tournament.update(n_workers=1)
+        tournament.remove_agent("A2")
+        tournament.add_agent("A6", self.population[2])
+        tournament.remove_agent("A6")
+
+        self.assertNotIn("A2", tournament)
+        self.assertEqual(tournament.get_pending_pairings(), [])
+        population = [self.population[k] for k in (0, 1, 3, 4, 5)]
+        full = run_tournament(population, ["A0", "A1", "A3", "A4", "A5"], n_workers=1)
+        np.testing.assert_array_equal(tournament.get_result().duels_results, full.duels_results)
+        scores = tournament.get_scores()
+        self.assertEqual(list(scores.values()), full.duels_results.sum(axis=1).tolist())
+        self.assertEqual([scores[name] for name in tournament.get_ranking()], sorted(scores.values(), reverse=True))
+
+    def test_shared_memory_update(self):
+        tournament = IncrementalTournament(seed=2)
+        tournament.add_agents(dict(zip(self.names, self.population)))
+        tournament.remove_agent("A1")  # the ids of the agents are not their positions anymore
+        self.assertEqual(tournament.update(n_workers=2, shared_memory=True), 10)
+
+        population = [self.population[k] for k in (0, 2, 3, 4, 5)]
+        full = run_tournament(population, ["A0", "A2", "A3", "A4", "A5"], n_workers=1, seed=2)
+        np.testing.assert_array_equal(tournament.get_result().duels_results, full.duels_results)
+
+    def test_failed_update(self):
+        tournament = IncrementalTournament()
+        tournament.add_agents(dict(zip(self.names[:3], self.population[:3])))
+        with self.assertRaises(TypeError):
+            tournament.update(n_workers=1, unknown_parameter=True)
+        self.assertEqual(len(tournament.get_pending_pairings()), 3)
+        self.assertEqual(tournament.update(n_workers=1), 3)
+
+        full = run_tournament(self.population[:3], self.names[:3], n_workers=1)
+        np.testing.assert_array_equal(tournament.get_result().duels_results, full.duels_results)
+        self.assertEqual(list(tournament.get_scores().values()), full.duels_results.sum(axis=1).tolist())
+
+    def test_overlapping_parameters(self):
+        tournament = IncrementalTournament(seed=3, max_steps=1)
+        tournament.add_agents(dict(zip(self.names[:3], self.population[:3])))
+        self.assertEqual(tournament.update(n_workers=1, seed=3, max_steps=100), 3)
+
+        full = run_tournament(self.population[:3], self.names[:3], n_workers=1, seed=3, max_steps=100)
+        np.testing.assert_array_equal(tournament.get_result().duels_results, full.duels_results)
+
+    def test_save_load(self):
+        tournament = IncrementalTournament(seed=1)
+        tournament.add_agents(dict(zip(self.names[:3], self.population[:3])))
+        tournament.update(n_workers=1)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "league.pkl")
+            tournament.save(path)
+            loaded = IncrementalTournament.load(path)
+
+        self.assertEqual(loaded.get_scores(), tournament.get_scores())
+        loaded.add_agent("A3", self.population[3])
+        self.assertEqual(loaded.get_pending_pairings(), [(0, 3), (1, 3), (2, 3)])
+        with self.assertRaises(ValueError):
+            loaded.add_agent("A3", self.population[3])
+
+
+if __name__ == "__main__":
+    unittest.main()
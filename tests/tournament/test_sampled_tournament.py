@@ -0,0 +1,71 @@
+import random
+import unittest
+
+import numpy as np
+
+from communication.tournament.SampledTournament import (
+    RANDOM,
+    SWISS,
+    _get_random_pairings,
+    _get_ranks,
+    _get_swiss_pairings,
+    run_sampled_tournament,
+)
+from communication.tournament.Tournament import run_tournament
+from pw_argumentation import generate_preferences
+
+
+class TestSampledTournament(unittest.TestCase):
+    def setUp(self):
+        random.seed(0)
+        np.random.seed(0)
+        self.population = [generate_preferences(n_items=5)[0] for _ in range(12)]
+
+    def test_all_pairings(self):
+        population = self.population[:6]
+        result = run_sampled_tournament(population, pairing=SWISS, rank_correlation=2, max_rounds=50, n_workers=1)
+        full = run_tournament(population, n_workers=1)
+
+        self.assertEqual(result.n_duels, 15)
+        np.testing.assert_array_equal(result.scores, full.duels_results.sum(axis=1))
+        np.testing.assert_array_equal(result.n_played, 5)
+
+    def test_no_early_stop(self):
+        population = self.population[:5]
+        full = run_tournament(population, n_workers=1)
+        for pairing in (RANDOM, SWISS):
+            result = run_sampled_tournament(
+                population, pairing=pairing, rank_correlation=2, max_rounds=50, seed=1, n_workers=1
+            )
+            self.assertEqual(result.n_duels, 10)
+            np.testing.assert_array_equal(result.scores, full.duels_results.sum(axis=1))
+
+    def test_confidence_intervals(self):
+        for pairing in (RANDOM, SWISS):
+            result = run_sampled_tournament(
+                self.population, pairing=pairing, max_rounds=4, rank_correlation=2, seed=0, n_workers=1
+            )
+            self.assertEqual(result.n_rounds, 4)
+            self.assertLessEqual(result.n_duels, 24)
+            self.assertEqual(result.n_played.sum(), 2 * result.n_duels)
+            self.assertAlmostEqual(float((result.scores * result.n_played).sum()), 0)
+            self.assertTrue(np.all(result.lower_bounds <= result.scores))
+            self.assertTrue(np.all(result.scores <= result.upper_bounds))
+
+    def test_adaptive_stopping(self):
+        result = run_sampled_tournament(self.population, pairing=RANDOM, min_rounds=1, rank_correlation=-1, n_workers=1)
+        self.assertEqual(result.n_rounds, 2)
+        result = run_sampled_tournament(self.population, min_rounds=1, tolerance=10, n_workers=1)
+        self.assertEqual(result.n_rounds, 1)
+
+    def test_swiss_pairings(self):
+        pairings = _get_swiss_pairings([3, 0, 1, 2], {(0, 3)})
+        self.assertEqual(pairings, [(1, 3), (0, 2)])
+        self.assertEqual(_get_random_pairings([0, 1, 2, 3], {(0, 1), (2, 3)}), [(0, 2), (1, 3)])
+
+    def test_ranks(self):
+        np.testing.assert_array_equal(_get_ranks(np.array([2.0, -1.0, 2.0, 0.0])), [3.5, 1, 3.5, 2])
+
+
+if __name__ == "__main__":
+    unittest.main()
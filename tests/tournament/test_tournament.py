@@ -0,0 +1,46 @@
+import random
+import unittest
+
+import numpy as np
+
+from communication.tournament.Tournament import get_duel_seed, run_duel, run_tournament
+from pw_argumentation import generate_preferences
+
+
+class TestTournament(unittest.TestCase):
+    def setUp(self):
+        random.seed(0)
+        np.random.seed(0)
+        self.population = [generate_preferences(n_items=5)[0] for _ in range(6)]
+
+    def test_duels_matrix(self):
+        result = run_tournament(self.population, n_workers=1)
+        duels_results = result.duels_results
+
+        self.assertEqual(duels_results.shape, (6, 6))
+        np.testing.assert_array_equal(duels_results, -duels_results.T)
+        self.assertEqual(len(result.winning_items), np.count_nonzero(np.triu(duels_results)))
+        self.assertEqual(len(result.winning_items), len(result.winning_arguments))
+
+        results = run_duel(self.population[1], self.population[3], ["A1", "A3"])
+        if results:
+            self.assertEqual(duels_results[1, 3], 1 if results["winning_agent"] == "A1" else -1)
+        else:
+            self.assertEqual(duels_results[1, 3], 0)
+
+    def test_parallel_matches_sequential(self):
+        sequential = run_tournament(self.population, n_workers=1, seed=42)
+        parallel = run_tournament(self.population, n_workers=2, chunk_size=4, seed=42)
+
+        np.testing.assert_array_equal(sequential.duels_results, parallel.duels_results)
+        self.assertEqual(sequential.winning_items, parallel.winning_items)
+        self.assertEqual(sequential.winning_arguments, parallel.winning_arguments)
+
+    def test_duel_seed(self):
+        self.assertIsNone(get_duel_seed(None, 0, 1))
+        self.assertEqual(get_duel_seed(42, 0, 1), get_duel_seed(42, 0, 1))
+        self.assertNotEqual(get_duel_seed(42, 0, 1), get_duel_seed(42, 1, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
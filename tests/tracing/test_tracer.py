@@ -0,0 +1,91 @@
+import json
+import logging
+import os
+import tempfile
+import unittest
+
+from communication.message.MessagePerformative import MessagePerformative
+from communication.preferences.CriterionName import CriterionName
+from communication.preferences.CriterionValue import CriterionValue
+from communication.preferences.Item import Item
+from communication.preferences.Preferences import Preferences
+from communication.preferences.Value import Value
+from communication.tracing.EventType import EventType
+from communication.tracing.Tracer import FileTracer, LoggingTracer, MemoryTracer, format_event
+from pw_argumentation import ArgumentModel
+
+
+def get_agents_prefs():
+    """Returns preferences for which the first proposal is accepted because it is among the top 10%."""
+    list_items = [Item(f"item{i}", "") for i in range(1, 11)]
+    list_criteria = [CriterionName.PRODUCTION_COST]
+    criteria_values = [CriterionValue(list_items[0], list_criteria[0], Value.VERY_GOOD)]
+    for item in list_items[1:]:
+        criteria_values.append(CriterionValue(item, list_criteria[0], Value.VERY_BAD))
+    return [Preferences(list_criteria, criteria_values), Preferences(list_criteria, criteria_values)]
+
+
+class TestTracer(unittest.TestCase):
+    def test_disabled_by_default(self):
+        argument_model = ArgumentModel(get_agents_prefs())
+        self.assertFalse(argument_model.tracer.enabled)
+        argument_model.run_model()
+
+    def test_memory_tracer(self):
+        tracer = MemoryTracer()
+        argument_model = ArgumentModel(get_agents_prefs(), tracer=tracer)
+        argument_model.run_model()
+
+        self.assertEqual(
+            [event.event_type for event in tracer.get_events()][:6],
+            [
+                EventType.PROPOSE,
+                EventType.ACCEPT,
+                EventType.COMMIT,
+                EventType.REMOVE_ITEM,
+                EventType.COMMIT,
+                EventType.REMOVE_ITEM,
+            ],
+        )
+        accept = tracer.get_events(EventType.ACCEPT)[0]
+        self.assertEqual((accept.agent, accept.target, accept.item.get_name()), ("A2", "A1", "item1"))
+        self.assertEqual(accept.cause, MessagePerformative.PROPOSE)
+        self.assertEqual(format_event(accept), "Accepting proposal item1 from A1 because it is among top 10%")
+
+        events = tracer.get_events()
+        argument_model.reset(get_agents_prefs())
+        tracer.clear()
+        argument_model.run_model()
+        self.assertEqual(tracer.get_events(), events)
+
+    def test_file_tracer(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "trace.jsonl")
+            with FileTracer(path) as tracer:
+                ArgumentModel(get_agents_prefs(), tracer=tracer).run_model()
+            with open(path) as file:
+                records = [json.loads(line) for line in file]
+        self.assertEqual(records[0]["event_type"], "PROPOSE")
+        self.assertEqual(records[1], {
+            "step": 0,
+            "event_type": "ACCEPT",
+            "agent": "A2",
+            "target": "A1",
+            "item": "item1",
+            "argument": None,
+            "cause": "PROPOSE",
+        })
+
+    def test_logging_tracer(self):
+        with self.assertLogs("A2", level=logging.INFO) as logs:
+            ArgumentModel(get_agents_prefs(), tracer=LoggingTracer()).run_model()
+        self.assertIn("INFO:A2:Accepting proposal item1 from A1 because it is among top 10%", logs.output)
+
+    def test_logger_handlers(self):
+        for _ in range(3):
+            ArgumentModel(get_agents_prefs(), ["Bob", "Alice"])
+        self.assertEqual(len(logging.getLogger("Bob").handlers), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()